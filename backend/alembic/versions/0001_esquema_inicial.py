@@ -0,0 +1,282 @@
+"""Esquema inicial (el que creaba Base.metadata.create_all)
+
+Revision ID: 0001_esquema_inicial
+Revises:
+Create Date: 2026-10-18
+
+Las bases de datos creadas antes de usar migraciones ya tienen estas tablas:
+app.db.migrations las marca en esta revisión (stamp) en vez de volver a crearlas.
+Por eso debe ser exactamente ese esquema: las tablas nuevas van en revisiones
+posteriores (background_jobs y blobs, en 0008_trabajos_y_blobs).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_esquema_inicial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('conceptos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=255), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('categoria', sa.String(length=100), nullable=True),
+    sa.Column('nivel', sa.String(length=50), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_conceptos_id'), 'conceptos', ['id'], unique=False)
+    op.create_index(op.f('ix_conceptos_nombre'), 'conceptos', ['nombre'], unique=True)
+    op.create_table('recursos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(length=255), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('ruta_archivo', sa.String(length=500), nullable=True),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('duracion_minutos', sa.Integer(), nullable=True),
+    sa.Column('nivel_dificultad', sa.String(length=50), nullable=True),
+    sa.Column('autor', sa.String(length=255), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recursos_id'), 'recursos', ['id'], unique=False)
+    op.create_index(op.f('ix_recursos_titulo'), 'recursos', ['titulo'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre_completo', sa.String(length=100), nullable=True),
+    sa.Column('correo', sa.String(length=100), nullable=False),
+    sa.Column('contraseña_hash', sa.String(length=255), nullable=False),
+    sa.Column('activo', sa.Boolean(), nullable=True),
+    sa.Column('rol', sa.Enum('ESTUDIANTE', 'DOCENTE', 'PSICOPEDAGOGO', 'ADMINISTRADOR', name='userrole'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_correo'), 'users', ['correo'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_nombre_completo'), 'users', ['nombre_completo'], unique=False)
+    op.create_table('courses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(), nullable=False),
+    sa.Column('descripcion', sa.String(), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('propietario_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['propietario_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_courses_id'), 'courses', ['id'], unique=False)
+    op.create_index(op.f('ix_courses_titulo'), 'courses', ['titulo'], unique=False)
+    op.create_table('interacciones_recursos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estudiante_id', sa.Integer(), nullable=False),
+    sa.Column('recurso_id', sa.Integer(), nullable=False),
+    sa.Column('tipo_interaccion', sa.String(length=50), nullable=True),
+    sa.Column('calificacion', sa.Integer(), nullable=True),
+    sa.Column('tiempo_visto_segundos', sa.Integer(), nullable=True),
+    sa.Column('fecha_interaccion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('mejora_nota', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['recurso_id'], ['recursos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_interacciones_recursos_estudiante_id'), 'interacciones_recursos', ['estudiante_id'], unique=False)
+    op.create_index(op.f('ix_interacciones_recursos_id'), 'interacciones_recursos', ['id'], unique=False)
+    op.create_index(op.f('ix_interacciones_recursos_recurso_id'), 'interacciones_recursos', ['recurso_id'], unique=False)
+    op.create_table('recurso_conceptos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recurso_id', sa.Integer(), nullable=False),
+    sa.Column('concepto_id', sa.Integer(), nullable=False),
+    sa.Column('relevancia', sa.Numeric(precision=3, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['concepto_id'], ['conceptos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['recurso_id'], ['recursos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('recurso_id', 'concepto_id', name='uq_recurso_concepto')
+    )
+    op.create_index(op.f('ix_recurso_conceptos_concepto_id'), 'recurso_conceptos', ['concepto_id'], unique=False)
+    op.create_index(op.f('ix_recurso_conceptos_id'), 'recurso_conceptos', ['id'], unique=False)
+    op.create_index(op.f('ix_recurso_conceptos_recurso_id'), 'recurso_conceptos', ['recurso_id'], unique=False)
+    op.create_table('student_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estudiante_id', sa.Integer(), nullable=False),
+    sa.Column('motivacion', sa.Float(), nullable=False, comment='Nivel de motivación (1-10)'),
+    sa.Column('tiempo_disponible', sa.Float(), nullable=False, comment='Tiempo disponible para estudiar (1-10)'),
+    sa.Column('horas_sueno', sa.Float(), nullable=False, comment='Horas de sueño por noche (1-10)'),
+    sa.Column('horas_estudio', sa.Float(), nullable=False, comment='Horas dedicadas a estudiar (1-10)'),
+    sa.Column('disfrute_estudio', sa.Float(), nullable=False, comment='Qué tanto le gusta estudiar (1-10)'),
+    sa.Column('tranquilidad_lugar_estudio', sa.Float(), nullable=False, comment='Tranquilidad del lugar de estudio (1-10)'),
+    sa.Column('presion_academica', sa.Float(), nullable=False, comment='Presión académica percibida (1-10)'),
+    sa.Column('genero', sa.String(length=20), nullable=True, comment='Género del estudiante'),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('fecha_actualizacion', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_student_profiles_estudiante_id'), 'student_profiles', ['estudiante_id'], unique=True)
+    op.create_index(op.f('ix_student_profiles_id'), 'student_profiles', ['id'], unique=False)
+    op.create_table('announcements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(length=200), nullable=False),
+    sa.Column('contenido', sa.Text(), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('fecha_actualizacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=True),
+    sa.Column('curso_id', sa.Integer(), nullable=False),
+    sa.Column('autor_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['autor_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['curso_id'], ['courses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_announcements_id'), 'announcements', ['id'], unique=False)
+    op.create_table('enrollments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fecha_inscripcion', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('estudiante_id', sa.Integer(), nullable=False),
+    sa.Column('curso_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['curso_id'], ['courses.id'], ),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_enrollments_id'), 'enrollments', ['id'], unique=False)
+    op.create_table('exams',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(), nullable=True),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('fecha_programada', sa.DateTime(), nullable=True),
+    sa.Column('curso_id', sa.Integer(), nullable=True),
+    sa.Column('ruta_pdf', sa.String(length=500), nullable=True),
+    sa.Column('creado_en', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['curso_id'], ['courses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exams_id'), 'exams', ['id'], unique=False)
+    op.create_index(op.f('ix_exams_titulo'), 'exams', ['titulo'], unique=False)
+    op.create_table('tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(length=255), nullable=False),
+    sa.Column('descripcion', sa.String(), nullable=True),
+    sa.Column('fecha_limite', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('curso_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['curso_id'], ['courses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tasks_id'), 'tasks', ['id'], unique=False)
+    op.create_index(op.f('ix_tasks_titulo'), 'tasks', ['titulo'], unique=False)
+    op.create_table('comments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contenido', sa.Text(), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('anuncio_id', sa.Integer(), nullable=False),
+    sa.Column('autor_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['anuncio_id'], ['announcements.id'], ),
+    sa.ForeignKeyConstraint(['autor_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_comments_id'), 'comments', ['id'], unique=False)
+    op.create_table('exam_questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('texto', sa.Text(), nullable=False),
+    sa.Column('tipo', sa.Enum('MULTIPLE_CHOICE', 'ESSAY', name='questiontype'), nullable=False),
+    sa.Column('puntos', sa.Integer(), nullable=False),
+    sa.Column('orden', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['exam_id'], ['exams.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exam_questions_exam_id'), 'exam_questions', ['exam_id'], unique=False)
+    op.create_index(op.f('ix_exam_questions_id'), 'exam_questions', ['id'], unique=False)
+    op.create_table('exam_submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('exam_id', sa.Integer(), nullable=True),
+    sa.Column('estudiante_id', sa.Integer(), nullable=True),
+    sa.Column('contenido', sa.Text(), nullable=True),
+    sa.Column('fecha_entrega', sa.DateTime(), nullable=True),
+    sa.Column('calificacion', sa.Float(), nullable=True),
+    sa.Column('retroalimentacion', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['exam_id'], ['exams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exam_submissions_id'), 'exam_submissions', ['id'], unique=False)
+    op.create_table('recomendaciones_estudiantes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estudiante_id', sa.Integer(), nullable=False),
+    sa.Column('tarea_id', sa.Integer(), nullable=False),
+    sa.Column('recurso_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_recomendacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('vista', sa.Boolean(), nullable=False),
+    sa.Column('fecha_vista', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['recurso_id'], ['recursos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tarea_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('estudiante_id', 'tarea_id', 'recurso_id', name='uq_recomendacion_estudiante')
+    )
+    op.create_index(op.f('ix_recomendaciones_estudiantes_estudiante_id'), 'recomendaciones_estudiantes', ['estudiante_id'], unique=False)
+    op.create_index(op.f('ix_recomendaciones_estudiantes_id'), 'recomendaciones_estudiantes', ['id'], unique=False)
+    op.create_index(op.f('ix_recomendaciones_estudiantes_recurso_id'), 'recomendaciones_estudiantes', ['recurso_id'], unique=False)
+    op.create_index(op.f('ix_recomendaciones_estudiantes_tarea_id'), 'recomendaciones_estudiantes', ['tarea_id'], unique=False)
+    op.create_table('submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contenido', sa.Text(), nullable=True),
+    sa.Column('ruta_archivo', sa.String(length=500), nullable=True),
+    sa.Column('calificacion', sa.Float(), nullable=True),
+    sa.Column('retroalimentacion', sa.Text(), nullable=True),
+    sa.Column('fecha_entrega', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('estudiante_id', sa.Integer(), nullable=False),
+    sa.Column('tarea_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tarea_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_submissions_id'), 'submissions', ['id'], unique=False)
+    op.create_table('tarea_conceptos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tarea_id', sa.Integer(), nullable=False),
+    sa.Column('concepto_id', sa.Integer(), nullable=False),
+    sa.Column('peso', sa.Numeric(precision=3, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['concepto_id'], ['conceptos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tarea_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tarea_id', 'concepto_id', name='uq_tarea_concepto')
+    )
+    op.create_index(op.f('ix_tarea_conceptos_concepto_id'), 'tarea_conceptos', ['concepto_id'], unique=False)
+    op.create_index(op.f('ix_tarea_conceptos_id'), 'tarea_conceptos', ['id'], unique=False)
+    op.create_index(op.f('ix_tarea_conceptos_tarea_id'), 'tarea_conceptos', ['tarea_id'], unique=False)
+    op.create_table('question_options',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('texto', sa.Text(), nullable=False),
+    sa.Column('es_correcta', sa.Boolean(), nullable=False),
+    sa.Column('orden', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['exam_questions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_question_options_id'), 'question_options', ['id'], unique=False)
+    op.create_index(op.f('ix_question_options_question_id'), 'question_options', ['question_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('question_options')
+    op.drop_table('tarea_conceptos')
+    op.drop_table('submissions')
+    op.drop_table('recomendaciones_estudiantes')
+    op.drop_table('exam_submissions')
+    op.drop_table('exam_questions')
+    op.drop_table('comments')
+    op.drop_table('tasks')
+    op.drop_table('exams')
+    op.drop_table('enrollments')
+    op.drop_table('announcements')
+    op.drop_table('student_profiles')
+    op.drop_table('recurso_conceptos')
+    op.drop_table('interacciones_recursos')
+    op.drop_table('courses')
+    op.drop_table('users')
+    op.drop_table('recursos')
+    op.drop_table('conceptos')
+    sa.Enum(name="questiontype").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="userrole").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,73 @@
+"""Índices compuestos y únicos para las consultas más frecuentes
+
+Revision ID: 0002_indices_rutas_frecuentes
+Revises: 0001_esquema_inicial
+Create Date: 2026-10-18
+
+- enrollments (estudiante_id, curso_id) único: get_enrollment_by_user_and_course,
+  que corre en casi todos los requests; y enrollments.curso_id.
+- submissions (tarea_id, estudiante_id) único: entregas de una tarea y la de un estudiante.
+- exam_submissions (exam_id, estudiante_id) único.
+- tasks.curso_id, exams.curso_id y courses.propietario_id.
+- announcements (curso_id, fecha_creacion, id) y comments (anuncio_id, fecha_creacion, id):
+  cubren el orden de la paginación por cursor.
+
+Los índices se crean con CREATE INDEX CONCURRENTLY para no bloquear escrituras.
+Antes de crear los únicos se comprueba que no haya duplicados.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = "0002_indices_rutas_frecuentes"
+down_revision = "0001_esquema_inicial"
+branch_labels = None
+depends_on = None
+
+
+# (nombre, tabla, columnas, único)
+INDICES = [
+    ("uq_enrollments_estudiante_curso", "enrollments", ["estudiante_id", "curso_id"], True),
+    ("ix_enrollments_curso_id", "enrollments", ["curso_id"], False),
+    ("uq_submissions_tarea_estudiante", "submissions", ["tarea_id", "estudiante_id"], True),
+    ("uq_exam_submissions_exam_estudiante", "exam_submissions", ["exam_id", "estudiante_id"], True),
+    ("ix_tasks_curso_id", "tasks", ["curso_id"], False),
+    ("ix_exams_curso_id", "exams", ["curso_id"], False),
+    ("ix_courses_propietario_id", "courses", ["propietario_id"], False),
+    ("ix_announcements_curso_fecha_creacion", "announcements", ["curso_id", "fecha_creacion", "id"], False),
+    ("ix_comments_anuncio_fecha_creacion", "comments", ["anuncio_id", "fecha_creacion", "id"], False),
+]
+
+
+def _check_no_duplicates(tabla: str, columnas: list) -> None:
+    if context.is_offline_mode():
+        return  # Con --sql no hay conexión para comprobarlo
+    cols = ", ".join(columnas)
+    duplicados = op.get_bind().execute(sa.text(
+        f"SELECT {cols}, COUNT(*) FROM {tabla} GROUP BY {cols} HAVING COUNT(*) > 1 LIMIT 5"
+    )).fetchall()
+    if duplicados:
+        raise RuntimeError(
+            f"No se puede crear el índice único sobre {tabla} ({cols}): hay filas duplicadas, "
+            f"por ejemplo {[tuple(fila[:-1]) for fila in duplicados]}. Elimínalas y vuelve a migrar."
+        )
+
+
+def upgrade() -> None:
+    for nombre, tabla, columnas, unico in INDICES:
+        if unico:
+            _check_no_duplicates(tabla, columnas)
+
+    # CONCURRENTLY no puede ir dentro de una transacción
+    with op.get_context().autocommit_block():
+        for nombre, tabla, columnas, unico in INDICES:
+            op.create_index(
+                nombre, tabla, columnas, unique=unico,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nombre, tabla, _, _ in reversed(INDICES):
+            op.drop_index(nombre, table_name=tabla, postgresql_concurrently=True, if_exists=True)
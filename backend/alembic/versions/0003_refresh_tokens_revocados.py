@@ -0,0 +1,32 @@
+"""Lista de revocación de refresh tokens
+
+Revision ID: 0003_refresh_tokens_revocados
+Revises: 0002_indices_rutas_frecuentes
+Create Date: 2026-10-18
+
+Tabla revoked_tokens (jti, expira): refresh tokens ya rotados o cerrados con
+logout. El índice por expira permite purgar las filas vencidas.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_refresh_tokens_revocados"
+down_revision = "0002_indices_rutas_frecuentes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(length=32), nullable=False),
+        sa.Column("expira", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(op.f("ix_revoked_tokens_expira"), "revoked_tokens", ["expira"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_revoked_tokens_expira"), table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
@@ -0,0 +1,49 @@
+"""Índice materializado docente -> categoría de concepto
+
+Revision ID: 0004_docente_categorias
+Revises: 0003_refresh_tokens_revocados
+Create Date: 2026-10-18
+
+Tabla docente_categorias (docente_id, categoria): reemplaza el JOIN
+conceptos -> tarea_conceptos -> tasks -> courses con DISTINCT que se hacía en
+cada GET /conceptos y GET /recursos de un docente. Se llena aquí con los datos
+existentes; después la mantienen los CRUD (app.crud.crud_docente_categoria) y se
+puede verificar o reconstruir con python docente_categorias.py check|backfill.
+
+También indexa conceptos.categoria, por donde se cruzan los catálogos con la tabla.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_docente_categorias"
+down_revision = "0003_refresh_tokens_revocados"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "docente_categorias",
+        sa.Column("docente_id", sa.Integer(), nullable=False),
+        sa.Column("categoria", sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(["docente_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("docente_id", "categoria"),
+    )
+    op.create_index(op.f("ix_conceptos_categoria"), "conceptos", ["categoria"], unique=False)
+    op.execute(
+        """
+        INSERT INTO docente_categorias (docente_id, categoria)
+        SELECT DISTINCT courses.propietario_id, conceptos.categoria
+        FROM conceptos
+        JOIN tarea_conceptos ON tarea_conceptos.concepto_id = conceptos.id
+        JOIN tasks ON tasks.id = tarea_conceptos.tarea_id
+        JOIN courses ON courses.id = tasks.curso_id
+        WHERE conceptos.categoria IS NOT NULL AND TRIM(conceptos.categoria) != ''
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_conceptos_categoria"), table_name="conceptos")
+    op.drop_table("docente_categorias")
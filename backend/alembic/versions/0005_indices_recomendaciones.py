@@ -0,0 +1,44 @@
+"""Índices para el listado de recomendaciones de un estudiante
+
+Revision ID: 0005_indices_recomendaciones
+Revises: 0004_docente_categorias
+Create Date: 2026-10-18
+
+- recomendaciones_estudiantes (estudiante_id, fecha_recomendacion, id): cubre el
+  orden de la paginación por cursor de GET /recomendaciones/me y /student/{id}.
+- Lo mismo WHERE vista = false (índice parcial): el filtro solo_no_vistas solo
+  recorre las recomendaciones pendientes.
+
+Los índices se crean con CREATE INDEX CONCURRENTLY para no bloquear escrituras.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_indices_recomendaciones"
+down_revision = "0004_docente_categorias"
+branch_labels = None
+depends_on = None
+
+
+COLUMNAS = ["estudiante_id", "fecha_recomendacion", "id"]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY no puede ir dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_recomendaciones_estudiante_fecha", "recomendaciones_estudiantes", COLUMNAS,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_recomendaciones_estudiante_no_vistas", "recomendaciones_estudiantes", COLUMNAS,
+            postgresql_where=sa.text("vista = false"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nombre in ("ix_recomendaciones_estudiante_no_vistas", "ix_recomendaciones_estudiante_fecha"):
+            op.drop_index(nombre, table_name="recomendaciones_estudiantes", postgresql_concurrently=True, if_exists=True)
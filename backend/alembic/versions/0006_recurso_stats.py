@@ -0,0 +1,54 @@
+"""Resumen (rollup) de interacciones por recurso
+
+Revision ID: 0006_recurso_stats
+Revises: 0005_indices_recomendaciones
+Create Date: 2026-10-18
+
+Tabla recurso_stats: contadores y suma de calificaciones por recurso, mantenidos
+por crud_interaccion_recurso en la misma transacción que cada interacción. Se
+llena aquí desde interacciones_recursos; después se puede verificar o
+reconstruir con python recurso_stats.py check|rebuild.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_recurso_stats"
+down_revision = "0005_indices_recomendaciones"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurso_stats",
+        sa.Column("recurso_id", sa.Integer(), nullable=False),
+        sa.Column("total_interacciones", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_views", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_completions", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_ratings", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("suma_calificaciones", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("total_mejoras", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("fecha_actualizacion", sa.DateTime(timezone=True), server_default=sa.text("NOW()"), nullable=False),
+        sa.ForeignKeyConstraint(["recurso_id"], ["recursos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("recurso_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO recurso_stats (recurso_id, total_interacciones, total_views, total_completions,
+                                   total_ratings, suma_calificaciones, total_mejoras)
+        SELECT recurso_id,
+               COUNT(*),
+               COUNT(*) FILTER (WHERE tipo_interaccion = 'viewed'),
+               COUNT(*) FILTER (WHERE tipo_interaccion = 'completed'),
+               COUNT(*) FILTER (WHERE tipo_interaccion = 'rated'),
+               COALESCE(SUM(calificacion), 0),
+               COUNT(*) FILTER (WHERE mejora_nota)
+        FROM interacciones_recursos
+        GROUP BY recurso_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("recurso_stats")
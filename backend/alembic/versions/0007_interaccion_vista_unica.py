@@ -0,0 +1,36 @@
+"""Una vista acumulada por estudiante y recurso (heartbeats de reproducción)
+
+Revision ID: 0007_interaccion_vista_unica
+Revises: 0006_recurso_stats
+Create Date: 2026-10-18
+
+La ingesta por lotes (POST /interacciones/batch) agrupa los heartbeats de
+reproducción en un upsert sobre (estudiante_id, recurso_id), que necesita un
+índice único parcial. El índice cubre solo las filas con acumulada = true, que
+escribe únicamente esa ruta: las interacciones existentes y las que se crean una
+a una no cambian ni se fusionan, y recurso_stats no se recalcula.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_interaccion_vista_unica"
+down_revision = "0006_recurso_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "interacciones_recursos",
+        sa.Column("acumulada", sa.Boolean(), server_default=sa.text("false"), nullable=False)
+    )
+    op.create_index(
+        "uq_interacciones_recursos_vista", "interacciones_recursos", ["estudiante_id", "recurso_id"],
+        unique=True, postgresql_where=sa.text("tipo_interaccion = 'viewed' AND acumulada")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_interacciones_recursos_vista", table_name="interacciones_recursos")
+    op.drop_column("interacciones_recursos", "acumulada")
@@ -0,0 +1,58 @@
+"""Tablas background_jobs (cola de trabajos) y blobs (almacén de PDFs por contenido)
+
+Revision ID: 0008_trabajos_y_blobs
+Revises: 0007_interaccion_vista_unica
+Create Date: 2026-10-18
+
+No existían en el esquema creado con create_all, así que no pueden ir en
+0001_esquema_inicial: las bases sin versionar se marcan en esa revisión sin
+ejecutarla, y sin esta revisión nunca recibirían las tablas.
+
+Las bases migradas con una versión anterior de 0001 (que sí las creaba) ya las
+tienen: en ese caso se omiten.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_trabajos_y_blobs"
+down_revision = "0007_interaccion_vista_unica"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existentes = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "background_jobs" not in existentes:
+        op.create_table('background_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tipo', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('estado', sa.String(length=20), nullable=False),
+        sa.Column('intentos', sa.Integer(), nullable=False),
+        sa.Column('max_intentos', sa.Integer(), nullable=False),
+        sa.Column('ultimo_error', sa.Text(), nullable=True),
+        sa.Column('ejecutar_despues', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.Column('fecha_actualizacion', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_background_jobs_estado_ejecutar_despues', 'background_jobs', ['estado', 'ejecutar_despues'], unique=False)
+        op.create_index(op.f('ix_background_jobs_id'), 'background_jobs', ['id'], unique=False)
+
+    if "blobs" not in existentes:
+        op.create_table('blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('tamano', sa.BigInteger(), nullable=False),
+        sa.Column('referencias', sa.Integer(), nullable=False),
+        sa.Column('fecha_creacion', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.PrimaryKeyConstraint('sha256')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('blobs')
+    op.drop_index(op.f('ix_background_jobs_id'), table_name='background_jobs')
+    op.drop_index('ix_background_jobs_estado_ejecutar_despues', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -0,0 +1,40 @@
+"""Índice de vistas acumuladas en bases migradas con la versión anterior de 0007
+
+Revision ID: 0009_vistas_acumuladas
+Revises: 0008_trabajos_y_blobs
+Create Date: 2026-10-18
+
+La versión anterior de 0007 fusionaba las vistas repetidas y creaba el índice
+único sobre todas las filas "viewed", sin la columna acumulada. En esas bases se
+agrega la columna y se recrea el índice con la condición actual; en las demás
+(0007 ya la creó) no cambia nada. Las filas fusionadas por la versión anterior
+no se pueden recuperar.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_vistas_acumuladas"
+down_revision = "0008_trabajos_y_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columnas = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("interacciones_recursos")}
+    if "acumulada" in columnas:
+        return
+    op.add_column(
+        "interacciones_recursos",
+        sa.Column("acumulada", sa.Boolean(), server_default=sa.text("false"), nullable=False)
+    )
+    op.drop_index("uq_interacciones_recursos_vista", table_name="interacciones_recursos")
+    op.create_index(
+        "uq_interacciones_recursos_vista", "interacciones_recursos", ["estudiante_id", "recurso_id"],
+        unique=True, postgresql_where=sa.text("tipo_interaccion = 'viewed' AND acumulada")
+    )
+
+
+def downgrade() -> None:
+    # El esquema resultante es el mismo que deja la versión actual de 0007
+    pass
@@ -0,0 +1,38 @@
+"""Reserva (lease) y solicitante de los trabajos en segundo plano
+
+Revision ID: 0010_reserva_trabajos
+Revises: 0009_vistas_acumuladas
+Create Date: 2026-10-18
+
+bloqueado_hasta: hasta cuándo el worker que tomó el trabajo lo tiene reservado;
+si vence con el trabajo en 'running' (el worker murió), otro worker lo retoma.
+Los trabajos que ya estaban en 'running' quedan con la reserva vencida (NULL no
+cuenta como vencida), así que se marcan para retomarse de inmediato.
+
+solicitante_id: usuario que encoló el trabajo; GET /jobs/{id} solo se lo muestra
+a él o a un administrador.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_reserva_trabajos"
+down_revision = "0009_vistas_acumuladas"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("background_jobs", sa.Column("bloqueado_hasta", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("background_jobs", sa.Column("solicitante_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "background_jobs_solicitante_id_fkey", "background_jobs", "users",
+        ["solicitante_id"], ["id"], ondelete="SET NULL"
+    )
+    op.execute("UPDATE background_jobs SET bloqueado_hasta = NOW() WHERE estado = 'running'")
+
+
+def downgrade() -> None:
+    op.drop_constraint("background_jobs_solicitante_id_fkey", "background_jobs", type_="foreignkey")
+    op.drop_column("background_jobs", "solicitante_id")
+    op.drop_column("background_jobs", "bloqueado_hasta")
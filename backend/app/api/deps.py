@@ -1,42 +1,79 @@
 # backend/app/api/deps.py
+import logging
+import time
 from typing import Generator
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings # ¡Importamos settings!
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
+from app.db.loader import RequestLoader
 from app.models.user import User, UserRole # Importamos User y UserRole (del modelo)
 from app.schemas.token import TokenPayload # token_data.sub: Optional[int] = None
-from app.crud import crud_user
+from app.crud import crud_user, crud_async
+from app.services import auth_cache
+
+logger = logging.getLogger(__name__)
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl="/login/access-token"
 )
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+def get_loader(db: Session = Depends(get_db)) -> RequestLoader:
+    """
+    Cargador por request (identity map) para User, Course, Task, Exam y Announcement.
+    FastAPI cachea las dependencias por request, así que todo el request comparte la misma instancia.
+    """
+    return RequestLoader(db)
+
+def set_next_cursor(response: Response, page) -> None:
+    """
+    Publica el cursor de la página siguiente de un listado (CursorPage) en la
+    cabecera X-Next-Cursor. Sin cabecera, no hay más resultados.
+    """
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+def _decode_access_token(token: str) -> TokenPayload:
+    """
+    Valida el JWT y retorna sus claims (sub, rol, activo).
+    Los tokens ya verificados se recuerdan hasta que expiran (auth_cache).
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="No se pudieron validar las credenciales (token inválido o expirado)",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    expired_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="El token ha expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
     
     # Validar que el token tenga el formato correcto antes de intentar decodificarlo
     if not token or not isinstance(token, str):
-        print(f"DEBUG: Token inválido o vacío recibido. Tipo: {type(token)}, Valor: {token}")
+        logger.debug("Token inválido o vacío recibido (tipo %s)", type(token).__name__)
         raise credentials_exception
     
     # Limpiar el token (eliminar espacios en blanco)
     token = token.strip()
     
+    cached = auth_cache.get_cached_claims(token)
+    if cached is not None:
+        token_data, exp = cached
+        if exp <= time.time():
+            raise expired_exception
+        return token_data
+    
     # Verificar que el token tenga el formato JWT correcto (3 segmentos separados por puntos)
     token_parts = token.split('.')
     if len(token_parts) != 3:
-        print(f"DEBUG: Token con formato incorrecto. Segmentos: {len(token_parts)}, Token (primeros 50 chars): {token[:50]}...")
+        logger.debug("Token con formato incorrecto (%s segmentos)", len(token_parts))
         raise credentials_exception
     
     try:
@@ -49,7 +86,12 @@ def get_current_user(
         
         # Validar que el payload tenga el campo 'sub'
         if "sub" not in payload:
-            print(f"DEBUG: El token no contiene el campo 'sub'. Payload: {payload}")
+            logger.debug("El token no contiene el campo 'sub'")
+            raise credentials_exception
+        
+        # Un refresh token solo sirve en /login/refresh-token
+        if payload.get("type") == "refresh":
+            logger.debug("Se usó un refresh token como access token")
             raise credentials_exception
         
         # Convertir 'sub' a int si es necesario (puede venir como string)
@@ -58,70 +100,136 @@ def get_current_user(
             try:
                 sub_value = int(sub_value)
             except ValueError:
-                print(f"DEBUG: El campo 'sub' no es un número válido: {sub_value}")
+                logger.debug("El campo 'sub' no es un número válido: %r", sub_value)
                 raise credentials_exception
         
         # Crear TokenPayload con el valor convertido
-        token_data = TokenPayload(sub=sub_value)
+        token_data = TokenPayload(
+            sub=sub_value, rol=payload.get("rol"), activo=payload.get("activo"), type=payload.get("type")
+        )
         
+    except HTTPException:
+        raise
     except jwt.ExpiredSignatureError:
-        print("DEBUG: El token ha expirado")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="El token ha expirado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        logger.debug("El token ha expirado")
+        raise expired_exception
     except jwt.JWTError as e:
-        print(f"DEBUG: Error JWT al decodificar el token: {type(e).__name__}: {e}")
+        logger.debug("Error JWT al decodificar el token: %s: %s", type(e).__name__, e)
         raise credentials_exception
     except ValidationError as e:
-        print(f"DEBUG: Error de validación Pydantic: {e}")
+        logger.debug("Error de validación del payload del token: %s", e)
         raise credentials_exception
-    except Exception as e:
-        print(f"DEBUG: Error inesperado al validar el token: {type(e).__name__}: {e}")
+    except Exception:
+        logger.exception("Error inesperado al validar el token")
         raise credentials_exception
     
-    # --- ¡CRÍTICO! Buscamos al usuario por ID ---
     if token_data.sub is None:
-        print("DEBUG: token_data.sub es None")
+        logger.debug("El token no tiene usuario ('sub' vacío)")
         raise credentials_exception
     
-    user = crud_user.get_user_by_id(db, user_id=token_data.sub) 
+    auth_cache.cache_claims(token, token_data, payload.get("exp"))
+    return token_data
+
+
+def _get_token_subject(token: str) -> int:
+    """
+    ID de usuario ('sub') del access token.
+    Compartido por get_current_user y get_current_user_async.
+    """
+    return _decode_access_token(token).sub
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    user_id = _get_token_subject(token)
+    
+    # Usuario en caché: se incorpora a la sesión sin consultar la base de datos
+    user = auth_cache.get_cached_user(db, user_id)
+    if user is not None:
+        return user
+    
+    # --- ¡CRÍTICO! Buscamos al usuario por ID ---
+    user = crud_user.get_user_by_id(db, user_id=user_id) 
     
     if not user:
-        # AÑADIMOS UN PRINT PARA DEPURACIÓN. SI VES ESTO, EL ID DEL TOKEN NO EXISTE EN LA BD
-        print(f"DEBUG: Token válido, pero usuario con ID {token_data.sub} NO encontrado en la BD.")
+        # Token válido pero el ID no existe en la BD (usuario eliminado o BD distinta)
+        logger.warning("Token válido, pero el usuario con ID %s no existe en la BD", user_id)
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-        
+    
+    auth_cache.cache_user(user)
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    """
+    Igual que get_current_user, pero con la sesión async: para endpoints que
+    usan get_async_db y no deben abrir además una sesión síncrona.
+    """
+    user_id = _get_token_subject(token)
+    
+    user = await auth_cache.get_cached_user_async(db, user_id)
+    if user is not None:
+        return user
+    
+    user = await crud_async.get_user_by_id(db, user_id=user_id)
+    
+    if not user:
+        logger.warning("Token válido, pero el usuario con ID %s no existe en la BD", user_id)
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    
+    auth_cache.cache_user(user)
     return user
 
 
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
-    if not current_user.is_active:
+    if not current_user.activo:
         raise HTTPException(status_code=400, detail="Usuario inactivo")
     # --- ¡CRÍTICO! Eliminamos el chequeo de 'is_superuser' aquí ---
     return current_user
 
-# --- Dependencias de roles específicas (usando el campo 'role') ---
+# --- Dependencias de roles (autorizan con los claims firmados del token, sin ir a la BD) ---
+# Un cambio de rol o desactivación se aplica cuando el usuario renueva el access token.
 
-def get_current_active_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
-    if current_user.role != UserRole.ADMINISTRADOR:
+def get_token_claims(token: str = Depends(reusable_oauth2)) -> TokenPayload:
+    """
+    Claims del access token (sub, rol, activo). No abre sesión de base de datos.
+    """
+    claims = _decode_access_token(token)
+    if claims.rol is None or claims.activo is None:
+        # Token emitido antes de incluir los claims de rol: hay que iniciar sesión de nuevo
         raise HTTPException(
-            status_code=403, detail="El usuario no tiene permisos de administrador"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="El token no incluye el rol del usuario, inicia sesión de nuevo",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-    return current_user
+    if not claims.activo:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return claims
 
-def get_current_active_docente_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
-    if current_user.role != UserRole.DOCENTE:
-        raise HTTPException(
-            status_code=403, detail="El usuario no tiene permisos de docente"
-        )
-    return current_user
+def require_roles(*roles: UserRole, detail: str = "No tienes permiso para realizar esta acción"):
+    """
+    Dependencia que exige uno de los roles indicados y retorna los claims del token.
+    """
+    def dependency(claims: TokenPayload = Depends(get_token_claims)) -> TokenPayload:
+        if claims.rol not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return claims
+    return dependency
+
+get_current_active_admin_user = require_roles(
+    UserRole.ADMINISTRADOR, detail="El usuario no tiene permisos de administrador"
+)
 
-# Puedes añadir más para Psicopedagogo, etc.
\ No newline at end of file
+get_current_active_docente_user = require_roles(
+    UserRole.DOCENTE, detail="El usuario no tiene permisos de docente"
+)
+
+# Docentes y administradores
+get_current_active_staff_user = require_roles(
+    UserRole.DOCENTE, UserRole.ADMINISTRADOR, detail="El usuario no tiene permisos de docente ni de administrador"
+)
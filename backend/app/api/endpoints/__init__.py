@@ -5,3 +5,6 @@ from . import tareas_conceptos
 from . import conceptos
 from . import recursos
 from . import announcements
+from . import jobs
+from . import metrics
+from . import interacciones
@@ -1,10 +1,12 @@
 # backend/app/api/endpoints/announcements.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app.api import deps
-from app.crud import crud_announcement, crud_comment, crud_course, crud_enrollment, crud_user
+from app.db.loader import RequestLoader
+from app.crud import crud_announcement, crud_comment, crud_enrollment, crud_user
+from app.crud.pagination import MAX_LIMIT
 from app.schemas.announcement import Announcement, AnnouncementCreate, AnnouncementUpdate, Comment, CommentCreate
 from app.models.user import User as UserModel
 from app.models.user import UserRole
@@ -15,14 +17,19 @@ router = APIRouter()
 @router.get("/course/{course_id}", response_model=List[Announcement])
 async def read_announcements_by_course(
     course_id: int,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtiene todos los comunicados de un curso específico.
     Acceso: Estudiantes inscritos, docente del curso, o admin.
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Curso no encontrado")
     
@@ -46,12 +53,16 @@ async def read_announcements_by_course(
             detail="No tienes permiso para ver los comunicados de este curso"
         )
     
-    announcements = crud_announcement.get_announcements_by_course(db, course_id=course_id)
+    announcements = crud_announcement.get_announcements_by_course(
+        db, course_id=course_id, skip=skip, limit=limit, cursor=cursor
+    )
+    deps.set_next_cursor(response, announcements)
     
     # Agregar información del autor
+    authors = crud_user.get_users_by_ids(db, (announcement.autor_id for announcement in announcements))
     result = []
     for announcement in announcements:
-        author = crud_user.get_user_by_id(db, user_id=announcement.autor_id)
+        author = authors.get(announcement.autor_id)
         announcement_dict = {
             "id": announcement.id,
             "titulo": announcement.titulo,
@@ -76,13 +87,14 @@ async def create_announcement(
     course_id: int,
     announcement_in: AnnouncementCreate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Crea un nuevo comunicado en un curso.
     Solo el docente propietario del curso o un admin pueden crear comunicados.
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Curso no encontrado")
     
@@ -119,17 +131,18 @@ async def update_announcement(
     announcement_id: int,
     announcement_in: AnnouncementUpdate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Actualiza un comunicado existente.
     Solo el autor del comunicado, el docente del curso, o un admin pueden actualizarlo.
     """
-    db_announcement = crud_announcement.get_announcement_by_id(db, announcement_id=announcement_id)
+    db_announcement = loader.announcement(announcement_id)
     if not db_announcement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comunicado no encontrado")
     
-    course = crud_course.get_course_by_id(db, course_id=db_announcement.curso_id)
+    course = loader.course(db_announcement.curso_id)
     
     # Verificar permisos
     if (current_user.rol != UserRole.ADMINISTRADOR and 
@@ -165,17 +178,18 @@ async def update_announcement(
 async def delete_announcement(
     announcement_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ):
     """
     Elimina un comunicado.
     Solo el docente del curso o un admin pueden eliminarlo.
     """
-    db_announcement = crud_announcement.get_announcement_by_id(db, announcement_id=announcement_id)
+    db_announcement = loader.announcement(announcement_id)
     if not db_announcement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comunicado no encontrado")
     
-    course = crud_course.get_course_by_id(db, course_id=db_announcement.curso_id)
+    course = loader.course(db_announcement.curso_id)
     
     # Verificar permisos: solo docente propietario o admin
     if current_user.rol != UserRole.ADMINISTRADOR and current_user.id != course.propietario_id:
@@ -191,18 +205,23 @@ async def delete_announcement(
 @router.get("/{announcement_id}/comments", response_model=List[Comment])
 async def read_comments_by_announcement(
     announcement_id: int,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtiene todos los comentarios de un comunicado.
     Acceso: Estudiantes inscritos, docente del curso, o admin.
     """
-    announcement = crud_announcement.get_announcement_by_id(db, announcement_id=announcement_id)
+    announcement = loader.announcement(announcement_id)
     if not announcement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comunicado no encontrado")
     
-    course = crud_course.get_course_by_id(db, course_id=announcement.curso_id)
+    course = loader.course(announcement.curso_id)
     
     # Verificar permisos (mismo que para ver comunicados)
     if current_user.rol == UserRole.ADMINISTRADOR or current_user.id == course.propietario_id:
@@ -222,12 +241,16 @@ async def read_comments_by_announcement(
             detail="No tienes permiso para ver los comentarios"
         )
     
-    comments = crud_comment.get_comments_by_announcement(db, announcement_id=announcement_id)
+    comments = crud_comment.get_comments_by_announcement(
+        db, announcement_id=announcement_id, skip=skip, limit=limit, cursor=cursor
+    )
+    deps.set_next_cursor(response, comments)
     
     # Agregar información del autor
+    authors = crud_user.get_users_by_ids(db, (comment.autor_id for comment in comments))
     result = []
     for comment in comments:
-        author = crud_user.get_user_by_id(db, user_id=comment.autor_id)
+        author = authors.get(comment.autor_id)
         comment_dict = {
             "id": comment.id,
             "contenido": comment.contenido,
@@ -247,17 +270,18 @@ async def create_comment(
     announcement_id: int,
     comment_in: CommentCreate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Crea un nuevo comentario en un comunicado.
     Acceso: Estudiantes inscritos, docente del curso, o admin.
     """
-    announcement = crud_announcement.get_announcement_by_id(db, announcement_id=announcement_id)
+    announcement = loader.announcement(announcement_id)
     if not announcement:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comunicado no encontrado")
     
-    course = crud_course.get_course_by_id(db, course_id=announcement.curso_id)
+    course = loader.course(announcement.curso_id)
     
     # Verificar permisos
     if current_user.rol == UserRole.ADMINISTRADOR or current_user.id == course.propietario_id:
@@ -300,6 +324,7 @@ async def create_comment(
 async def delete_comment(
     comment_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ):
     """
@@ -310,8 +335,8 @@ async def delete_comment(
     if not db_comment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comentario no encontrado")
     
-    announcement = crud_announcement.get_announcement_by_id(db, announcement_id=db_comment.anuncio_id)
-    course = crud_course.get_course_by_id(db, course_id=announcement.curso_id)
+    announcement = loader.announcement(db_comment.anuncio_id)
+    course = loader.course(announcement.curso_id)
     
     # Verificar permisos
     if (current_user.rol != UserRole.ADMINISTRADOR and 
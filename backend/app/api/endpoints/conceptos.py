@@ -1,21 +1,25 @@
 # backend/app/api/endpoints/conceptos.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app.api import deps
 from app.crud import crud_concepto
+from app.crud.pagination import MAX_LIMIT
 from app.schemas.concepto import Concepto, ConceptoCreate, ConceptoUpdate
 from app.models.user import User as UserModel
 from app.models.user import UserRole
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, TAG_CONCEPTOS, response_cache
 
 router = APIRouter()
 
 # ----------------- Endpoint para OBTENER todos los conceptos -----------------
 @router.get("/", response_model=List[Concepto])
 async def read_conceptos(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     categoria: str = None,
     nivel: str = None,
     db: Session = Depends(deps.get_db),
@@ -27,40 +31,34 @@ async def read_conceptos(
     - Docentes: Solo ven conceptos de categorías relacionadas con sus cursos
     - Estudiantes: Ven todos los conceptos
     Filtros opcionales: categoria, nivel
+    (Respuesta cacheada: ver app.services.response_cache)
     """
-    # Si el usuario es docente, filtrar por categorías de sus cursos
+    # Administradores y estudiantes comparten la misma respuesta; cada docente tiene la suya
+    es_docente = current_user.rol == UserRole.DOCENTE
+    key = ["docente", current_user.id] if es_docente else ["todos"]
+    tags = [TAG_CONCEPTOS, TAG_CATEGORIAS_DOCENTE] if es_docente else [TAG_CONCEPTOS]
+    return response_cache.cached_response(
+        "conceptos", key + [skip, limit, cursor, categoria, nivel], tags, response, List[Concepto],
+        lambda: _read_conceptos(response, skip, limit, cursor, categoria, nivel, db, current_user)
+    )
+
+def _read_conceptos(response, skip, limit, cursor, categoria, nivel, db, current_user):
+    # Si el usuario es docente, filtrar por categorías de sus cursos (una sola consulta
+    # contra el índice docente_categorias; sin categorías, la lista sale vacía)
     if current_user.rol == UserRole.DOCENTE:
-        categorias_profesor = crud_concepto.get_categorias_conceptos_by_teacher_courses(
-            db, teacher_id=current_user.id
+        conceptos = crud_concepto.get_conceptos_by_teacher(
+            db, teacher_id=current_user.id, categoria=categoria, nivel=nivel, skip=skip, limit=limit, cursor=cursor
         )
-        
-        # Si el docente tiene cursos con conceptos asociados, filtrar
-        if categorias_profesor:
-            if categoria:
-                # Si se especifica una categoría, verificar que esté en las categorías del profesor
-                if categoria not in categorias_profesor:
-                    return []  # No tiene acceso a esta categoría
-                conceptos = crud_concepto.get_conceptos_by_categoria(db, categoria=categoria, skip=skip, limit=limit)
-            elif nivel:
-                # Filtrar por nivel pero solo dentro de las categorías del profesor
-                conceptos = crud_concepto.get_conceptos_by_categorias(db, categorias=categorias_profesor, skip=skip, limit=limit)
-                # Filtrar por nivel adicionalmente
-                conceptos = [c for c in conceptos if c.nivel == nivel]
-            else:
-                # Mostrar solo conceptos de las categorías del profesor
-                conceptos = crud_concepto.get_conceptos_by_categorias(db, categorias=categorias_profesor, skip=skip, limit=limit)
-        else:
-            # Si el docente no tiene cursos con conceptos, retornar lista vacía
-            return []
     else:
         # Para administradores y estudiantes: comportamiento normal
         if categoria:
-            conceptos = crud_concepto.get_conceptos_by_categoria(db, categoria=categoria, skip=skip, limit=limit)
+            conceptos = crud_concepto.get_conceptos_by_categoria(db, categoria=categoria, skip=skip, limit=limit, cursor=cursor)
         elif nivel:
-            conceptos = crud_concepto.get_conceptos_by_nivel(db, nivel=nivel, skip=skip, limit=limit)
+            conceptos = crud_concepto.get_conceptos_by_nivel(db, nivel=nivel, skip=skip, limit=limit, cursor=cursor)
         else:
-            conceptos = crud_concepto.get_conceptos(db, skip=skip, limit=limit)
+            conceptos = crud_concepto.get_conceptos(db, skip=skip, limit=limit, cursor=cursor)
     
+    deps.set_next_cursor(response, conceptos)
     return conceptos
 
 # ----------------- Endpoint para OBTENER un concepto por ID -----------------
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app.api import deps
-from app.crud import crud_course
+from app.db.loader import RequestLoader
+from app.crud import crud_blob, crud_course
+from app.crud.pagination import MAX_LIMIT
 from app.schemas.course import Course as CourseSchema, CourseCreate, CourseUpdate
+from app.schemas.token import TokenPayload
+from app.services.blob_storage import blob_store
+from app.services.response_cache import TAG_COURSES, TAG_USERS, response_cache
 from app.models.user import User # Importa el modelo User
 from app.models.user import UserRole # Importa UserRole para la comparación de roles
 
@@ -13,29 +18,35 @@ router = APIRouter()
 # ----------------- Endpoint para OBTENER todos los cursos (Solo Admin) -----------------
 @router.get("/", response_model=List[CourseSchema])
 async def read_all_courses(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(deps.get_current_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    claims: TokenPayload = Depends(deps.get_current_active_admin_user),
 ) -> Any:
     """
     Obtiene una lista de TODOS los cursos.
-    (Protegido: Solo para Administradores).
+    (Protegido: Solo para Administradores, según el rol del token).
+    (Respuesta cacheada: ver app.services.response_cache)
     """
+    return response_cache.cached_response(
+        "courses", [skip, limit, cursor], [TAG_COURSES, TAG_USERS], response, List[CourseSchema],
+        lambda: _read_all_courses(response, db, skip, limit, cursor)
+    )
+
+def _read_all_courses(response, db, skip, limit, cursor):
     from app.crud import crud_user
     from datetime import datetime
     
-    if current_user.rol != UserRole.ADMINISTRADOR:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver todos los cursos."
-        )
-    courses = crud_course.get_courses(db, skip=skip, limit=limit)
+    courses = crud_course.get_courses(db, skip=skip, limit=limit, cursor=cursor)
+    deps.set_next_cursor(response, courses)
     
     # Formatear respuesta con información del profesor
+    owners = crud_user.get_users_by_ids(db, (course.propietario_id for course in courses))
     result = []
     for course in courses:
-        owner = crud_user.get_user_by_id(db, user_id=course.propietario_id)
+        owner = owners.get(course.propietario_id)
         course_dict = {
             "id": course.id,
             "titulo": course.titulo,
@@ -114,9 +125,10 @@ async def read_current_user_courses(
     courses = crud_course.get_courses_by_owner(db, owner_id=current_user.id)
     
     # Formatear respuesta con información del profesor
+    owners = crud_user.get_users_by_ids(db, (course.propietario_id for course in courses))
     result = []
     for course in courses:
-        owner = crud_user.get_user_by_id(db, user_id=course.propietario_id)
+        owner = owners.get(course.propietario_id)
         course_dict = {
             "id": course.id,
             "titulo": course.titulo,
@@ -138,9 +150,11 @@ async def read_current_user_courses(
 # ----------------- Endpoint para OBTENER cursos DISPONIBLES para estudiantes (no inscritos) -----------------
 @router.get("/available", response_model=List[CourseSchema])
 async def read_available_courses(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -157,13 +171,15 @@ async def read_available_courses(
         )
     
     courses = crud_course.get_available_courses_for_student(
-        db, student_id=current_user.id, skip=skip, limit=limit
+        db, student_id=current_user.id, skip=skip, limit=limit, cursor=cursor
     )
+    deps.set_next_cursor(response, courses)
     
     # Formatear respuesta con información del profesor
+    owners = crud_user.get_users_by_ids(db, (course.propietario_id for course in courses))
     result = []
     for course in courses:
-        owner = crud_user.get_user_by_id(db, user_id=course.propietario_id)
+        owner = owners.get(course.propietario_id)
         course_dict = {
             "id": course.id,
             "titulo": course.titulo,
@@ -186,17 +202,26 @@ async def read_available_courses(
 @router.get("/{course_id}", response_model=CourseSchema)
 async def read_course_by_id(
     course_id: int,
+    response: Response,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: User = Depends(deps.get_current_user) 
 ) -> Any:
     """
     Obtiene los detalles de un curso específico por su ID.
     (Cualquier usuario autenticado puede ver los detalles de un curso).
+    (Respuesta cacheada: ver app.services.response_cache)
     """
+    return response_cache.cached_response(
+        "course", course_id, [TAG_COURSES, TAG_USERS], response, CourseSchema,
+        lambda: _read_course_by_id(course_id, db, loader)
+    )
+
+def _read_course_by_id(course_id, db, loader):
     from app.crud import crud_user
     from datetime import datetime
     
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -232,12 +257,13 @@ async def update_existing_course(
     course_id: int,
     course_in: CourseUpdate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
     """
     Actualiza un curso existente (solo el propietario o un administrador).
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -280,12 +306,13 @@ async def update_existing_course(
 async def delete_existing_course(
     course_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: User = Depends(deps.get_current_user)
 ) -> None: # <-- El tipo de retorno es None
     """
     Elimina un curso existente (solo el propietario o un administrador).
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -298,6 +325,10 @@ async def delete_existing_course(
             detail="No tienes permiso para eliminar este curso."
         )
     
+    # Liberar los archivos de entregas y exámenes (se eliminan en cascada) en la misma transacción que el borrado
+    sin_referencias = blob_store.release_many(db, crud_blob.get_course_file_paths(db, course_id))
     crud_course.delete_course(db, id=course_id)
+    if sin_referencias:
+        blob_store.schedule_collection()
     
     return None # <-- No se devuelve NADA en un 204
\ No newline at end of file
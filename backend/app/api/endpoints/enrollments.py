@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Any
 
 from app.api import deps
-from app.crud import crud_enrollment, crud_course
+from app.core.config import settings
+from app.db.loader import RequestLoader
+from app.crud import crud_enrollment
 from app.schemas.enrollment import Enrollment, EnrollmentCreate # Asegúrate que EnrollmentCreate esté en schemas/enrollment.py
+from app.schemas.enrollment import BulkEnrollmentRequest, BulkEnrollmentResult
+from app.schemas.token import TokenPayload
+from app.services.csv_import import iter_csv_rows
 from app.schemas.course import Course as CourseSchema # Usamos el schema de Course para la respuesta
 from app.models.user import User as UserModel
 from app.models.user import UserRole
@@ -32,9 +39,10 @@ async def read_my_enrolled_courses(
     courses = crud_enrollment.get_enrolled_courses_by_student(db, student_id=current_user.id)
     
     # Agregar información del profesor a cada curso
+    owners = crud_user.get_users_by_ids(db, (course.propietario_id for course in courses))
     result = []
     for course in courses:
-        owner = crud_user.get_user_by_id(db, user_id=course.propietario_id)
+        owner = owners.get(course.propietario_id)
         course_dict = {
             "id": course.id,
             "titulo": course.titulo,
@@ -70,6 +78,7 @@ async def read_my_enrollments(
 async def enroll_student_in_course(
     enrollment_in: EnrollmentCreate, # Recibimos el course_id desde el schema
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -78,7 +87,7 @@ async def enroll_student_in_course(
     if current_user.rol != UserRole.ESTUDIANTE:
         raise HTTPException(status_code=403, detail="Solo los estudiantes pueden inscribirse en cursos.")
 
-    course = crud_course.get_course_by_id(db, course_id=enrollment_in.course_id)
+    course = loader.course(enrollment_in.course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Curso no encontrado.")
 
@@ -99,6 +108,7 @@ async def admin_enroll_student(
     student_id: int = Query(..., description="ID del estudiante a inscribir"),
     course_id: int = Query(..., description="ID del curso"),
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -126,7 +136,7 @@ async def admin_enroll_student(
         )
     
     # Verificar que el curso existe
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -150,18 +160,67 @@ async def admin_enroll_student(
     
     return enrollment
 
+# ----------------- Endpoints de INSCRIPCIÓN MASIVA (Admin) -----------------
+# Son `def` (no async): la importación corre en el threadpool sin bloquear el event loop
+@router.post("/admin/bulk", response_model=BulkEnrollmentResult)
+def admin_bulk_enroll(
+    payload: BulkEnrollmentRequest,
+    db: Session = Depends(deps.get_db),
+    claims: TokenPayload = Depends(deps.get_current_active_admin_user)
+) -> Any:
+    """
+    Inscribe varios estudiantes (por correo) en cursos. Las inscripciones que ya
+    existen se omiten; las filas inválidas se reportan en `errores` con su posición
+    en la lista (desde 1) sin detener la importación.
+    """
+    if len(payload.inscripciones) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.BULK_IMPORT_MAX_ROWS} inscripciones por request; usa /admin/bulk/csv"
+        )
+    filas = (
+        (linea, fila.correo, str(fila.course_id))
+        for linea, fila in enumerate(payload.inscripciones, start=1)
+    )
+    return crud_enrollment.bulk_create_enrollments(
+        db, filas, chunk_size=settings.BULK_IMPORT_CHUNK_SIZE, max_errores=settings.BULK_IMPORT_MAX_ERRORS
+    )
+
+@router.post("/admin/bulk/csv", response_model=BulkEnrollmentResult)
+def admin_bulk_enroll_csv(
+    file: UploadFile = File(..., description="CSV con columnas correo,course_id (encabezado opcional)"),
+    db: Session = Depends(deps.get_db),
+    claims: TokenPayload = Depends(deps.get_current_active_admin_user)
+) -> Any:
+    """
+    Igual que /admin/bulk, leyendo las filas de un CSV en streaming (sin límite de
+    filas). `linea` en los errores es el número de línea del archivo. Si el archivo
+    se corta a mitad por un error de formato, los tramos anteriores ya quedan inscritos.
+    """
+    filas = ((linea, correo, course_id) for linea, (correo, course_id) in iter_csv_rows(file.file, ("correo", "course_id")))
+    try:
+        return crud_enrollment.bulk_create_enrollments(
+            db, filas, chunk_size=settings.BULK_IMPORT_CHUNK_SIZE, max_errores=settings.BULK_IMPORT_MAX_ERRORS
+        )
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El archivo no es un CSV válido en UTF-8: {e}"
+        )
+
 
 @router.get("/course/{course_id}/students", response_model=List[Any])
 async def read_students_in_course(
     course_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtiene la lista de estudiantes inscritos en un curso específico.
     Solo el docente propietario del curso o un admin pueden ver esto.
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Curso no encontrado")
     
@@ -193,13 +252,14 @@ async def remove_student_from_course(
     course_id: int,
     student_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ):
     """
     Elimina (da de baja) a un estudiante de un curso específico.
     Acceso: Administrador o Docente propietario del curso.
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Curso no encontrado")
     
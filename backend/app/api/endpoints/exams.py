@@ -1,17 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import datetime
-from pathlib import Path
-import shutil
 import json
 
 from app.api import deps
-from app.crud import crud_exam, crud_course, crud_user, crud_exam_question
+from app.db.loader import RequestLoader
+from app.crud import crud_exam, crud_user, crud_exam_question, crud_async
 from app.schemas.exam import Exam, ExamCreate, ExamSubmission, ExamSubmissionCreate, ExamSubmissionUpdate
 from app.schemas.exam_question import ExamQuestionCreate
 from app.models.user import User as UserModel, UserRole
-from app.core.config import settings
+from app.services.blob_storage import blob_store
+from app.services.file_downloads import pdf_download_response
 
 router = APIRouter()
 
@@ -25,11 +26,11 @@ async def create_exam(
     course_id: int = Form(...),
     pdf_file: Optional[UploadFile] = File(None),
     questions_json: Optional[str] = Form(None),  # JSON string con las preguntas
-    db: Session = Depends(deps.get_db),
-    current_user: UserModel = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserModel = Depends(deps.get_current_user_async)
 ) -> Any:
     """Create a new exam with optional PDF and questions (Teacher/Admin only)"""
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = await crud_async.get_course_by_id(db, course_id=course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
         
@@ -44,59 +45,34 @@ async def create_exam(
         except:
             pass
     
+    # Parsear preguntas si se enviaron
+    questions_list = []
+    if questions_json:
+        try:
+            questions_data = json.loads(questions_json)
+            questions_list = [ExamQuestionCreate(**q) for q in questions_data]
+        except Exception as e:
+            print(f"Error al crear preguntas: {e}")
+            # No fallar si hay error en las preguntas, el examen se crea igual
+    
     # Manejar archivo PDF si se envió
     pdf_path = None
     if pdf_file:
-        # Validar que sea un PDF
-        if not pdf_file.filename.endswith('.pdf'):
-            raise HTTPException(
-                status_code=400,
-                detail="Solo se permiten archivos PDF."
-            )
-        
-        # Crear directorio de uploads si no existe
-        upload_dir = Path(settings.UPLOAD_DIR).parent / "exams"
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generar nombre único para el archivo
-        file_name = f"exam_{course_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_path = str(upload_dir / file_name)
-        
-        # Guardar el archivo
-        with open(pdf_path, "wb") as buffer:
-            shutil.copyfileobj(pdf_file.file, buffer)
+        # Validar (extensión, firma %PDF, tamaño) y guardar por contenido (deduplicado)
+        stored = await blob_store.store_pdf_upload(db, pdf_file)
+        pdf_path = stored.uri
     
-    # Crear el examen
+    # Crear el examen, la ruta del PDF y las preguntas en una sola transacción
     exam_in = ExamCreate(
         title=title,
         description=description,
         scheduled_at=fecha_programada,
         course_id=course_id,
-        questions=None  # Las preguntas se crearán después
+        questions=None
     )
+    exam = await crud_async.create_exam_with_questions(db, exam_in, pdf_path=pdf_path, questions_in=questions_list)
     
-    exam = crud_exam.create_exam(db, exam_in)
-    
-    # Actualizar ruta del PDF si existe
-    if pdf_path:
-        exam.ruta_pdf = pdf_path
-        db.commit()
-        db.refresh(exam)
-    
-    # Crear preguntas si se enviaron
-    questions_created = []
-    if questions_json:
-        try:
-            questions_data = json.loads(questions_json)
-            questions_list = [ExamQuestionCreate(**q) for q in questions_data]
-            questions_created = crud_exam_question.create_questions_bulk(db, questions_list, exam.id)
-        except Exception as e:
-            print(f"Error al crear preguntas: {e}")
-            # No fallar si hay error en las preguntas, el examen ya está creado
-    
-    # Cargar preguntas para la respuesta
-    questions = crud_exam_question.get_questions_by_exam(db, exam.id)
-    return Exam.from_orm(exam, questions=questions)
+    return Exam.from_orm(exam, questions=exam.questions)
 
 @router.get("/course/{course_id}", response_model=List[Exam])
 async def read_exams_by_course(
@@ -118,14 +94,39 @@ async def read_exams_by_course(
 async def read_exam(
     exam_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
-    exam = crud_exam.get_exam(db, exam_id)
+    exam = loader.exam(exam_id)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
     questions = crud_exam_question.get_questions_by_exam(db, exam_id)
     return Exam.from_orm(exam, questions=questions)
 
+@router.get("/{exam_id}/pdf")
+async def download_exam_pdf(
+    exam_id: int,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    current_user: UserModel = Depends(deps.get_current_user)
+):
+    """
+    Descarga el PDF de un examen (docente del curso, admin o estudiante inscrito).
+    Soporta Range (206), ETag / If-None-Match y If-Modified-Since (304).
+    """
+    # Examen + propietario del curso + inscripción del usuario en una sola consulta
+    row = crud_exam.get_exam_with_access(db, exam_id=exam_id, user_id=current_user.id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    exam, propietario_id, inscrito = row
+
+    if not (current_user.rol == UserRole.ADMINISTRADOR or current_user.id == propietario_id or inscrito):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if not exam.ruta_pdf:
+        raise HTTPException(status_code=404, detail="Este examen no tiene PDF")
+
+    return await pdf_download_response(request, exam.ruta_pdf, f"examen_{exam.id}.pdf")
+
 # --- Submissions ---
 
 @router.post("/{exam_id}/submit", response_model=ExamSubmission)
@@ -133,13 +134,14 @@ async def submit_exam(
     exam_id: int,
     submission_in: ExamSubmissionCreate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """Submit an exam (Student only)"""
     if current_user.rol != UserRole.ESTUDIANTE:
         raise HTTPException(status_code=403, detail="Only students can submit exams")
     
-    exam = crud_exam.get_exam(db, exam_id)
+    exam = loader.exam(exam_id)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
         
@@ -166,23 +168,25 @@ async def read_my_submission(
 async def read_all_submissions(
     exam_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """Read all submissions for an exam (Teacher/Admin only)"""
-    exam = crud_exam.get_exam(db, exam_id)
+    exam = loader.exam(exam_id)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
     
-    course = crud_course.get_course_by_id(db, exam.curso_id)
+    course = loader.course(exam.curso_id)
     if current_user.rol != UserRole.ADMINISTRADOR and current_user.id != course.propietario_id:
         raise HTTPException(status_code=403, detail="Not authorized")
         
     submissions = crud_exam.get_submissions_by_exam(db, exam_id)
     
     # Enrich with student info
+    students = crud_user.get_users_by_ids(db, (sub.estudiante_id for sub in submissions))
     result = []
     for sub in submissions:
-        student = crud_user.get_user_by_id(db, sub.estudiante_id)
+        student = students.get(sub.estudiante_id)
         s_obj = ExamSubmission.from_orm(sub)
         if student:
             s_obj.student_name = student.nombre_completo or f"User {student.id}"
@@ -196,6 +200,7 @@ async def grade_submission(
     submission_id: int,
     update_in: ExamSubmissionUpdate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """Grade a submission (Teacher/Admin) - Scale 1.0 to 7.0"""
@@ -203,8 +208,8 @@ async def grade_submission(
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
         
-    exam = crud_exam.get_exam(db, submission.exam_id)
-    course = crud_course.get_course_by_id(db, exam.curso_id)
+    exam = loader.exam(submission.exam_id)
+    course = loader.course(exam.curso_id)
     
     if current_user.rol != UserRole.ADMINISTRADOR and current_user.id != course.propietario_id:
         raise HTTPException(status_code=403, detail="Not authorized")
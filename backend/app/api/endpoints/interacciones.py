@@ -0,0 +1,35 @@
+# backend/app/api/endpoints/interacciones.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from app.api import deps
+from app.core.config import settings
+from app.crud.crud_interaccion_recurso import nuevo_evento
+from app.schemas.interaccion_recurso import InteraccionRecursoBatch, InteraccionRecursoBatchResult
+from app.schemas.token import TokenPayload
+from app.services.interaction_buffer import interaction_buffer
+
+router = APIRouter()
+
+# ----------------- Endpoint para REGISTRAR interacciones por lotes -----------------
+@router.post("/batch", response_model=InteraccionRecursoBatchResult, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_interacciones(
+    batch_in: InteraccionRecursoBatch,
+    claims: TokenPayload = Depends(deps.get_token_claims)
+) -> Any:
+    """
+    Registra eventos de interacción del usuario autenticado con recursos (vistas,
+    heartbeats de reproducción con tiempo_visto_segundos, completados, calificaciones).
+    Los eventos se escriben en lotes, con hasta INTERACTION_FLUSH_INTERVAL_SECONDS de
+    retraso (ver app.services.interaction_buffer); no abre sesión de base de datos.
+    Los heartbeats "viewed" repetidos de un mismo recurso se guardan como una sola vista.
+    Acceso: Cualquier usuario autenticado.
+    """
+    if len(batch_in.eventos) > settings.INTERACTION_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.INTERACTION_BATCH_MAX_EVENTS} eventos por lote"
+        )
+    estudiante_id = int(claims.sub)
+    interaction_buffer.add([nuevo_evento(estudiante_id, evento.model_dump()) for evento in batch_in.eventos])
+    return {"aceptados": len(batch_in.eventos)}
@@ -0,0 +1,29 @@
+# backend/app/api/endpoints/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from app.api import deps
+from app.models.user import UserRole
+from app.schemas.background_job import BackgroundJob
+from app.services.job_queue import job_queue
+from app.schemas.token import TokenPayload
+
+router = APIRouter()
+
+# ----------------- Endpoint para CONSULTAR el estado de un trabajo -----------------
+@router.get("/{job_id}", response_model=BackgroundJob)
+async def read_job_status(
+    job_id: int,
+    claims: TokenPayload = Depends(deps.get_current_active_staff_user)
+) -> Any:
+    """
+    Obtiene el estado de un trabajo en segundo plano (por ejemplo, el ID
+    devuelto en el header X-Job-Id al calificar).
+    Solo quien encoló el trabajo, o un administrador.
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trabajo no encontrado")
+    if claims.rol != UserRole.ADMINISTRADOR and job.solicitante_id != claims.sub:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permiso para ver este trabajo")
+    return job
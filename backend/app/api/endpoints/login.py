@@ -1,52 +1,109 @@
 # backend/app/api/endpoints/login.py
+import logging
 from datetime import timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user # Importa get_db y get_current_user desde deps
+from app.api.deps import get_async_db, get_current_user # Importa get_async_db y get_current_user desde deps
 from app.core import security
 from app.core.config import settings
-from app.crud.crud_user import authenticate_user
-from app.schemas.token import Token
+from app.crud import crud_async
+from app.crud.crud_async import authenticate_user
+from app.schemas.token import RefreshTokenRequest, Token
 from app.schemas.user import User as UserSchema # Alias para evitar conflicto
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post("/access-token", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
-    OAuth2 compatible token login, get an access token for future requests
+    OAuth2 compatible token login, get an access token for future requests.
+    bcrypt corre en el pool de hash (security), no en el event loop.
     """
-    user = authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await authenticate_user(db, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario o contraseña incorrectos")
     elif not user.activo:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario inactivo")
     
+    return _issue_tokens(user)
+
+def _issue_tokens(user) -> dict:
+    """Access token (con rol y estado firmados) + refresh token nuevo."""
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     # --- ¡CRÍTICO! El 'sub' del token DEBE ser el ID del usuario ---
     access_token = security.create_access_token(
-        data={"sub": user.id}, # Aquí se usa user.id
+        data=security.access_token_claims(user), # sub = user.id, más rol y activo
         expires_delta=access_token_expires
     )
     
     # Validar que el token tenga el formato correcto antes de retornarlo
     token_parts = access_token.split('.')
     if len(token_parts) != 3:
-        print(f"ERROR: Token generado con formato incorrecto. Segmentos: {len(token_parts)}")
+        logger.error("Token generado con formato incorrecto. Segmentos: %s", len(token_parts))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error al generar el token de acceso"
         )
     
-    print(f"DEBUG: Token generado correctamente para usuario {user.id}. Segmentos: {len(token_parts)}")
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_token, _, _ = security.create_refresh_token(user.id)
+    logger.debug("Token generado correctamente para usuario %s", user.id)
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+# ----------------- Endpoint para RENOVAR el access token -----------------
+@router.post("/refresh-token", response_model=Token)
+async def refresh_access_token(
+    token_in: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Cambia un refresh token por un access token nuevo (con el rol y estado
+    actuales del usuario) y un refresh token nuevo. El usado queda revocado:
+    presentarlo otra vez falla.
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token inválido, expirado o revocado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = security.decode_refresh_token(token_in.refresh_token)
+    if payload is None:
+        raise invalid_exception
+    
+    if not await crud_async.revoke_refresh_token(db, payload["jti"], payload["exp"]):
+        logger.warning("Refresh token reutilizado para el usuario %s", payload["sub"])
+        raise invalid_exception
+    
+    user = await crud_async.get_user_by_id(db, user_id=payload["sub"])
+    if not user or not user.activo:
+        await db.rollback()
+        raise invalid_exception
+    
+    await crud_async.purge_expired_revoked_tokens(db)
+    await db.commit()
+    return _issue_tokens(user)
+
+# ----------------- Endpoint para CERRAR SESIÓN (revoca el refresh token) -----------------
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token_in: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+) -> None:
+    """
+    Revoca el refresh token. El access token sigue siendo válido hasta que expira.
+    """
+    payload = security.decode_refresh_token(token_in.refresh_token)
+    if payload is not None:
+        await crud_async.revoke_refresh_token(db, payload["jti"], payload["exp"])
+        await crud_async.purge_expired_revoked_tokens(db)
+        await db.commit()
 
 # Endpoint para probar si el token funciona
 @router.get("/test-token", response_model=UserSchema)
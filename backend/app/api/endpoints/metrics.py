@@ -0,0 +1,41 @@
+# backend/app/api/endpoints/metrics.py
+import os
+from fastapi import APIRouter, Depends
+from typing import Any
+
+from app.api import deps
+from app.db.pool import pool_stats
+from app.db.session import async_engine, async_replica_engine, engine, replica_engine
+from app.schemas.cache_stats import CacheStats
+from app.schemas.db_pool import DatabasePoolStats
+from app.schemas.token import TokenPayload
+from app.services.response_cache import response_cache
+
+router = APIRouter()
+
+# ----------------- Endpoint para CONSULTAR el estado de los pools de conexiones -----------------
+@router.get("/db-pool", response_model=DatabasePoolStats)
+async def read_db_pool_stats(
+    claims: TokenPayload = Depends(deps.get_current_active_admin_user)
+) -> Any:
+    """
+    Conexiones en uso, overflow y tiempos de espera de checkout de los pools
+    sync y async del worker que atiende el request. Solo administradores.
+    """
+    return {
+        "pid": os.getpid(),
+        "sync_pool": pool_stats(engine.pool),
+        "async_pool": pool_stats(async_engine.pool),
+        "replica_sync_pool": pool_stats(replica_engine.pool) if replica_engine is not None else None,
+        "replica_async_pool": pool_stats(async_replica_engine.pool) if async_replica_engine is not None else None,
+    }
+
+# ----------------- Endpoint para CONSULTAR las métricas de la caché de respuestas -----------------
+@router.get("/cache", response_model=CacheStats)
+async def read_cache_stats(
+    claims: TokenPayload = Depends(deps.get_current_active_admin_user)
+) -> Any:
+    """
+    Aciertos, fallos e invalidaciones de la caché de catálogos. Solo administradores.
+    """
+    return response_cache.stats()
@@ -1,10 +1,11 @@
 # backend/app/api/endpoints/recomendaciones.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app.api import deps
-from app.crud import crud_recomendacion_estudiante, crud_recurso, crud_task
+from app.crud import crud_recomendacion_estudiante
+from app.crud.pagination import MAX_LIMIT
 from app.schemas.recomendacion_estudiante import (
     RecomendacionEstudiante,
     RecomendacionEstudianteCreate,
@@ -15,15 +16,52 @@ from app.models.user import UserRole
 
 router = APIRouter()
 
+def _with_recurso_y_tarea(rec) -> RecomendacionEstudianteWithRecurso:
+    """
+    Recomendación con los datos del recurso y la tarea (ya cargados por
+    crud_recomendacion_estudiante.get_recomendaciones_by_estudiante, con INNER
+    JOIN: ambos existen siempre).
+    """
+    recurso, tarea = rec.recurso, rec.tarea
+    return RecomendacionEstudianteWithRecurso(
+        id=rec.id,
+        estudiante_id=rec.estudiante_id,
+        tarea_id=rec.tarea_id,
+        recurso_id=rec.recurso_id,
+        fecha_recomendacion=rec.fecha_recomendacion,
+        vista=rec.vista,
+        fecha_vista=rec.fecha_vista,
+        recurso={
+            "id": recurso.id,
+            "titulo": recurso.titulo,
+            "tipo": recurso.tipo,
+            "url": recurso.url,
+            "ruta_archivo": recurso.ruta_archivo,
+            "descripcion": recurso.descripcion,
+            "duracion_minutos": recurso.duracion_minutos,
+            "nivel_dificultad": recurso.nivel_dificultad
+        },
+        tarea={
+            "id": tarea.id,
+            "titulo": tarea.titulo,
+            "descripcion": tarea.descripcion
+        }
+    )
+
 # ----------------- Endpoint para OBTENER recomendaciones del estudiante actual -----------------
 @router.get("/me", response_model=List[RecomendacionEstudianteWithRecurso])
 async def read_my_recomendaciones(
+    response: Response,
     solo_no_vistas: bool = False,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     db: Session = Depends(deps.get_db),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
-    Obtiene todas las recomendaciones del estudiante autenticado.
+    Obtiene las recomendaciones del estudiante autenticado, de la más reciente a
+    la más antigua (página siguiente en la cabecera X-Next-Cursor).
     Acceso: Solo estudiantes.
     """
     if current_user.rol != UserRole.ESTUDIANTE:
@@ -33,42 +71,12 @@ async def read_my_recomendaciones(
         )
     
     recomendaciones = crud_recomendacion_estudiante.get_recomendaciones_by_estudiante(
-        db, estudiante_id=current_user.id, solo_no_vistas=solo_no_vistas
+        db, estudiante_id=current_user.id, solo_no_vistas=solo_no_vistas, skip=skip, limit=limit, cursor=cursor
     )
     
-    # Enriquecer con información del recurso y tarea
-    result = []
-    for rec in recomendaciones:
-        recurso = crud_recurso.get_recurso_by_id(db, recurso_id=rec.recurso_id)
-        tarea = crud_task.get_task_by_id(db, task_id=rec.tarea_id)
-        
-        rec_dict = {
-            "id": rec.id,
-            "estudiante_id": rec.estudiante_id,
-            "tarea_id": rec.tarea_id,
-            "recurso_id": rec.recurso_id,
-            "fecha_recomendacion": rec.fecha_recomendacion,
-            "vista": rec.vista,
-            "fecha_vista": rec.fecha_vista,
-            "recurso": {
-                "id": recurso.id,
-                "titulo": recurso.titulo,
-                "tipo": recurso.tipo,
-                "url": recurso.url,
-                "ruta_archivo": recurso.ruta_archivo,
-                "descripcion": recurso.descripcion,
-                "duracion_minutos": recurso.duracion_minutos,
-                "nivel_dificultad": recurso.nivel_dificultad
-            } if recurso else None,
-            "tarea": {
-                "id": tarea.id,
-                "titulo": tarea.titulo,
-                "descripcion": tarea.descripcion
-            } if tarea else None
-        }
-        result.append(RecomendacionEstudianteWithRecurso(**rec_dict))
-    
-    return result
+    deps.set_next_cursor(response, recomendaciones)
+    # Recurso y tarea vienen cargados en la misma consulta
+    return [_with_recurso_y_tarea(rec) for rec in recomendaciones]
 
 # ----------------- Endpoint para MARCAR recomendación como vista -----------------
 @router.patch("/{recomendacion_id}/view", response_model=RecomendacionEstudiante)
@@ -130,6 +138,11 @@ async def delete_recomendacion(
 @router.get("/student/{estudiante_id}", response_model=List[RecomendacionEstudianteWithRecurso])
 async def read_recomendaciones_by_student(
     estudiante_id: int,
+    response: Response,
+    solo_no_vistas: bool = False,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     db: Session = Depends(deps.get_db),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
@@ -151,40 +164,10 @@ async def read_recomendaciones_by_student(
         )
     
     recomendaciones = crud_recomendacion_estudiante.get_recomendaciones_by_estudiante(
-        db, estudiante_id=estudiante_id, solo_no_vistas=False
+        db, estudiante_id=estudiante_id, solo_no_vistas=solo_no_vistas, skip=skip, limit=limit, cursor=cursor
     )
     
-    # Enriquecer con información del recurso y tarea
-    result = []
-    for rec in recomendaciones:
-        recurso = crud_recurso.get_recurso_by_id(db, recurso_id=rec.recurso_id)
-        tarea = crud_task.get_task_by_id(db, task_id=rec.tarea_id)
-        
-        rec_dict = {
-            "id": rec.id,
-            "estudiante_id": rec.estudiante_id,
-            "tarea_id": rec.tarea_id,
-            "recurso_id": rec.recurso_id,
-            "fecha_recomendacion": rec.fecha_recomendacion,
-            "vista": rec.vista,
-            "fecha_vista": rec.fecha_vista,
-            "recurso": {
-                "id": recurso.id,
-                "titulo": recurso.titulo,
-                "tipo": recurso.tipo,
-                "url": recurso.url,
-                "ruta_archivo": recurso.ruta_archivo,
-                "descripcion": recurso.descripcion,
-                "duracion_minutos": recurso.duracion_minutos,
-                "nivel_dificultad": recurso.nivel_dificultad
-            } if recurso else None,
-            "tarea": {
-                "id": tarea.id,
-                "titulo": tarea.titulo,
-                "descripcion": tarea.descripcion
-            } if tarea else None
-        }
-        result.append(RecomendacionEstudianteWithRecurso(**rec_dict))
-    
-    return result
+    deps.set_next_cursor(response, recomendaciones)
+    # Recurso y tarea vienen cargados en la misma consulta
+    return [_with_recurso_y_tarea(rec) for rec in recomendaciones]
 
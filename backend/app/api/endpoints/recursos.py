@@ -1,22 +1,32 @@
 # backend/app/api/endpoints/recursos.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 
 from app.api import deps
-from app.crud import crud_recurso, crud_recurso_concepto
+from app.crud import crud_interaccion_recurso, crud_recurso, crud_recurso_concepto
+from app.crud.pagination import MAX_LIMIT
 from app.schemas.recurso import Recurso, RecursoCreate, RecursoUpdate, RecursoWithConcepts
 from app.schemas.recurso_concepto import RecursoConceptosCreate
+from app.schemas.interaccion_recurso import RecursoStats
+from app.schemas.token import TokenPayload
 from app.models.user import User as UserModel
 from app.models.user import UserRole
+from app.services.blob_storage import blob_store
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, TAG_CONCEPTOS, TAG_RECURSOS, response_cache
 
 router = APIRouter()
 
+# Recursos por request en GET /recursos/stats
+MAX_RECURSOS_STATS = 200
+
 # ----------------- Endpoint para OBTENER todos los recursos -----------------
 @router.get("/", response_model=List[Recurso])
 async def read_recursos(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
     tipo: Optional[str] = None,
     nivel_dificultad: Optional[str] = None,
     solo_activos: bool = True,
@@ -29,41 +39,53 @@ async def read_recursos(
     - Docentes: Solo ven recursos asociados a conceptos de categorías relacionadas con sus cursos
     - Estudiantes: Ven todos los recursos activos
     Filtros opcionales: tipo, nivel_dificultad
+    (Respuesta cacheada: ver app.services.response_cache)
     """
-    from app.crud import crud_concepto
-    
-    # Si el usuario es docente, filtrar por categorías de conceptos de sus cursos
+    # Administradores y estudiantes comparten la misma respuesta; cada docente tiene la suya
+    es_docente = current_user.rol == UserRole.DOCENTE
+    key = ["docente", current_user.id] if es_docente else ["todos"]
+    tags = [TAG_RECURSOS, TAG_CONCEPTOS, TAG_CATEGORIAS_DOCENTE] if es_docente else [TAG_RECURSOS]
+    return response_cache.cached_response(
+        "recursos", key + [skip, limit, cursor, tipo, nivel_dificultad, solo_activos], tags, response, List[Recurso],
+        lambda: _read_recursos(response, skip, limit, cursor, tipo, nivel_dificultad, solo_activos, db, current_user)
+    )
+
+def _read_recursos(response, skip, limit, cursor, tipo, nivel_dificultad, solo_activos, db, current_user):
+    # Si el usuario es docente, filtrar por categorías de conceptos de sus cursos (una sola
+    # consulta contra el índice docente_categorias; sin categorías, la lista sale vacía)
     if current_user.rol == UserRole.DOCENTE:
-        categorias_profesor = crud_concepto.get_categorias_conceptos_by_teacher_courses(
-            db, teacher_id=current_user.id
+        recursos = crud_recurso.get_recursos_by_teacher(
+            db, teacher_id=current_user.id, tipo=tipo, nivel_dificultad=nivel_dificultad,
+            skip=skip, limit=limit, cursor=cursor, solo_activos=solo_activos
         )
-        
-        # Si el docente tiene cursos con conceptos asociados, filtrar
-        if categorias_profesor:
-            # Obtener recursos filtrados por categorías
-            recursos = crud_recurso.get_recursos_by_categorias_conceptos(
-                db, categorias=categorias_profesor, skip=skip, limit=limit, solo_activos=solo_activos
-            )
-            
-            # Aplicar filtros adicionales si se especifican
-            if tipo:
-                recursos = [r for r in recursos if r.tipo == tipo]
-            if nivel_dificultad:
-                recursos = [r for r in recursos if r.nivel_dificultad == nivel_dificultad]
-        else:
-            # Si el docente no tiene cursos con conceptos, retornar lista vacía
-            return []
     else:
         # Para administradores y estudiantes: comportamiento normal
         if tipo:
-            recursos = crud_recurso.get_recursos_by_tipo(db, tipo=tipo, skip=skip, limit=limit, solo_activos=solo_activos)
+            recursos = crud_recurso.get_recursos_by_tipo(db, tipo=tipo, skip=skip, limit=limit, cursor=cursor, solo_activos=solo_activos)
         elif nivel_dificultad:
-            recursos = crud_recurso.get_recursos_by_nivel_dificultad(db, nivel=nivel_dificultad, skip=skip, limit=limit, solo_activos=solo_activos)
+            recursos = crud_recurso.get_recursos_by_nivel_dificultad(db, nivel=nivel_dificultad, skip=skip, limit=limit, cursor=cursor, solo_activos=solo_activos)
         else:
-            recursos = crud_recurso.get_recursos(db, skip=skip, limit=limit, solo_activos=solo_activos)
+            recursos = crud_recurso.get_recursos(db, skip=skip, limit=limit, cursor=cursor, solo_activos=solo_activos)
     
+    deps.set_next_cursor(response, recursos)
     return recursos
 
+# ----------------- Endpoint para OBTENER estadísticas de varios recursos -----------------
+@router.get("/stats", response_model=List[RecursoStats])
+async def read_recursos_stats(
+    recurso_id: List[int] = Query([], max_length=MAX_RECURSOS_STATS),
+    db: Session = Depends(deps.get_db),
+    claims: TokenPayload = Depends(deps.get_current_active_staff_user)
+) -> Any:
+    """
+    Estadísticas de interacciones (vistas, completados, calificaciones, mejoras) de
+    los recursos indicados (?recurso_id=1&recurso_id=2...), en una sola consulta:
+    un listado de recursos pide las de toda la página de una vez.
+    Acceso: Solo administradores y docentes.
+    """
+    stats = crud_interaccion_recurso.get_recursos_stats(db, recurso_ids=recurso_id)
+    return [{"recurso_id": rid, **valores} for rid, valores in stats.items()]
+
 # ----------------- Endpoint para OBTENER un recurso por ID -----------------
 @router.get("/{recurso_id}", response_model=Recurso)
 async def read_recurso_by_id(
@@ -189,9 +211,49 @@ async def delete_recurso(
             detail="Recurso no encontrado"
         )
     
+    # Liberar el archivo (si es un blob) en la misma transacción que el borrado
+    sin_referencias = blob_store.release(db, db_recurso.ruta_archivo)
     crud_recurso.delete_recurso(db, recurso_id=recurso_id)
+    if sin_referencias:
+        blob_store.schedule_collection()
     return None
 
+# ----------------- Endpoint para SUBIR el PDF de un recurso -----------------
+@router.put("/{recurso_id}/archivo", response_model=Recurso)
+async def upload_recurso_archivo(
+    recurso_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(deps.get_db),
+    current_user: UserModel = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Sube (o reemplaza) el PDF de un recurso. El archivo se guarda por contenido,
+    así que un PDF ya usado por otro recurso o entrega no se duplica.
+    Acceso: Solo administradores y docentes.
+    """
+    if current_user.rol not in [UserRole.ADMINISTRADOR, UserRole.DOCENTE]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo administradores y docentes pueden subir archivos de recursos"
+        )
+    
+    db_recurso = crud_recurso.get_recurso_by_id(db, recurso_id=recurso_id)
+    if not db_recurso:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurso no encontrado"
+        )
+    
+    ruta_anterior = db_recurso.ruta_archivo
+    stored = await blob_store.store_pdf_upload(db, file)
+    sin_referencias = blob_store.release(db, ruta_anterior)
+    
+    # update_recurso hace el commit de la nueva referencia, la liberada y el recurso
+    recurso = crud_recurso.update_recurso(db, db_recurso=db_recurso, recurso_in=RecursoUpdate(ruta_archivo=stored.uri))
+    if sin_referencias:
+        blob_store.schedule_collection()
+    return recurso
+
 # ----------------- Endpoint para ACTIVAR/DESACTIVAR un recurso -----------------
 @router.patch("/{recurso_id}/toggle-activo", response_model=Recurso)
 async def toggle_recurso_activo(
@@ -1,36 +1,48 @@
 # backend/app/api/endpoints/submissions.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 from pathlib import Path
 from datetime import datetime, timezone
-import os
 
 from app.api import deps
-from app.crud import crud_submission, crud_task, crud_enrollment, crud_course # Necesitamos los 3 CRUDs
-from app.schemas.submission import Submission, SubmissionCreate, SubmissionUpdate, SubmissionWithStudent
+from app.db.loader import RequestLoader
+from app.crud import crud_submission
+from app.crud import crud_async, crud_blob
+from app.crud.pagination import MAX_LIMIT
+from app.schemas.submission import Submission, SubmissionCreate, SubmissionUpdate, SubmissionWithStudent, SubmissionBulkGrade
 from app.models.user import User as UserModel
 from app.models.user import UserRole
+from app.services.job_queue import job_queue
+from app.services.remedial_jobs import JOB_REMEDIAL_RECOMMENDATIONS
+from app.services.file_downloads import pdf_download_response
 
 router = APIRouter()
 
+# Nota bajo la cual se generan recomendaciones remediales (escala 0 a 100)
+UMBRAL_REMEDIAL = 60.0
+
 # ----------------- Endpoint para OBTENER las entregas de una TAREA (Solo Docente) -----------------
 @router.get("/task/{task_id}", response_model=List[SubmissionWithStudent])
 async def read_submissions_for_task(
     task_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: UserModel = Depends(deps.get_current_user)
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserModel = Depends(deps.get_current_user_async)
 ) -> Any:
     """
     Obtiene todas las entregas para una tarea específica con información del estudiante.
     Solo el docente propietario del curso o un admin pueden ver esto.
     """
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = await crud_async.get_task_by_id(db, task_id=task_id)
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
 
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
+    course = await crud_async.get_course_by_id(db, course_id=task.curso_id)
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Curso no encontrado")
     
@@ -42,15 +54,14 @@ async def read_submissions_for_task(
         )
 
     # Obtener entregas con información del estudiante
-    submissions = crud_submission.get_submissions_by_task(db, task_id=task_id)
+    submissions = await crud_async.get_submissions_by_task(db, task_id=task_id, skip=skip, limit=limit, cursor=cursor)
+    deps.set_next_cursor(response, submissions)
     
     # Cargar información del estudiante para cada entrega y construir respuesta
-    from app.crud import crud_user
-    from app.schemas.submission import SubmissionWithStudent
-    
+    students = await crud_async.get_users_by_ids(db, (submission.estudiante_id for submission in submissions))
     result = []
     for submission in submissions:
-        student = crud_user.get_user_by_id(db, user_id=submission.estudiante_id)
+        student = students.get(submission.estudiante_id)
         
         # Asegurar que submitted_at siempre tenga un valor válido
         submitted_at = submission.fecha_entrega
@@ -80,12 +91,87 @@ async def read_submissions_for_task(
     
     return result
 
+# ----------------- Endpoint para CALIFICAR varias entregas de una TAREA -----------------
+@router.put("/task/{task_id}/grades", response_model=List[Submission])
+async def grade_submissions_for_task(
+    task_id: int,
+    grades_in: SubmissionBulkGrade,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
+    current_user: UserModel = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Califica varias entregas de una tarea en una sola transacción.
+    Las notas se aplican con un UPDATE en lote; las recomendaciones remediales
+    de los estudiantes con nota baja se generan en segundo plano (header X-Job-Id).
+    Solo el docente propietario del curso o un admin pueden calificar.
+    """
+    task = loader.task(task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+    
+    course = loader.course(task.curso_id)
+    if current_user.rol != UserRole.ADMINISTRADOR and current_user.id != course.propietario_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="No tienes permiso para calificar las entregas de esta tarea"
+        )
+    
+    submission_ids = [item.submission_id for item in grades_in.grades]
+    if not submission_ids:
+        return []
+    if len(set(submission_ids)) != len(submission_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cada entrega solo puede aparecer una vez"
+        )
+    
+    # Validar que la nota esté en el rango válido (0 a 100)
+    for item in grades_in.grades:
+        if item.grade is not None and (item.grade < 0 or item.grade > 100):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La calificación de la entrega {item.submission_id} debe estar entre 0 y 100"
+            )
+    
+    # Verificar que todas las entregas pertenezcan a la tarea (una consulta)
+    submissions = crud_submission.get_submissions_by_ids(db, submission_ids=submission_ids)
+    found_ids = {submission.id for submission in submissions if submission.tarea_id == task_id}
+    missing_ids = [submission_id for submission_id in submission_ids if submission_id not in found_ids]
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entregas no encontradas en esta tarea: {missing_ids}"
+        )
+    
+    failing_ids = [
+        item.submission_id for item in grades_in.grades
+        if item.grade is not None and item.grade < UMBRAL_REMEDIAL
+    ]
+    
+    try:
+        crud_submission.grade_submissions_bulk(db, grades=grades_in.grades, commit=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    if failing_ids:
+        job_id = job_queue.enqueue(
+            JOB_REMEDIAL_RECOMMENDATIONS, {"submission_ids": failing_ids}, solicitante_id=current_user.id
+        )
+        response.headers["X-Job-Id"] = str(job_id)
+    
+    submissions = crud_submission.get_submissions_by_ids(db, submission_ids=submission_ids)
+    return [Submission.from_orm(submission) for submission in submissions]
+
 # ----------------- Endpoint para OBTENER la entrega del estudiante para una tarea específica -----------------
 @router.get("/task/{task_id}/my-submission", response_model=Submission)
 async def read_my_submission_for_task(
     task_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: UserModel = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserModel = Depends(deps.get_current_user_async)
 ) -> Any:
     """
     Obtiene la entrega del estudiante actual para una tarea específica.
@@ -98,7 +184,7 @@ async def read_my_submission_for_task(
         )
     
     # Verificar que la tarea existe
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = await crud_async.get_task_by_id(db, task_id=task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -106,7 +192,7 @@ async def read_my_submission_for_task(
         )
     
     # Verificar que el estudiante esté inscrito en el curso
-    enrollment = crud_enrollment.get_enrollment_by_user_and_course(
+    enrollment = await crud_async.get_enrollment_by_user_and_course(
         db, student_id=current_user.id, course_id=task.curso_id
     )
     if not enrollment:
@@ -116,7 +202,7 @@ async def read_my_submission_for_task(
         )
     
     try:
-        submission = crud_submission.get_submission_by_task_and_student(
+        submission = await crud_async.get_submission_by_task_and_student(
             db, task_id=task_id, student_id=current_user.id
         )
     except Exception as e:
@@ -156,6 +242,7 @@ async def read_my_submission_for_task(
 async def read_submission_by_id(
     submission_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -166,8 +253,8 @@ async def read_submission_by_id(
     if not submission:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entrega no encontrada")
     
-    task = crud_task.get_task_by_id(db, task_id=submission.tarea_id)
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
+    task = loader.task(submission.tarea_id)
+    course = loader.course(task.curso_id)
 
     if (current_user.rol == UserRole.ADMINISTRADOR or
         current_user.id == course.propietario_id or
@@ -192,19 +279,22 @@ async def read_submission_by_id(
 async def update_existing_submission(
     submission_id: int,
     submission_in: SubmissionUpdate,
+    response: Response,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Actualiza una entrega (usado por docentes para calificar).
-    Permite asignar una nota (1.0 a 7.0) y feedback.
+    Permite asignar una nota (0 a 100) y feedback. Si la nota es baja, las
+    recomendaciones remediales se generan en segundo plano (header X-Job-Id).
     """
     db_submission = crud_submission.get_submission_by_id(db, submission_id=submission_id)
     if not db_submission:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entrega no encontrada")
 
-    task = crud_task.get_task_by_id(db, task_id=db_submission.tarea_id)
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
+    task = loader.task(db_submission.tarea_id)
+    course = loader.course(task.curso_id)
 
     if current_user.rol != UserRole.ADMINISTRADOR and current_user.id != course.propietario_id:
         raise HTTPException(
@@ -223,36 +313,12 @@ async def update_existing_submission(
     
     submission = crud_submission.update_submission(db, db_submission=db_submission, submission_in=submission_in)
     
-    # Evaluation with Business Rules Engine
-    # Automatic Remediation Logic (Grade < 60)
-    if submission_in.grade is not None and submission_in.grade < 60.0:
-        try:
-            # 1. Get concepts linked to this task
-            from app.crud import crud_tarea_concepto, crud_recurso_concepto, crud_recomendacion_estudiante
-            from app.schemas.recomendacion_estudiante import RecomendacionEstudianteCreate
-            
-            # Obtener conceptos de la tarea
-            task_concepts = crud_tarea_concepto.get_conceptos_by_tarea(db, tarea_id=task.id)
-            
-            for tc in task_concepts:
-                # 2. Get resources linked to this concept
-                concept_resources = crud_recurso_concepto.get_recursos_by_concepto(db, concepto_id=tc.concepto_id)
-                
-                for rc in concept_resources:
-                    # 3. Create recommendation
-                    rec_in = RecomendacionEstudianteCreate(
-                        estudiante_id=submission.estudiante_id,
-                        tarea_id=task.id,
-                        recurso_id=rc.recurso_id
-                    )
-                    crud_recomendacion_estudiante.create_recomendacion(db, rec_in)
-            
-            print(f"INFO: Generated remedial recommendations for Student {submission.estudiante_id} (Grade: {submission_in.grade})")
-            
-        except Exception as e:
-            print(f"⚠️  Error generating recommendations: {e}")
-            import traceback
-            traceback.print_exc()
+    # Automatic Remediation Logic (Grade < 60): se delega a la cola de trabajos
+    if submission_in.grade is not None and submission_in.grade < UMBRAL_REMEDIAL:
+        job_id = job_queue.enqueue(
+            JOB_REMEDIAL_RECOMMENDATIONS, {"submission_ids": [submission.id]}, solicitante_id=current_user.id
+        )
+        response.headers["X-Job-Id"] = str(job_id)
     
     # Asegurar que submitted_at siempre tenga un valor válido
     submitted_at = submission.fecha_entrega
@@ -277,37 +343,33 @@ async def update_existing_submission(
 @router.get("/{submission_id}/download")
 async def download_submission_file(
     submission_id: int,
+    request: Request,
     db: Session = Depends(deps.get_db),
     current_user: UserModel = Depends(deps.get_current_user)
 ):
     """
     Descarga el archivo PDF de una entrega.
     Acceso: El estudiante que la entregó, el docente del curso, o un admin.
+    Soporta Range (206), ETag / If-None-Match y If-Modified-Since (304).
     """
-    submission = crud_submission.get_submission_by_id(db, submission_id=submission_id)
-    if not submission:
+    # Entrega + propietario del curso en una sola consulta
+    row = crud_submission.get_submission_with_course_owner(db, submission_id=submission_id)
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entrega no encontrada")
+    submission, propietario_id = row
     
     if not submission.ruta_archivo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Esta entrega no tiene archivo adjunto")
-    
-    task = crud_task.get_task_by_id(db, task_id=submission.tarea_id)
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
 
     # Verificar permisos
     if not (current_user.rol == UserRole.ADMINISTRADOR or
-            current_user.id == course.propietario_id or
+            current_user.id == propietario_id or
             current_user.id == submission.estudiante_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permiso para descargar este archivo")
     
-    # Verificar que el archivo existe
-    file_path = Path(submission.ruta_archivo)
-    if not file_path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="El archivo no existe en el servidor")
+    # Los blobs se nombran por hash: se descarga con un nombre legible
+    download_name = f"entrega_{submission.id}.pdf"
+    if crud_blob.parse_blob_uri(submission.ruta_archivo) is None:
+        download_name = Path(submission.ruta_archivo).name
     
-    return FileResponse(
-        path=str(file_path),
-        filename=file_path.name,
-        media_type='application/pdf'
-    )
-
+    return await pdf_download_response(request, submission.ruta_archivo, download_name)
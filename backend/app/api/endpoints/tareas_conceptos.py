@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from typing import List, Any
 
 from app.api import deps
-from app.crud import crud_tarea_concepto, crud_task, crud_course
+from app.db.loader import RequestLoader
+from app.crud import crud_tarea_concepto
 from app.schemas.tarea_concepto import TareaConceptosCreate, TareaConcepto
 from app.models.user import User as UserModel
 from app.models.user import UserRole
@@ -17,6 +18,7 @@ async def associate_conceptos_to_task(
     task_id: int,
     conceptos_in: TareaConceptosCreate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -24,7 +26,7 @@ async def associate_conceptos_to_task(
     Acceso: Solo el docente propietario del curso o administradores.
     """
     # Verificar que la tarea existe
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = loader.task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -32,7 +34,7 @@ async def associate_conceptos_to_task(
         )
     
     # Verificar permisos: solo docente propietario o admin
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
+    course = loader.course(task.curso_id)
     if course.propietario_id != current_user.id and current_user.rol != UserRole.ADMINISTRADOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -61,6 +63,7 @@ async def associate_conceptos_to_task(
 async def get_conceptos_by_task(
     task_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -68,7 +71,7 @@ async def get_conceptos_by_task(
     Acceso: Cualquier usuario autenticado.
     """
     # Verificar que la tarea existe
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = loader.task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,6 +86,7 @@ async def get_conceptos_by_task(
 async def delete_conceptos_from_task(
     task_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ):
     """
@@ -90,7 +94,7 @@ async def delete_conceptos_from_task(
     Acceso: Solo el docente propietario del curso o administradores.
     """
     # Verificar que la tarea existe
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = loader.task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -98,7 +102,7 @@ async def delete_conceptos_from_task(
         )
     
     # Verificar permisos
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
+    course = loader.course(task.curso_id)
     if course.propietario_id != current_user.id and current_user.rol != UserRole.ADMINISTRADOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
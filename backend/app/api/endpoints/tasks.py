@@ -1,19 +1,20 @@
 # backend/app/api/endpoints/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, status, Response, File, UploadFile, Form # <-- Añade File, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response, File, UploadFile, Form # <-- Añade File, UploadFile, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from datetime import datetime, timezone # Para validación de fechas
-import os
-import shutil
-from pathlib import Path
 
 from app.api import deps
-from app.crud import crud_task, crud_course # Necesitamos crud_course para verificar si el curso existe
+from app.db.loader import RequestLoader
+from app.crud import crud_task
 from app.schemas.task import Task, TaskCreate, TaskUpdate # Importamos los esquemas de Task
 from app.models.user import User as UserModel # Importamos el modelo User para tipos de current_user
 from app.models.user import UserRole # Para verificar roles
 from app.schemas.submission import Submission, SubmissionCreate
-from app.crud import crud_submission, crud_enrollment
+from app.crud import crud_enrollment, crud_async, crud_blob
+from app.crud.pagination import MAX_LIMIT
+from app.services.blob_storage import blob_store
 
 router = APIRouter()
 
@@ -22,6 +23,7 @@ router = APIRouter()
 async def create_new_task(
     task_in: TaskCreate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -35,7 +37,7 @@ async def create_new_task(
         )
     
     # Verificar que el curso existe y pertenece al usuario actual (docente)
-    course = crud_course.get_course_by_id(db, course_id=task_in.course_id)
+    course = loader.course(task_in.course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -66,20 +68,21 @@ async def create_new_task(
 async def read_task_by_id(
     task_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtiene una tarea por su ID.
     Acceso: Docente del curso, estudiante inscrito en el curso, o administrador.
     """
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = loader.task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarea no encontrada."
         )
 
-    course = crud_course.get_course_by_id(db, course_id=task.curso_id)
+    course = loader.course(task.curso_id)
     if not course: # Esto no debería pasar si la FK es correcta, pero es un buen check
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -111,16 +114,19 @@ async def read_task_by_id(
 @router.get("/course/{course_id}", response_model=List[Task])
 async def read_tasks_by_course(
     course_id: int,
+    response: Response,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user),
-    skip: int = 0,
-    limit: int = 100
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None
 ) -> Any:
     """
     Obtiene todas las tareas para un curso específico.
     Acceso: Docente del curso, estudiante inscrito en el curso, o administrador.
     """
-    course = crud_course.get_course_by_id(db, course_id=course_id)
+    course = loader.course(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -129,11 +135,13 @@ async def read_tasks_by_course(
 
     # Lógica de Permisos Unificada
     if current_user.rol == UserRole.ADMINISTRADOR:
-        tasks = crud_task.get_tasks_by_course(db, course_id=course_id, skip=skip, limit=limit)
+        tasks = crud_task.get_tasks_by_course(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
+        deps.set_next_cursor(response, tasks)
         return tasks
 
     if current_user.id == course.propietario_id: # Docente propietario
-        tasks = crud_task.get_tasks_by_course(db, course_id=course_id, skip=skip, limit=limit)
+        tasks = crud_task.get_tasks_by_course(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
+        deps.set_next_cursor(response, tasks)
         return tasks
 
     if current_user.rol == UserRole.ESTUDIANTE:
@@ -142,7 +150,8 @@ async def read_tasks_by_course(
             db, student_id=current_user.id, course_id=course_id
         )
         if enrollment: # Si hay una inscripción, el estudiante puede ver las tareas
-            tasks = crud_task.get_tasks_by_course(db, course_id=course_id, skip=skip, limit=limit)
+            tasks = crud_task.get_tasks_by_course(db, course_id=course_id, skip=skip, limit=limit, cursor=cursor)
+            deps.set_next_cursor(response, tasks)
             return tasks
 
     # Si ninguna de las condiciones anteriores se cumple, denegar el acceso
@@ -157,6 +166,7 @@ async def update_existing_task(
     task_id: int,
     task_in: TaskUpdate,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
@@ -169,7 +179,7 @@ async def update_existing_task(
             detail="Solo docentes o administradores pueden actualizar tareas."
         )
 
-    db_task = crud_task.get_task_by_id(db, task_id=task_id)
+    db_task = loader.task(task_id)
     if not db_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -177,7 +187,7 @@ async def update_existing_task(
         )
     
     # Verificar que el usuario actual es el propietario del curso de la tarea
-    course = crud_course.get_course_by_id(db, course_id=db_task.curso_id)
+    course = loader.course(db_task.curso_id)
     if course.propietario_id != current_user.id and current_user.rol != UserRole.ADMINISTRADOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -200,6 +210,7 @@ async def update_existing_task(
 async def delete_existing_task(
     task_id: int,
     db: Session = Depends(deps.get_db),
+    loader: RequestLoader = Depends(deps.get_loader),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Response: # <-- Cambiado a Response para que no devuelva cuerpo
     """
@@ -212,21 +223,25 @@ async def delete_existing_task(
             detail="Solo docentes o administradores pueden eliminar tareas."
         )
 
-    db_task = crud_task.get_task_by_id(db, task_id=task_id)
+    db_task = loader.task(task_id)
     if not db_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarea no encontrada."
         )
     
-    course = crud_course.get_course_by_id(db, course_id=db_task.curso_id)
+    course = loader.course(db_task.curso_id)
     if course.propietario_id != current_user.id and current_user.rol != UserRole.ADMINISTRADOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permiso para eliminar esta tarea."
         )
 
+    # Liberar los archivos de las entregas (se eliminan en cascada) en la misma transacción que el borrado
+    sin_referencias = blob_store.release_many(db, crud_blob.get_task_file_paths(db, [task_id]))
     crud_task.delete_task(db, task_id=task_id)
+    if sin_referencias:
+        blob_store.schedule_collection()
     return Response(status_code=status.HTTP_204_NO_CONTENT) # <-- ¡La corrección clave!
 
 
@@ -235,11 +250,12 @@ async def submit_task(
     task_id: int,
     file: UploadFile = File(None),
     content: str = Form(None),
-    db: Session = Depends(deps.get_db),
-    current_user: UserModel = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserModel = Depends(deps.get_current_user_async)
 ) -> Any:
     """
     Permite a un estudiante autenticado entregar una tarea.
+    Usa la sesión async: es el endpoint más concurrido cerca de la fecha límite.
     """
     # 1. Verificar que el usuario es un estudiante
     if current_user.rol != UserRole.ESTUDIANTE:
@@ -249,7 +265,7 @@ async def submit_task(
         )
 
     # 2. Verificar que la tarea existe
-    task = crud_task.get_task_by_id(db, task_id=task_id)
+    task = await crud_async.get_task_by_id(db, task_id=task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -257,7 +273,7 @@ async def submit_task(
         )
 
     # 3. ¡NUEVO! Verificar que el estudiante esté inscrito en el curso de la tarea
-    enrollment = crud_enrollment.get_enrollment_by_user_and_course(
+    enrollment = await crud_async.get_enrollment_by_user_and_course(
         db, student_id=current_user.id, course_id=task.curso_id
     )
     if not enrollment:
@@ -267,7 +283,7 @@ async def submit_task(
         )
 
     # 4. Verificar que el estudiante no haya entregado ya esta tarea
-    existing_submission = crud_submission.get_submission_by_task_and_student(
+    existing_submission = await crud_async.get_submission_by_task_and_student(
         db, task_id=task_id, student_id=current_user.id
     )
     if existing_submission:
@@ -286,30 +302,14 @@ async def submit_task(
     # 6. Manejar archivo PDF si se envió
     file_path = None
     if file:
-        # Validar que sea un PDF
-        if not file.filename.endswith('.pdf'):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Solo se permiten archivos PDF."
-            )
-        
-        # Crear directorio de uploads si no existe
-        from app.core.config import settings
-        upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generar nombre único para el archivo
-        file_extension = Path(file.filename).suffix
-        file_name = f"task_{task_id}_student_{current_user.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_extension}"
-        file_path = str(upload_dir / file_name)
-        
-        # Guardar el archivo
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Validar (extensión, firma %PDF, tamaño) y guardar por contenido: un PDF
+        # idéntico (reenvío, integrantes de un grupo) se almacena una sola vez
+        stored = await blob_store.store_pdf_upload(db, file)
+        file_path = stored.uri
 
     # 7. Crear la entrega
     submission_in = SubmissionCreate(content=content, file_path=file_path)
-    submission = crud_submission.create_submission(
+    submission = await crud_async.create_submission(
         db, submission_in=submission_in, task_id=task_id, student_id=current_user.id, file_path=file_path
     )
     
@@ -1,11 +1,13 @@
 # backend/app/api/endpoints/users.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app.api import deps
 from app.crud import crud_user
+from app.crud.pagination import MAX_LIMIT
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.schemas.token import TokenPayload
 from app.models.user import User, UserRole # <-- ¡AQUÍ ESTÁ TU MODELO User de SQLAlchemy!
 
 router = APIRouter()
@@ -66,19 +68,16 @@ async def read_user_by_id(
 # ----------------- Endpoint para obtener todos los usuarios (Solo Admin) -----------------
 @router.get("/", response_model=List[UserSchema])
 async def read_all_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(deps.get_current_user) # <-- ¡Y AQUÍ!
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    claims: TokenPayload = Depends(deps.get_current_active_admin_user) # Autoriza con el rol del token
 ) -> Any:
     """
     Obtiene una lista de todos los usuarios (solo para administradores).
     """
-    if current_user.rol != UserRole.ADMINISTRADOR: # <-- Acceso a UserRole
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver todos los usuarios."
-        )
-    
-    users = crud_user.get_users(db, skip=skip, limit=limit)
+    users = crud_user.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    deps.set_next_cursor(response, users)
     return users
\ No newline at end of file
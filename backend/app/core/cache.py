@@ -0,0 +1,60 @@
+# backend/app/core/cache.py
+"""
+Caché en memoria (por proceso) con tamaño máximo (LRU) y expiración (TTL).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Diccionario acotado: descarta la entrada usada hace más tiempo al llenarse
+    y las que superan su TTL. Seguro entre hilos (los endpoints sync corren en un threadpool).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is None:
+                self.misses += 1
+                return None
+            valor, expira = entrada
+            if expira <= time.monotonic():
+                del self._datos[key]
+                self.misses += 1
+                return None
+            self._datos.move_to_end(key)
+            self.hits += 1
+            return valor
+
+    def set(self, key: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        """Guarda un valor; ttl (segundos) reemplaza al TTL por defecto para esta entrada."""
+        if self.maxsize <= 0:
+            return
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._datos[key] = (valor, expira)
+            self._datos.move_to_end(key)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._datos.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
@@ -1,13 +1,18 @@
 # backend/app/core/security.py
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings # Importa la configuración
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Los hashes con otro costo se siguen aceptando, pero needs_update() los marca para re-hashear
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -15,6 +20,44 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña. Si es correcta y el hash usa otro costo, retorna
+    también el hash nuevo para guardarlo: (válida, hash_nuevo o None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# ----------------- Hash fuera del event loop -----------------
+# bcrypt consume ~100-300 ms de CPU por operación: en el event loop bloquearía
+# todos los requests del worker. Se ejecuta en un pool de threads acotado y, si
+# ya hay PASSWORD_HASH_MAX_PENDING operaciones esperando, se rechaza de inmediato.
+
+class PasswordHashingBusy(Exception):
+    """El pool de hash está saturado (main.py lo traduce a 503)."""
+
+
+_hash_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash"
+)
+_hash_slots = threading.BoundedSemaphore(
+    max(1, settings.PASSWORD_HASH_WORKERS) + max(0, settings.PASSWORD_HASH_MAX_PENDING)
+)
+
+async def _run_hashing(func, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Demasiados inicios de sesión simultáneos, intenta de nuevo")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_slots.release()
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
 def create_access_token(
     data: dict, expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -36,4 +79,39 @@ def create_access_token(
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+def access_token_claims(user) -> Dict[str, Any]:
+    """Claims del access token: ID, rol y estado del usuario (ver deps.get_token_claims)."""
+    return {"sub": user.id, "rol": user.rol.value, "activo": bool(user.activo), "type": "access"}
+
+def create_refresh_token(user_id: int) -> Tuple[str, str, datetime]:
+    """
+    Crea un refresh token. Retorna (token, jti, expira): el jti identifica el
+    token en la lista de revocación (revoked_tokens).
+    """
+    jti = uuid.uuid4().hex
+    expira = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    token = jwt.encode(
+        {"sub": str(user_id), "type": "refresh", "jti": jti, "exp": expira},
+        settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+    return token, jti, expira
+
+def decode_refresh_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Payload de un refresh token válido (firma, expiración y tipo), o None.
+    No consulta la lista de revocación.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.JWTError:
+        return None
+    if payload.get("type") != "refresh" or not payload.get("jti") or not payload.get("sub"):
+        return None
+    try:
+        payload["sub"] = int(payload["sub"])
+    except (TypeError, ValueError):
+        return None
+    payload["exp"] = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    return payload
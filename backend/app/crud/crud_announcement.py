@@ -1,10 +1,11 @@
 # backend/app/crud/crud_announcement.py
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 from sqlalchemy import and_
 
 from app.models.announcement import Announcement
 from app.schemas.announcement import AnnouncementCreate, AnnouncementUpdate
+from app.crud.pagination import CursorPage, paginate
 
 # ----------------- Crear un comunicado -----------------
 def create_announcement(db: Session, announcement_in: AnnouncementCreate, course_id: int, author_id: int) -> Announcement:
@@ -23,20 +24,22 @@ def create_announcement(db: Session, announcement_in: AnnouncementCreate, course
     return db_announcement
 
 # ----------------- Obtener comunicados por curso -----------------
-def get_announcements_by_course(db: Session, course_id: int, skip: int = 0, limit: int = 100) -> List[Announcement]:
+def get_announcements_by_course(db: Session, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los comunicados de un curso específico, ordenados por fecha de creación (más recientes primero).
     """
-    return db.query(Announcement).filter(
-        Announcement.curso_id == course_id
-    ).order_by(Announcement.fecha_creacion.desc()).offset(skip).limit(limit).all()
+    query = db.query(Announcement).filter(Announcement.curso_id == course_id)
+    return paginate(
+        query, Announcement.fecha_creacion, Announcement.id,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
 
 # ----------------- Obtener un comunicado por ID -----------------
 def get_announcement_by_id(db: Session, announcement_id: int) -> Optional[Announcement]:
     """
     Obtiene un comunicado específico por su ID.
     """
-    return db.query(Announcement).filter(Announcement.id == announcement_id).first()
+    return db.get(Announcement, announcement_id)
 
 # ----------------- Actualizar un comunicado -----------------
 def update_announcement(db: Session, db_announcement: Announcement, announcement_in: AnnouncementUpdate) -> Announcement:
@@ -0,0 +1,218 @@
+# backend/app/crud/crud_async.py
+"""
+Versiones async (AsyncSession) de las operaciones CRUD que usan los endpoints
+más concurridos: entregas de tareas, consulta de entregas y creación de exámenes.
+Siguen la misma semántica que sus equivalentes en crud_user, crud_course,
+crud_task, crud_enrollment, crud_submission, crud_exam y crud_exam_question.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.user import User
+from app.models.course import Course
+from app.models.task import Task
+from app.models.enrollment import Enrollment
+from app.models.submission import Submission
+from app.models.exam import Exam
+from app.models.exam_question import ExamQuestion, QuestionOption
+from app.models.revoked_token import RevokedToken
+from app.core.security import verify_and_update_password_async
+from app.crud.crud_blob import add_reference_statement
+from app.crud.pagination import CursorPage, apply_keyset, build_page
+from app.schemas.submission import SubmissionCreate
+from app.schemas.exam import ExamCreate
+from app.schemas.exam_question import ExamQuestionCreate
+
+# ----------------- Usuarios, cursos y tareas (por clave primaria) -----------------
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    """
+    Obtiene un usuario por su ID (usa el identity map de la sesión).
+    """
+    return await db.get(User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.correo == email).limit(1))
+    return result.scalar_one_or_none()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Verifica las credenciales con bcrypt fuera del event loop (security._run_hashing)
+    y re-hashea la contraseña si el costo configurado cambió.
+    """
+    user = await get_user_by_email(db, email=email)
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_password_async(password, user.contraseña_hash)
+    if not valid:
+        return None
+    if new_hash:
+        user.contraseña_hash = new_hash
+        await db.commit()
+    return user
+
+async def get_users_by_ids(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, User]:
+    """
+    Obtiene varios usuarios en una sola consulta, indexados por ID.
+    """
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    if not ids:
+        return {}
+    result = await db.execute(select(User).where(User.id.in_(ids)))
+    return {user.id: user for user in result.scalars()}
+
+async def get_course_by_id(db: AsyncSession, course_id: int) -> Optional[Course]:
+    """
+    Obtiene un curso por su ID.
+    """
+    return await db.get(Course, course_id)
+
+async def get_task_by_id(db: AsyncSession, task_id: int) -> Optional[Task]:
+    """
+    Obtiene una tarea por su ID.
+    """
+    return await db.get(Task, task_id)
+
+# ----------------- Inscripciones -----------------
+async def get_enrollment_by_user_and_course(db: AsyncSession, *, student_id: int, course_id: int) -> Optional[Enrollment]:
+    """
+    Verifica si un estudiante ya está inscrito en un curso.
+    """
+    result = await db.execute(
+        select(Enrollment).where(
+            Enrollment.estudiante_id == student_id,
+            Enrollment.curso_id == course_id
+        ).limit(1)
+    )
+    return result.scalars().first()
+
+# ----------------- Entregas de tareas -----------------
+async def get_submissions_by_task(db: AsyncSession, task_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
+    """
+    Obtiene las entregas de una tarea específica, ordenadas por ID (paginadas por cursor).
+    """
+    stmt = apply_keyset(
+        select(Submission).where(Submission.tarea_id == task_id),
+        Submission.id, Submission.id, cursor=cursor, skip=skip, limit=limit
+    )
+    result = await db.execute(stmt)
+    return build_page(list(result.scalars()), Submission.id, Submission.id, limit)
+
+async def get_submission_by_task_and_student(db: AsyncSession, task_id: int, student_id: int) -> Optional[Submission]:
+    """
+    Verifica si un estudiante ya entregó una tarea específica.
+    """
+    result = await db.execute(
+        select(Submission).where(
+            Submission.tarea_id == task_id,
+            Submission.estudiante_id == student_id
+        ).limit(1)
+    )
+    return result.scalars().first()
+
+async def create_submission(db: AsyncSession, submission_in: SubmissionCreate, task_id: int, student_id: int, file_path: Optional[str] = None) -> Submission:
+    """
+    Crea una nueva entrega. La fecha se fija en Python para no tener que
+    refrescar el objeto después del commit.
+    """
+    db_submission = Submission(
+        contenido=submission_in.content,
+        ruta_archivo=file_path or submission_in.file_path,
+        tarea_id=task_id,
+        estudiante_id=student_id,
+        fecha_entrega=datetime.now(timezone.utc)
+    )
+    db.add(db_submission)
+    await db.commit()
+    return db_submission
+
+# ----------------- Exámenes -----------------
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Las columnas de exams son DateTime sin zona horaria; asyncpg (a diferencia
+    # de psycopg2) rechaza datetimes con zona para ellas, así que se guardan en UTC.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+async def get_exam_with_questions(db: AsyncSession, exam_id: int) -> Optional[Exam]:
+    """
+    Obtiene un examen con sus preguntas y opciones ya cargadas.
+    """
+    result = await db.execute(
+        select(Exam).where(Exam.id == exam_id).options(
+            selectinload(Exam.questions).selectinload(ExamQuestion.opciones)
+        ).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def create_exam_with_questions(
+    db: AsyncSession,
+    exam_in: ExamCreate,
+    pdf_path: Optional[str] = None,
+    questions_in: Optional[List[ExamQuestionCreate]] = None
+) -> Exam:
+    """
+    Crea un examen, su PDF (ruta) y sus preguntas en una sola transacción
+    y lo retorna con las preguntas cargadas.
+    """
+    db_exam = Exam(
+        titulo=exam_in.title,
+        descripcion=exam_in.description,
+        fecha_programada=_naive_utc(exam_in.scheduled_at),
+        curso_id=exam_in.course_id,
+        ruta_pdf=pdf_path,
+        creado_en=_naive_utc(datetime.now(timezone.utc))
+    )
+    db.add(db_exam)
+    await db.flush()  # Para obtener el ID sin hacer commit
+
+    for idx, question_in in enumerate(questions_in or []):
+        db_question = ExamQuestion(
+            exam_id=db_exam.id,
+            texto=question_in.texto,
+            tipo=question_in.tipo,
+            puntos=question_in.puntos,
+            orden=question_in.orden or idx + 1  # Si no tiene orden, usar el índice
+        )
+        if question_in.tipo.value == "multiple_choice" and question_in.opciones:
+            db_question.opciones = [
+                QuestionOption(texto=opcion_in.texto, es_correcta=opcion_in.es_correcta, orden=opcion_in.orden)
+                for opcion_in in question_in.opciones
+            ]
+        db.add(db_question)
+
+    await db.commit()
+    return await get_exam_with_questions(db, db_exam.id)
+
+# ----------------- Blobs (almacenamiento por contenido) -----------------
+async def add_blob_reference(db: AsyncSession, sha256: str, tamano: int) -> None:
+    """
+    Registra una nueva referencia al blob (sin commit), igual que crud_blob.add_blob_reference.
+    """
+    await db.execute(add_reference_statement(sha256, tamano))
+
+
+# ----------------- Refresh tokens revocados -----------------
+async def revoke_refresh_token(db: AsyncSession, jti: str, expira: datetime) -> bool:
+    """
+    Agrega el token a la lista de revocación. Retorna False si ya estaba revocado:
+    así dos renovaciones simultáneas con el mismo token no pueden tener éxito ambas.
+    No hace commit.
+    """
+    result = await db.execute(
+        pg_insert(RevokedToken)
+        .values(jti=jti, expira=expira)
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        .returning(RevokedToken.jti)
+    )
+    return result.scalar_one_or_none() is not None
+
+async def purge_expired_revoked_tokens(db: AsyncSession) -> None:
+    """
+    Borra las revocaciones de tokens ya expirados (se rechazarían igual). No hace commit.
+    """
+    await db.execute(delete(RevokedToken).where(RevokedToken.expira < func.now()))
@@ -0,0 +1,125 @@
+# backend/app/crud/crud_blob.py
+from collections import Counter
+from sqlalchemy import Integer, String, column, func, select, update, values
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Iterable, List, Optional, Tuple
+
+from app.models.blob import Blob
+from app.models.exam import Exam
+from app.models.submission import Submission
+from app.models.task import Task
+
+# Prefijo de las rutas que apuntan a un blob (ruta_archivo / ruta_pdf)
+CAS_PREFIX = "cas://"
+
+def blob_uri(sha256: str) -> str:
+    return f"{CAS_PREFIX}{sha256}"
+
+def parse_blob_uri(ruta: Optional[str]) -> Optional[str]:
+    """
+    Retorna el SHA-256 si la ruta es 'cas://<sha256>', o None si es una ruta de archivo antigua.
+    """
+    if ruta and ruta.startswith(CAS_PREFIX):
+        return ruta[len(CAS_PREFIX):]
+    return None
+
+# ----------------- Sentencias compartidas (sesión sync y async) -----------------
+def add_reference_statement(sha256: str, tamano: int):
+    """
+    INSERT ... ON CONFLICT que crea el blob con una referencia o suma una a la existente.
+    Bloquea la fila hasta el commit, lo que impide que la recolección la borre mientras tanto.
+    """
+    stmt = pg_insert(Blob).values(sha256=sha256, tamano=tamano, referencias=1)
+    return stmt.on_conflict_do_update(
+        index_elements=[Blob.sha256],
+        set_={"referencias": Blob.referencias + 1}
+    )
+
+def release_reference_statement(sha256: str):
+    return update(Blob).where(
+        Blob.sha256 == sha256, Blob.referencias > 0
+    ).values(referencias=Blob.referencias - 1).returning(Blob.referencias)
+
+# ----------------- Sumar una referencia a un blob -----------------
+def add_blob_reference(db: Session, sha256: str, tamano: int) -> None:
+    """
+    Registra una nueva referencia al blob (sin commit: va en la transacción de quien lo usa).
+    """
+    db.execute(add_reference_statement(sha256, tamano))
+
+# ----------------- Liberar una referencia -----------------
+def release_blob_reference(db: Session, ruta: Optional[str]) -> Optional[int]:
+    """
+    Resta una referencia al blob de la ruta (si es 'cas://'). Sin commit.
+    Retorna las referencias restantes, o None si la ruta no es un blob.
+    """
+    sha256 = parse_blob_uri(ruta)
+    if sha256 is None:
+        return None
+    return db.execute(release_reference_statement(sha256)).scalar()
+
+def release_blob_references(db: Session, rutas: Iterable[Optional[str]]) -> bool:
+    """
+    Resta una referencia por cada ruta 'cas://' (las demás se ignoran) con un solo
+    UPDATE. Sin commit. Retorna True si algún blob quedó sin referencias.
+    """
+    conteo = Counter(sha256 for sha256 in map(parse_blob_uri, rutas) if sha256 is not None)
+    if not conteo:
+        return False
+    liberadas = values(
+        column("sha256", String), column("n", Integer), name="liberadas"
+    ).data(sorted(conteo.items()))
+    restantes = db.execute(
+        update(Blob)
+        .where(Blob.sha256 == liberadas.c.sha256)
+        .values(referencias=func.greatest(Blob.referencias - liberadas.c.n, 0))
+        .returning(Blob.referencias)
+    ).scalars().all()
+    return any(referencias == 0 for referencias in restantes)
+
+# ----------------- Rutas que deja de usar una eliminación en cascada -----------------
+def get_task_file_paths(db: Session, task_ids: Iterable[int]) -> List[str]:
+    """
+    Archivos de las entregas de las tareas dadas (se eliminan en cascada con ellas).
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return []
+    return list(db.scalars(
+        select(Submission.ruta_archivo).where(
+            Submission.tarea_id.in_(task_ids), Submission.ruta_archivo.isnot(None)
+        )
+    ))
+
+def get_course_file_paths(db: Session, course_id: int) -> List[str]:
+    """
+    Archivos de las entregas de las tareas y de los exámenes de un curso
+    (se eliminan en cascada con él).
+    """
+    entregas = select(Submission.ruta_archivo).join(Task, Task.id == Submission.tarea_id).where(
+        Task.curso_id == course_id, Submission.ruta_archivo.isnot(None)
+    )
+    examenes = select(Exam.ruta_pdf).where(Exam.curso_id == course_id, Exam.ruta_pdf.isnot(None))
+    return list(db.scalars(entregas.union_all(examenes)))
+
+# ----------------- Archivos huérfanos (sin fila en blobs) -----------------
+def adopt_orphan_blobs(db: Session, blobs: List[Tuple[str, int]]) -> int:
+    """
+    Registra con 0 referencias los blobs (sha256, tamano) que no tienen fila, para
+    que la recolección los elimine. Si hay una subida en curso del mismo contenido,
+    espera a su commit y no la toca. Sin commit. Retorna cuántos registró.
+    """
+    if not blobs:
+        return 0
+    stmt = pg_insert(Blob).values([
+        {"sha256": sha256, "tamano": tamano, "referencias": 0} for sha256, tamano in sorted(blobs)
+    ]).on_conflict_do_nothing(index_elements=[Blob.sha256]).returning(Blob.sha256)
+    return len(db.execute(stmt).all())
+
+# ----------------- Blobs sin referencias (para recolectar) -----------------
+def lock_unreferenced_blobs(db: Session, limit: int = 100) -> List[Blob]:
+    """
+    Obtiene y bloquea (FOR UPDATE SKIP LOCKED) blobs con 0 referencias.
+    """
+    return db.query(Blob).filter(Blob.referencias == 0).limit(limit).with_for_update(skip_locked=True).all()
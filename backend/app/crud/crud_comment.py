@@ -1,9 +1,10 @@
 # backend/app/crud/crud_comment.py
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 
 from app.models.comment import Comment
 from app.schemas.announcement import CommentCreate
+from app.crud.pagination import CursorPage, paginate
 
 # ----------------- Crear un comentario -----------------
 def create_comment(db: Session, comment_in: CommentCreate, announcement_id: int, author_id: int) -> Comment:
@@ -21,13 +22,12 @@ def create_comment(db: Session, comment_in: CommentCreate, announcement_id: int,
     return db_comment
 
 # ----------------- Obtener comentarios por comunicado -----------------
-def get_comments_by_announcement(db: Session, announcement_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
+def get_comments_by_announcement(db: Session, announcement_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los comentarios de un comunicado específico, ordenados por fecha de creación (más antiguos primero).
     """
-    return db.query(Comment).filter(
-        Comment.anuncio_id == announcement_id
-    ).order_by(Comment.fecha_creacion.asc()).offset(skip).limit(limit).all()
+    query = db.query(Comment).filter(Comment.anuncio_id == announcement_id)
+    return paginate(query, Comment.fecha_creacion, Comment.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener un comentario por ID -----------------
 def get_comment_by_id(db: Session, comment_id: int) -> Optional[Comment]:
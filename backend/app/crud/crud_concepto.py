@@ -4,6 +4,11 @@ from typing import List, Optional
 
 from app.models.concepto import Concepto
 from app.schemas.concepto import ConceptoCreate, ConceptoUpdate
+from app.crud.pagination import CursorPage, paginate
+from app.crud.crud_docente_categoria import (
+    categorias_docente_subquery, docentes_de_conceptos, get_categorias_by_docente, refresh_docente_categorias
+)
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, TAG_CONCEPTOS, response_cache
 
 # ----------------- Crear un nuevo concepto -----------------
 def create_concepto(db: Session, concepto_in: ConceptoCreate) -> Concepto:
@@ -18,6 +23,7 @@ def create_concepto(db: Session, concepto_in: ConceptoCreate) -> Concepto:
     )
     db.add(db_concepto)
     db.commit()
+    response_cache.invalidate(TAG_CONCEPTOS)
     db.refresh(db_concepto)
     return db_concepto
 
@@ -36,25 +42,27 @@ def get_concepto_by_nombre(db: Session, nombre: str) -> Optional[Concepto]:
     return db.query(Concepto).filter(Concepto.nombre == nombre).first()
 
 # ----------------- Obtener todos los conceptos -----------------
-def get_conceptos(db: Session, skip: int = 0, limit: int = 100) -> List[Concepto]:
+def get_conceptos(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los conceptos existentes en la base de datos.
     """
-    return db.query(Concepto).offset(skip).limit(limit).all()
+    return paginate(db.query(Concepto), Concepto.id, Concepto.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener conceptos por categoría -----------------
-def get_conceptos_by_categoria(db: Session, categoria: str, skip: int = 0, limit: int = 100) -> List[Concepto]:
+def get_conceptos_by_categoria(db: Session, categoria: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los conceptos de una categoría específica.
     """
-    return db.query(Concepto).filter(Concepto.categoria == categoria).offset(skip).limit(limit).all()
+    query = db.query(Concepto).filter(Concepto.categoria == categoria)
+    return paginate(query, Concepto.id, Concepto.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener conceptos por nivel -----------------
-def get_conceptos_by_nivel(db: Session, nivel: str, skip: int = 0, limit: int = 100) -> List[Concepto]:
+def get_conceptos_by_nivel(db: Session, nivel: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los conceptos de un nivel específico.
     """
-    return db.query(Concepto).filter(Concepto.nivel == nivel).offset(skip).limit(limit).all()
+    query = db.query(Concepto).filter(Concepto.nivel == nivel)
+    return paginate(query, Concepto.id, Concepto.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Actualizar un concepto -----------------
 def update_concepto(db: Session, db_concepto: Concepto, concepto_in: ConceptoUpdate) -> Concepto:
@@ -67,7 +75,10 @@ def update_concepto(db: Session, db_concepto: Concepto, concepto_in: ConceptoUpd
         setattr(db_concepto, field, value)
     
     db.add(db_concepto)
+    if "categoria" in update_data:
+        refresh_docente_categorias(db, docentes_de_conceptos(db, [db_concepto.id]))
     db.commit()
+    response_cache.invalidate(TAG_CONCEPTOS, TAG_CATEGORIAS_DOCENTE)
     db.refresh(db_concepto)
     return db_concepto
 
@@ -78,8 +89,11 @@ def delete_concepto(db: Session, concepto_id: int) -> Optional[Concepto]:
     """
     db_concepto = db.query(Concepto).filter(Concepto.id == concepto_id).first()
     if db_concepto:
+        docentes = docentes_de_conceptos(db, [concepto_id])
         db.delete(db_concepto)
+        refresh_docente_categorias(db, docentes)
         db.commit()
+        response_cache.invalidate(TAG_CONCEPTOS, TAG_CATEGORIAS_DOCENTE)
     return db_concepto
 
 # ----------------- Obtener categorías de conceptos usados en los cursos de un profesor -----------------
@@ -89,37 +103,33 @@ def get_categorias_conceptos_by_teacher_courses(db: Session, teacher_id: int) ->
     de los cursos que pertenecen a un profesor específico.
     
     Retorna una lista de nombres de categorías (sin duplicados).
+    Se lee del índice docente_categorias (ver crud_docente_categoria).
     """
-    from app.models.course import Course
-    from app.models.task import Task
-    from app.models.tarea_concepto import TareaConcepto
-    
-    # Query: Obtener categorías únicas de conceptos usados en tareas de cursos del profesor
-    categorias = db.query(Concepto.categoria).distinct().join(
-        TareaConcepto, TareaConcepto.concepto_id == Concepto.id
-    ).join(
-        Task, Task.id == TareaConcepto.tarea_id
-    ).join(
-        Course, Course.id == Task.curso_id
-    ).filter(
-        Course.propietario_id == teacher_id,
-        Concepto.categoria.isnot(None),
-        Concepto.categoria != ''
-    ).all()
-    
-    # Extraer solo los valores de las tuplas y filtrar None
-    return [cat[0] for cat in categorias if cat[0] is not None and cat[0].strip() != '']
+    return get_categorias_by_docente(db, teacher_id)
+
+# ----------------- Obtener conceptos de las categorías de un profesor -----------------
+def get_conceptos_by_teacher(db: Session, teacher_id: int, categoria: Optional[str] = None, nivel: Optional[str] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
+    """
+    Obtiene los conceptos de las categorías de los cursos de un profesor, en una
+    sola consulta contra el índice docente_categorias.
+    Filtros opcionales: categoria (debe ser una de las del profesor) y nivel.
+    """
+    query = db.query(Concepto).filter(Concepto.categoria.in_(categorias_docente_subquery(teacher_id)))
+    if categoria:
+        query = query.filter(Concepto.categoria == categoria)
+    if nivel:
+        query = query.filter(Concepto.nivel == nivel)
+    return paginate(query, Concepto.id, Concepto.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener conceptos por categorías -----------------
-def get_conceptos_by_categorias(db: Session, categorias: List[str], skip: int = 0, limit: int = 100) -> List[Concepto]:
+def get_conceptos_by_categorias(db: Session, categorias: List[str], skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los conceptos que pertenecen a alguna de las categorías especificadas.
     """
     if not categorias:
-        return []
+        return CursorPage()
     
-    return db.query(Concepto).filter(
-        Concepto.categoria.in_(categorias)
-    ).offset(skip).limit(limit).all()
+    query = db.query(Concepto).filter(Concepto.categoria.in_(categorias))
+    return paginate(query, Concepto.id, Concepto.id, cursor=cursor, skip=skip, limit=limit)
 
 
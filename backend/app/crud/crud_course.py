@@ -5,20 +5,23 @@ from typing import List, Optional
 from app.models.course import Course # Asegúrate de importar el modelo Course
 from app.models.user import User # Necesario para crear un curso asociado a un usuario
 from app.schemas.course import CourseCreate, CourseUpdate # Necesario para los esquemas
+from app.crud.pagination import CursorPage, paginate
+from app.crud.crud_docente_categoria import refresh_docente_categorias
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, TAG_COURSES, response_cache
 
 # ----------------- Obtener todos los cursos -----------------
-def get_courses(db: Session, skip: int = 0, limit: int = 100) -> List[Course]:
+def get_courses(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
-    Obtiene una lista de todos los cursos.
+    Obtiene una lista de todos los cursos, ordenados por ID.
     """
-    return db.query(Course).offset(skip).limit(limit).all()
+    return paginate(db.query(Course), Course.id, Course.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener un curso por ID -----------------
 def get_course_by_id(db: Session, course_id: int) -> Optional[Course]:
     """
     Obtiene un curso específico por su ID.
     """
-    return db.query(Course).filter(Course.id == course_id).first()
+    return db.get(Course, course_id)
 
 # ----------------- Obtener cursos por propietario (docente) -----------------
 def get_courses_by_owner(db: Session, owner_id: int) -> List[Course]:
@@ -39,6 +42,7 @@ def create_user_course(db: Session, course_in: CourseCreate, owner: User) -> Cou
     )
     db.add(db_course)
     db.commit()
+    response_cache.invalidate(TAG_COURSES)
     db.refresh(db_course)
     return db_course
 
@@ -51,6 +55,7 @@ def update_course(db: Session, db_obj: Course, obj_in: CourseUpdate) -> Course:
         setattr(db_obj, field, getattr(obj_in, field))
     db.add(db_obj)
     db.commit()
+    response_cache.invalidate(TAG_COURSES)
     db.refresh(db_obj)
     return db_obj
 
@@ -62,11 +67,13 @@ def delete_course(db: Session, id: int) -> Optional[Course]:
     db_course = db.query(Course).filter(Course.id == id).first()
     if db_course:
         db.delete(db_course)
+        refresh_docente_categorias(db, [db_course.propietario_id])
         db.commit()
+        response_cache.invalidate(TAG_COURSES, TAG_CATEGORIAS_DOCENTE)
     return db_course
 
 # ----------------- Obtener cursos disponibles para un estudiante (no inscritos) -----------------
-def get_available_courses_for_student(db: Session, student_id: int, skip: int = 0, limit: int = 100) -> List[Course]:
+def get_available_courses_for_student(db: Session, student_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene la lista de cursos a los que un estudiante NO está inscrito.
     Excluye los cursos que el estudiante ya tiene inscritos.
@@ -82,9 +89,8 @@ def get_available_courses_for_student(db: Session, student_id: int, skip: int =
     
     # Si no hay cursos inscritos, devolver todos los cursos
     if not enrolled_course_ids:
-        return db.query(Course).offset(skip).limit(limit).all()
+        return paginate(db.query(Course), Course.id, Course.id, cursor=cursor, skip=skip, limit=limit)
     
     # Query principal: Todos los cursos excepto los ya inscritos
-    return db.query(Course).filter(
-        ~Course.id.in_(enrolled_course_ids)
-    ).offset(skip).limit(limit).all()
\ No newline at end of file
+    query = db.query(Course).filter(~Course.id.in_(enrolled_course_ids))
+    return paginate(query, Course.id, Course.id, cursor=cursor, skip=skip, limit=limit)
@@ -0,0 +1,136 @@
+# backend/app/crud/crud_docente_categoria.py
+"""
+Mantenimiento del índice docente_categorias (docente -> categorías de los
+conceptos asociados a tareas de sus cursos).
+
+Los CRUD que cambian esa relación (asociar o quitar conceptos de una tarea,
+eliminar tareas, cursos o conceptos, cambiar la categoría de un concepto) llaman
+a refresh_docente_categorias() con los docentes afectados ANTES de su commit:
+las filas de esos docentes se recalculan en la misma transacción que el cambio.
+En PostgreSQL se toma un advisory lock por docente para que dos recálculos
+concurrentes del mismo docente no se pisen.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.models.concepto import Concepto
+from app.models.course import Course
+from app.models.docente_categoria import DocenteCategoria
+from app.models.tarea_concepto import TareaConcepto
+from app.models.task import Task
+
+# Primer argumento de pg_advisory_xact_lock(int, int): espacio de claves de este índice
+_LOCK_NAMESPACE = 19
+
+# ----------------- Consulta de origen (JOIN completo) -----------------
+def _categorias_calculadas():
+    """
+    SELECT DISTINCT (docente_id, categoria) calculado desde cursos, tareas y conceptos.
+    Es la definición del índice: la usan el recálculo, el backfill y el chequeo.
+    """
+    return select(
+        Course.propietario_id.label("docente_id"), Concepto.categoria
+    ).distinct().join(
+        TareaConcepto, TareaConcepto.concepto_id == Concepto.id
+    ).join(
+        Task, Task.id == TareaConcepto.tarea_id
+    ).join(
+        Course, Course.id == Task.curso_id
+    ).where(
+        Concepto.categoria.isnot(None),
+        func.trim(Concepto.categoria) != ''
+    )
+
+# ----------------- Docentes afectados por un cambio -----------------
+def docentes_de_tareas(db: Session, tarea_ids: Iterable[int]) -> Set[int]:
+    """
+    Docentes propietarios de los cursos de las tareas dadas.
+    """
+    tarea_ids = list(tarea_ids)
+    if not tarea_ids:
+        return set()
+    return set(db.scalars(
+        select(Course.propietario_id).join(Task, Task.curso_id == Course.id).where(Task.id.in_(tarea_ids))
+    ))
+
+def docentes_de_conceptos(db: Session, concepto_ids: Iterable[int]) -> Set[int]:
+    """
+    Docentes que tienen alguno de los conceptos dados en tareas de sus cursos.
+    """
+    concepto_ids = list(concepto_ids)
+    if not concepto_ids:
+        return set()
+    return set(db.scalars(
+        select(Course.propietario_id).distinct()
+        .join(Task, Task.curso_id == Course.id)
+        .join(TareaConcepto, TareaConcepto.tarea_id == Task.id)
+        .where(TareaConcepto.concepto_id.in_(concepto_ids))
+    ))
+
+# ----------------- Recalcular las categorías de algunos docentes -----------------
+def refresh_docente_categorias(db: Session, docente_ids: Iterable[int]) -> None:
+    """
+    Recalcula las filas de los docentes dados. No hace commit: se llama dentro de
+    la transacción del cambio que las afecta.
+    """
+    docente_ids = sorted(set(docente_ids))
+    if not docente_ids:
+        return
+    db.flush()  # El recálculo debe ver los cambios pendientes de la sesión
+    if db.get_bind().dialect.name == "postgresql":
+        # Siempre en el mismo orden, para no bloquearse entre transacciones
+        for docente_id in docente_ids:
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(:ns, :docente)"),
+                {"ns": _LOCK_NAMESPACE, "docente": docente_id}
+            )
+    db.execute(delete(DocenteCategoria).where(DocenteCategoria.docente_id.in_(docente_ids)))
+    calculadas = _categorias_calculadas().where(Course.propietario_id.in_(docente_ids))
+    db.execute(insert(DocenteCategoria).from_select(["docente_id", "categoria"], calculadas))
+
+# ----------------- Leer las categorías de un docente -----------------
+def get_categorias_by_docente(db: Session, docente_id: int) -> List[str]:
+    """
+    Categorías de un docente (una búsqueda por clave primaria).
+    """
+    return list(db.scalars(
+        select(DocenteCategoria.categoria)
+        .where(DocenteCategoria.docente_id == docente_id)
+        .order_by(DocenteCategoria.categoria)
+    ))
+
+def categorias_docente_subquery(docente_id: int):
+    """
+    Subconsulta con las categorías de un docente, para filtrar catálogos con IN.
+    """
+    return select(DocenteCategoria.categoria).where(DocenteCategoria.docente_id == docente_id)
+
+# ----------------- Backfill y chequeo de consistencia -----------------
+def backfill_docente_categorias(db: Session) -> int:
+    """
+    Reconstruye el índice completo desde cursos, tareas y conceptos.
+    Retorna el número de filas insertadas.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Los recálculos concurrentes esperan al backfill en vez de mezclarse con él
+        db.execute(text("LOCK TABLE docente_categorias IN EXCLUSIVE MODE"))
+    db.execute(delete(DocenteCategoria))
+    db.execute(insert(DocenteCategoria).from_select(["docente_id", "categoria"], _categorias_calculadas()))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(DocenteCategoria))
+
+def find_inconsistencies(db: Session) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Compara el índice con el JOIN completo.
+    Retorna {"faltantes": [...], "sobrantes": [...]} con pares (docente_id, categoria).
+    """
+    calculadas = {(fila.docente_id, fila.categoria) for fila in db.execute(_categorias_calculadas())}
+    guardadas = {(fila.docente_id, fila.categoria) for fila in db.execute(
+        select(DocenteCategoria.docente_id, DocenteCategoria.categoria)
+    )}
+    return {
+        "faltantes": sorted(calculadas - guardadas),
+        "sobrantes": sorted(guardadas - calculadas),
+    }
@@ -1,9 +1,11 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
 from app.models.enrollment import Enrollment # Importa el modelo de la BD
 from app.models.course import Course # Importa el modelo Course para la función join
-from app.models.user import User # Importa el modelo User
+from app.models.user import User, UserRole # Importa el modelo User
 from app.schemas.enrollment import EnrollmentCreate # Importa el esquema Pydantic
 
 # ----------------- Obtener una inscripción específica (para verificar si ya existe) -----------------
@@ -60,4 +62,85 @@ def delete_enrollment(db: Session, db_enrollment: Enrollment) -> Enrollment:
     """
     db.delete(db_enrollment)
     db.commit()
-    return db_enrollment
\ No newline at end of file
+    return db_enrollment
+
+# ----------------- Inscripción masiva -----------------
+def bulk_create_enrollments(db: Session, filas: Iterable[Tuple[int, str, str]], chunk_size: int = 5000,
+                            max_errores: Optional[int] = None) -> dict:
+    """
+    Inscribe estudiantes en cursos a partir de filas (linea, correo, course_id) sin
+    validar, por tramos de chunk_size: por tramo, una consulta IN de usuarios, una
+    de cursos y un INSERT multi-fila con ON CONFLICT DO NOTHING (índice único
+    uq_enrollments_estudiante_curso), y un commit. Las filas pueden venir de un
+    generador: no se cargan todas en memoria. Volver a importar es seguro.
+    Retorna {"procesadas", "inscritas", "ya_inscritas", "total_errores", "errores"};
+    con max_errores, "errores" guarda solo los primeros (total_errores los cuenta todos).
+    """
+    resultado = {"procesadas": 0, "inscritas": 0, "ya_inscritas": 0, "total_errores": 0, "errores": []}
+    vistas = set()  # Pares ya procesados en esta importación
+    tramo = []
+    for fila in filas:
+        tramo.append(fila)
+        if len(tramo) >= chunk_size:
+            _enroll_chunk(db, tramo, vistas, resultado, max_errores)
+            tramo = []
+    if tramo:
+        _enroll_chunk(db, tramo, vistas, resultado, max_errores)
+    return resultado
+
+def _enroll_chunk(db: Session, tramo: List[Tuple[int, str, str]], vistas: Set[Tuple[int, int]], resultado: dict,
+                  max_errores: Optional[int]) -> None:
+    errores = []
+    validas = []  # (linea, correo, course_id)
+    for linea, correo, course_id in tramo:
+        correo = (correo or "").strip()
+        try:
+            curso = int(str(course_id).strip())
+        except ValueError:
+            errores.append({"linea": linea, "correo": correo, "course_id": course_id, "error": "course_id no es un número"})
+            continue
+        if not correo:
+            errores.append({"linea": linea, "correo": correo, "course_id": course_id, "error": "Falta el correo"})
+            continue
+        validas.append((linea, correo, curso))
+
+    usuarios = {
+        fila.correo: fila for fila in db.execute(
+            select(User.id, User.correo, User.rol).where(User.correo.in_({correo for _, correo, _ in validas}))
+        )
+    }
+    cursos = set(db.scalars(select(Course.id).where(Course.id.in_({curso for _, _, curso in validas}))))
+
+    nuevas = []
+    for linea, correo, curso in validas:
+        usuario = usuarios.get(correo)
+        error = None
+        if usuario is None:
+            error = "Estudiante no encontrado"
+        elif usuario.rol != UserRole.ESTUDIANTE:
+            error = "El usuario especificado no es un estudiante"
+        elif curso not in cursos:
+            error = "Curso no encontrado"
+        if error:
+            errores.append({"linea": linea, "correo": correo, "course_id": str(curso), "error": error})
+            continue
+        par = (usuario.id, curso)
+        if par in vistas:
+            resultado["ya_inscritas"] += 1  # Repetida en el archivo
+            continue
+        vistas.add(par)
+        nuevas.append({"estudiante_id": usuario.id, "curso_id": curso})
+
+    if nuevas:
+        stmt = pg_insert(Enrollment).values(nuevas).on_conflict_do_nothing(
+            index_elements=[Enrollment.estudiante_id, Enrollment.curso_id]
+        ).returning(Enrollment.id)
+        inscritas = len(db.execute(stmt).all())
+        db.commit()
+        resultado["inscritas"] += inscritas
+        resultado["ya_inscritas"] += len(nuevas) - inscritas
+    resultado["procesadas"] += len(tramo)
+    resultado["total_errores"] += len(errores)
+    resultado["errores"].extend(sorted(errores, key=lambda error: error["linea"]))
+    if max_errores is not None:
+        del resultado["errores"][max_errores:]
@@ -1,14 +1,30 @@
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 
 from app.models.exam import Exam, ExamSubmission
+from app.models.course import Course
+from app.models.enrollment import Enrollment
 from app.schemas.exam import ExamCreate, ExamUpdate, ExamSubmissionCreate, ExamSubmissionUpdate
 
 # --- EXAM CRUD ---
 
 def get_exam(db: Session, exam_id: int) -> Optional[Exam]:
-    return db.query(Exam).filter(Exam.id == exam_id).first()
+    return db.get(Exam, exam_id)
+
+def get_exam_with_access(db: Session, exam_id: int, user_id: int) -> Optional[Tuple[Exam, int, bool]]:
+    """
+    Obtiene el examen, el propietario de su curso y si user_id está inscrito,
+    en una sola consulta (para autorizar la descarga del PDF).
+    """
+    inscrito = exists().where(
+        Enrollment.curso_id == Exam.curso_id,
+        Enrollment.estudiante_id == user_id
+    )
+    return db.query(Exam, Course.propietario_id, inscrito).join(
+        Course, Course.id == Exam.curso_id
+    ).filter(Exam.id == exam_id).first()
 
 def get_exams_by_course(db: Session, course_id: int) -> List[Exam]:
     return db.query(Exam).filter(Exam.curso_id == course_id).order_by(Exam.fecha_programada.desc()).all()
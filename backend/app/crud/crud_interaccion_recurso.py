@@ -1,9 +1,30 @@
 # backend/app/crud/crud_interaccion_recurso.py
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from app.models.interaccion_recurso import InteraccionRecurso
 from app.schemas.interaccion_recurso import InteraccionRecursoCreate, InteraccionRecursoUpdate
+from app.crud.pagination import CursorPage, paginate
+from app.crud.crud_recurso_stats import COUNTERS, aporte, aporte_de, apply_deltas, get_stats_rows, sumar_aportes
+
+logger = logging.getLogger(__name__)
+
+# Tipo de interacción de los heartbeats de reproducción
+TIPO_VISTA = "viewed"
+
+# Columnas que se fusionan al acumular heartbeats en una vista existente
+_CAMPOS_VISTA = ("tiempo_visto_segundos", "calificacion", "mejora_nota")
+
+
+class VistaAcumuladaDuplicada(Exception):
+    """El estudiante ya tiene una vista acumulada de ese recurso (main.py responde 409)."""
+
 
 # ----------------- Crear una interacción -----------------
 def create_interaccion(db: Session, interaccion_in: InteraccionRecursoCreate) -> InteraccionRecurso:
@@ -19,10 +40,134 @@ def create_interaccion(db: Session, interaccion_in: InteraccionRecursoCreate) ->
         mejora_nota=interaccion_in.mejora_nota or False
     )
     db.add(db_interaccion)
+    # Resumen recurso_stats: en la misma transacción que la interacción
+    deltas = {}
+    sumar_aportes(deltas, db_interaccion.recurso_id, aporte_de(db_interaccion))
+    apply_deltas(db, deltas)
     db.commit()
     db.refresh(db_interaccion)
     return db_interaccion
 
+# ----------------- Crear interacciones por lotes -----------------
+def create_interacciones_batch(db: Session, eventos: List[dict]) -> int:
+    """
+    Escribe un lote de eventos (dicts con las columnas de InteraccionRecurso) en una
+    transacción: un INSERT multi-fila para los eventos que no son "viewed", y los
+    "viewed" (heartbeats) se acumulan en la vista acumulada de cada estudiante y
+    recurso (ver _upsert_vistas). Se descartan los eventos de recursos o estudiantes
+    que ya no existen. Retorna el número de eventos escritos.
+    """
+    from app.models.recurso import Recurso
+    from app.models.user import User
+    
+    if not eventos:
+        return 0
+    
+    recursos = set(db.scalars(select(Recurso.id).where(Recurso.id.in_({e["recurso_id"] for e in eventos}))))
+    estudiantes = set(db.scalars(select(User.id).where(User.id.in_({e["estudiante_id"] for e in eventos}))))
+    validos = [e for e in eventos if e["recurso_id"] in recursos and e["estudiante_id"] in estudiantes]
+    if len(validos) < len(eventos):
+        logger.warning("Se descartan %s interacciones de recursos o estudiantes inexistentes", len(eventos) - len(validos))
+    
+    vistas: Dict[tuple, dict] = {}
+    otras = []
+    for evento in validos:
+        if evento["tipo_interaccion"] == TIPO_VISTA:
+            clave = (evento["estudiante_id"], evento["recurso_id"])
+            vistas[clave] = merge_vista(vistas[clave], evento) if clave in vistas else evento
+        else:
+            otras.append(evento)
+    
+    deltas = _deltas_de(otras)
+    if otras:
+        db.execute(insert(InteraccionRecurso), otras)
+    _upsert_vistas(db, list(vistas.values()), deltas)
+    apply_deltas(db, deltas)
+    db.commit()
+    return len(otras) + len(vistas)
+
+def merge_vista(anterior: dict, nuevo: dict) -> dict:
+    """
+    Fusiona dos eventos "viewed" del mismo estudiante y recurso: el mayor tiempo
+    visto, la calificación más reciente y mejora_nota si alguno la tiene.
+    """
+    tiempos = [t for t in (anterior["tiempo_visto_segundos"], nuevo["tiempo_visto_segundos"]) if t is not None]
+    return {
+        **anterior,
+        "tiempo_visto_segundos": max(tiempos) if tiempos else None,
+        "calificacion": nuevo["calificacion"] if nuevo["calificacion"] is not None else anterior["calificacion"],
+        "mejora_nota": anterior["mejora_nota"] or nuevo["mejora_nota"],
+    }
+
+def nuevo_evento(estudiante_id: int, datos: dict) -> dict:
+    """Dict con todas las columnas de una interacción, para los INSERT multi-fila."""
+    return {
+        "estudiante_id": estudiante_id,
+        "recurso_id": datos["recurso_id"],
+        "tipo_interaccion": datos.get("tipo_interaccion"),
+        "calificacion": datos.get("calificacion"),
+        "tiempo_visto_segundos": datos.get("tiempo_visto_segundos"),
+        "mejora_nota": bool(datos.get("mejora_nota")),
+    }
+
+def _upsert_vistas(db: Session, vistas: List[dict], deltas: Dict[int, Dict[str, int]]) -> None:
+    """
+    Acumula las vistas (sin repetir estudiante y recurso) en su vista acumulada:
+    1. INSERT ... ON CONFLICT DO NOTHING crea las que no existían (si otra
+       transacción está creando la misma, espera a su commit);
+    2. las que ya existían se bloquean (FOR UPDATE), se fusionan con merge_vista y
+       se actualizan.
+    Suma a `deltas` el cambio en recurso_stats (aporte nuevo menos aporte anterior).
+    """
+    if not vistas:
+        return
+    vistas = sorted(
+        ({**vista, "acumulada": True} for vista in vistas),
+        key=lambda vista: (vista["estudiante_id"], vista["recurso_id"])  # Orden fijo: sin deadlocks
+    )
+    insertadas = {tuple(fila) for fila in db.execute(
+        pg_insert(InteraccionRecurso).values(vistas).on_conflict_do_nothing(
+            index_elements=[InteraccionRecurso.estudiante_id, InteraccionRecurso.recurso_id],
+            index_where=(InteraccionRecurso.tipo_interaccion == TIPO_VISTA) & InteraccionRecurso.acumulada
+        ).returning(InteraccionRecurso.estudiante_id, InteraccionRecurso.recurso_id)
+    )}
+    for vista in vistas:
+        if (vista["estudiante_id"], vista["recurso_id"]) in insertadas:
+            sumar_aportes(deltas, vista["recurso_id"], aporte(TIPO_VISTA, vista["calificacion"], vista["mejora_nota"]))
+
+    pendientes = {(v["estudiante_id"], v["recurso_id"]): v for v in vistas if (v["estudiante_id"], v["recurso_id"]) not in insertadas}
+    if not pendientes:
+        return
+    existentes = db.execute(
+        select(InteraccionRecurso.id, InteraccionRecurso.estudiante_id, InteraccionRecurso.recurso_id,
+               *[getattr(InteraccionRecurso, campo) for campo in _CAMPOS_VISTA])
+        .where(
+            tuple_(InteraccionRecurso.estudiante_id, InteraccionRecurso.recurso_id).in_(list(pendientes)),
+            InteraccionRecurso.tipo_interaccion == TIPO_VISTA,
+            InteraccionRecurso.acumulada
+        )
+        .order_by(InteraccionRecurso.id)
+        .with_for_update()
+    ).all()
+    ahora = datetime.now(timezone.utc)
+    filas = []
+    for existente in existentes:
+        anterior = {campo: getattr(existente, campo) for campo in _CAMPOS_VISTA}
+        fusionada = merge_vista(anterior, pendientes[(existente.estudiante_id, existente.recurso_id)])
+        filas.append({"id": existente.id, "fecha_interaccion": ahora, **{campo: fusionada[campo] for campo in _CAMPOS_VISTA}})
+        sumar_aportes(deltas, existente.recurso_id, aporte(TIPO_VISTA, anterior["calificacion"], anterior["mejora_nota"]), signo=-1)
+        sumar_aportes(deltas, existente.recurso_id, aporte(TIPO_VISTA, fusionada["calificacion"], fusionada["mejora_nota"]))
+    if filas:
+        db.execute(update(InteraccionRecurso), filas)
+
+def _deltas_de(eventos: List[dict]) -> Dict[int, Dict[str, int]]:
+    deltas = {}
+    for evento in eventos:
+        sumar_aportes(deltas, evento["recurso_id"], aporte(
+            evento["tipo_interaccion"], evento["calificacion"], evento["mejora_nota"]
+        ))
+    return deltas
+
 # ----------------- Obtener una interacción por ID -----------------
 def get_interaccion_by_id(db: Session, interaccion_id: int) -> Optional[InteraccionRecurso]:
     """
@@ -31,31 +176,37 @@ def get_interaccion_by_id(db: Session, interaccion_id: int) -> Optional[Interacc
     return db.query(InteraccionRecurso).filter(InteraccionRecurso.id == interaccion_id).first()
 
 # ----------------- Obtener interacciones de un estudiante -----------------
-def get_interacciones_by_estudiante(db: Session, estudiante_id: int, skip: int = 0, limit: int = 100) -> List[InteraccionRecurso]:
+def get_interacciones_by_estudiante(db: Session, estudiante_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todas las interacciones de un estudiante.
     """
-    return db.query(InteraccionRecurso).filter(
-        InteraccionRecurso.estudiante_id == estudiante_id
-    ).order_by(InteraccionRecurso.fecha_interaccion.desc()).offset(skip).limit(limit).all()
+    query = db.query(InteraccionRecurso).filter(InteraccionRecurso.estudiante_id == estudiante_id)
+    return paginate(
+        query, InteraccionRecurso.fecha_interaccion, InteraccionRecurso.id,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
 
 # ----------------- Obtener interacciones de un recurso -----------------
-def get_interacciones_by_recurso(db: Session, recurso_id: int, skip: int = 0, limit: int = 100) -> List[InteraccionRecurso]:
+def get_interacciones_by_recurso(db: Session, recurso_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todas las interacciones de un recurso.
     """
-    return db.query(InteraccionRecurso).filter(
-        InteraccionRecurso.recurso_id == recurso_id
-    ).order_by(InteraccionRecurso.fecha_interaccion.desc()).offset(skip).limit(limit).all()
+    query = db.query(InteraccionRecurso).filter(InteraccionRecurso.recurso_id == recurso_id)
+    return paginate(
+        query, InteraccionRecurso.fecha_interaccion, InteraccionRecurso.id,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
 
 # ----------------- Obtener interacciones por tipo -----------------
-def get_interacciones_by_tipo(db: Session, tipo_interaccion: str, skip: int = 0, limit: int = 100) -> List[InteraccionRecurso]:
+def get_interacciones_by_tipo(db: Session, tipo_interaccion: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todas las interacciones de un tipo específico.
     """
-    return db.query(InteraccionRecurso).filter(
-        InteraccionRecurso.tipo_interaccion == tipo_interaccion
-    ).order_by(InteraccionRecurso.fecha_interaccion.desc()).offset(skip).limit(limit).all()
+    query = db.query(InteraccionRecurso).filter(InteraccionRecurso.tipo_interaccion == tipo_interaccion)
+    return paginate(
+        query, InteraccionRecurso.fecha_interaccion, InteraccionRecurso.id,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
 
 # ----------------- Actualizar una interacción -----------------
 def update_interaccion(db: Session, db_interaccion: InteraccionRecurso, interaccion_in: InteraccionRecursoUpdate) -> InteraccionRecurso:
@@ -64,10 +215,25 @@ def update_interaccion(db: Session, db_interaccion: InteraccionRecurso, interacc
     """
     update_data = interaccion_in.model_dump(exclude_unset=True)
     
+    # Resumen recurso_stats: se resta el aporte anterior y se suma el nuevo
+    deltas = {}
+    sumar_aportes(deltas, db_interaccion.recurso_id, aporte_de(db_interaccion), signo=-1)
+    
     for field, value in update_data.items():
         setattr(db_interaccion, field, value)
     
+    sumar_aportes(deltas, db_interaccion.recurso_id, aporte_de(db_interaccion))
     db.add(db_interaccion)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        # Una vista acumulada que dejó de ser "viewed" no puede volver a serlo si
+        # los heartbeats ya crearon otra para el mismo estudiante y recurso
+        db.rollback()
+        if "uq_interacciones_recursos_vista" in str(e.orig):
+            raise VistaAcumuladaDuplicada("El estudiante ya tiene una vista acumulada de este recurso") from e
+        raise
+    apply_deltas(db, deltas)
     db.commit()
     db.refresh(db_interaccion)
     return db_interaccion
@@ -79,32 +245,40 @@ def delete_interaccion(db: Session, interaccion_id: int) -> Optional[Interaccion
     """
     db_interaccion = db.query(InteraccionRecurso).filter(InteraccionRecurso.id == interaccion_id).first()
     if db_interaccion:
+        deltas = {}
+        sumar_aportes(deltas, db_interaccion.recurso_id, aporte_de(db_interaccion), signo=-1)
         db.delete(db_interaccion)
+        apply_deltas(db, deltas)
         db.commit()
     return db_interaccion
 
-# ----------------- Obtener estadísticas de un recurso -----------------
-def get_recurso_stats(db: Session, recurso_id: int) -> dict:
+# ----------------- Obtener estadísticas de varios recursos -----------------
+def get_recursos_stats(db: Session, recurso_ids: Iterable[int]) -> Dict[int, dict]:
     """
-    Obtiene estadísticas de interacciones de un recurso.
+    Obtiene estadísticas de interacciones de varios recursos desde el resumen
+    recurso_stats (una búsqueda por clave primaria por recurso, sin recorrer las
+    interacciones). Retorna {recurso_id: stats}; los recursos sin interacciones
+    tienen todo en 0.
     """
-    interacciones = db.query(InteraccionRecurso).filter(InteraccionRecurso.recurso_id == recurso_id).all()
-    
-    total_views = sum(1 for i in interacciones if i.tipo_interaccion == "viewed")
-    total_completions = sum(1 for i in interacciones if i.tipo_interaccion == "completed")
-    total_ratings = sum(1 for i in interacciones if i.tipo_interaccion == "rated")
-    avg_rating = sum(i.calificacion for i in interacciones if i.calificacion) / total_ratings if total_ratings > 0 else 0
-    total_mejoras = sum(1 for i in interacciones if i.mejora_nota)
-    
+    recurso_ids = list(dict.fromkeys(recurso_ids))
+    contadores = get_stats_rows(db, recurso_ids)
+    vacio = dict.fromkeys(COUNTERS, 0)
+    return {recurso_id: _recurso_stats(**contadores.get(recurso_id, vacio)) for recurso_id in recurso_ids}
+
+def _recurso_stats(total_interacciones, total_views, total_completions, total_ratings, suma_calificaciones, total_mejoras) -> dict:
+    # El promedio divide la suma de calificaciones por las interacciones de tipo "rated"
     return {
-        "total_interacciones": len(interacciones),
+        "total_interacciones": total_interacciones,
         "total_views": total_views,
         "total_completions": total_completions,
         "total_ratings": total_ratings,
-        "avg_rating": round(avg_rating, 2) if total_ratings > 0 else None,
+        "avg_rating": round(float(suma_calificaciones) / total_ratings, 2) if total_ratings > 0 else None,
         "total_mejoras": total_mejoras
     }
 
-
-
-
+# ----------------- Obtener estadísticas de un recurso -----------------
+def get_recurso_stats(db: Session, recurso_id: int) -> dict:
+    """
+    Obtiene estadísticas de interacciones de un recurso.
+    """
+    return get_recursos_stats(db, [recurso_id])[recurso_id]
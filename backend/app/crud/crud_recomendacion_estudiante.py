@@ -1,8 +1,11 @@
 # backend/app/crud/crud_recomendacion_estudiante.py
-from sqlalchemy.orm import Session
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional
 from datetime import datetime, timezone
 
+from app.crud.pagination import CursorPage, paginate
 from app.models.recomendacion_estudiante import RecomendacionEstudiante
 from app.schemas.recomendacion_estudiante import RecomendacionEstudianteCreate, RecomendacionEstudianteUpdate
 
@@ -31,6 +34,65 @@ def create_recomendacion(db: Session, recomendacion_in: RecomendacionEstudianteC
     db.refresh(db_recomendacion)
     return db_recomendacion
 
+# ----------------- Crear varias recomendaciones en una sola sentencia -----------------
+def create_recomendaciones_bulk(db: Session, estudiante_id: int, tarea_id: int, recurso_ids: List[int]) -> int:
+    """
+    Crea recomendaciones de varios recursos para un estudiante y una tarea con un único
+    INSERT multi-fila. Los duplicados se omiten gracias a uq_recomendacion_estudiante.
+    Retorna el número de recomendaciones efectivamente creadas.
+    """
+    if not recurso_ids:
+        return 0
+    
+    stmt = pg_insert(RecomendacionEstudiante).values([
+        {"estudiante_id": estudiante_id, "tarea_id": tarea_id, "recurso_id": recurso_id}
+        for recurso_id in recurso_ids
+    ]).on_conflict_do_nothing(constraint="uq_recomendacion_estudiante")
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
+
+# ----------------- Crear recomendaciones remediales para varias entregas -----------------
+def create_remedial_recomendaciones(db: Session, submission_ids: List[int], commit: bool = True) -> int:
+    """
+    Recomienda, para cada entrega indicada, todos los recursos activos que cubren algún
+    concepto de su tarea. Se resuelve en un único INSERT ... SELECT (entregas × conceptos
+    de la tarea × recursos del concepto), omitiendo las recomendaciones que ya existen.
+    Con commit=False el llamador controla la transacción.
+    Retorna el número de recomendaciones creadas.
+    """
+    from app.models.submission import Submission
+    from app.models.tarea_concepto import TareaConcepto
+    from app.models.recurso_concepto import RecursoConcepto
+    from app.models.recurso import Recurso
+    
+    if not submission_ids:
+        return 0
+    
+    candidatos = select(
+        Submission.estudiante_id,
+        Submission.tarea_id,
+        RecursoConcepto.recurso_id,
+        literal(False)
+    ).distinct().join(
+        TareaConcepto, TareaConcepto.tarea_id == Submission.tarea_id
+    ).join(
+        RecursoConcepto, RecursoConcepto.concepto_id == TareaConcepto.concepto_id
+    ).join(
+        Recurso, Recurso.id == RecursoConcepto.recurso_id
+    ).where(
+        Submission.id.in_(submission_ids),
+        Recurso.activo == True
+    )
+    
+    stmt = pg_insert(RecomendacionEstudiante).from_select(
+        ["estudiante_id", "tarea_id", "recurso_id", "vista"], candidatos
+    ).on_conflict_do_nothing(constraint="uq_recomendacion_estudiante")
+    result = db.execute(stmt)
+    if commit:
+        db.commit()
+    return result.rowcount
+
 # ----------------- Obtener una recomendación por ID -----------------
 def get_recomendacion_by_id(db: Session, recomendacion_id: int) -> Optional[RecomendacionEstudiante]:
     """
@@ -39,15 +101,23 @@ def get_recomendacion_by_id(db: Session, recomendacion_id: int) -> Optional[Reco
     return db.query(RecomendacionEstudiante).filter(RecomendacionEstudiante.id == recomendacion_id).first()
 
 # ----------------- Obtener recomendaciones de un estudiante -----------------
-def get_recomendaciones_by_estudiante(db: Session, estudiante_id: int, solo_no_vistas: bool = False) -> List[RecomendacionEstudiante]:
+def get_recomendaciones_by_estudiante(db: Session, estudiante_id: int, solo_no_vistas: bool = False, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
-    Obtiene todas las recomendaciones de un estudiante.
+    Obtiene las recomendaciones de un estudiante, de la más reciente a la más antigua,
+    con su recurso y su tarea ya cargados (un solo SELECT con JOIN).
     Si solo_no_vistas es True, solo retorna recomendaciones no vistas.
     """
-    query = db.query(RecomendacionEstudiante).filter(RecomendacionEstudiante.estudiante_id == estudiante_id)
+    query = db.query(RecomendacionEstudiante).options(
+        joinedload(RecomendacionEstudiante.recurso, innerjoin=True),
+        joinedload(RecomendacionEstudiante.tarea, innerjoin=True)
+    ).filter(RecomendacionEstudiante.estudiante_id == estudiante_id)
     if solo_no_vistas:
+        # Mismo predicado que el índice parcial ix_recomendaciones_estudiante_no_vistas
         query = query.filter(RecomendacionEstudiante.vista == False)
-    return query.order_by(RecomendacionEstudiante.fecha_recomendacion.desc()).all()
+    return paginate(
+        query, RecomendacionEstudiante.fecha_recomendacion, RecomendacionEstudiante.id,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
 
 # ----------------- Obtener recomendaciones de una tarea -----------------
 def get_recomendaciones_by_tarea(db: Session, tarea_id: int) -> List[RecomendacionEstudiante]:
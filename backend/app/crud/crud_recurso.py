@@ -4,6 +4,8 @@ from typing import List, Optional
 
 from app.models.recurso import Recurso
 from app.schemas.recurso import RecursoCreate, RecursoUpdate
+from app.crud.pagination import CursorPage, paginate
+from app.services.response_cache import TAG_RECURSOS, response_cache
 
 # ----------------- Crear un nuevo recurso -----------------
 def create_recurso(db: Session, recurso_in: RecursoCreate) -> Recurso:
@@ -23,6 +25,7 @@ def create_recurso(db: Session, recurso_in: RecursoCreate) -> Recurso:
     )
     db.add(db_recurso)
     db.commit()
+    response_cache.invalidate(TAG_RECURSOS)
     db.refresh(db_recurso)
     return db_recurso
 
@@ -34,7 +37,7 @@ def get_recurso_by_id(db: Session, recurso_id: int) -> Optional[Recurso]:
     return db.query(Recurso).filter(Recurso.id == recurso_id).first()
 
 # ----------------- Obtener todos los recursos -----------------
-def get_recursos(db: Session, skip: int = 0, limit: int = 100, solo_activos: bool = True) -> List[Recurso]:
+def get_recursos(db: Session, skip: int = 0, limit: int = 100, solo_activos: bool = True, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los recursos existentes en la base de datos.
     Si solo_activos es True, solo retorna recursos activos.
@@ -42,27 +45,27 @@ def get_recursos(db: Session, skip: int = 0, limit: int = 100, solo_activos: boo
     query = db.query(Recurso)
     if solo_activos:
         query = query.filter(Recurso.activo == True)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Recurso.id, Recurso.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener recursos por tipo -----------------
-def get_recursos_by_tipo(db: Session, tipo: str, skip: int = 0, limit: int = 100, solo_activos: bool = True) -> List[Recurso]:
+def get_recursos_by_tipo(db: Session, tipo: str, skip: int = 0, limit: int = 100, solo_activos: bool = True, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los recursos de un tipo específico.
     """
     query = db.query(Recurso).filter(Recurso.tipo == tipo)
     if solo_activos:
         query = query.filter(Recurso.activo == True)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Recurso.id, Recurso.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener recursos por nivel de dificultad -----------------
-def get_recursos_by_nivel_dificultad(db: Session, nivel: str, skip: int = 0, limit: int = 100, solo_activos: bool = True) -> List[Recurso]:
+def get_recursos_by_nivel_dificultad(db: Session, nivel: str, skip: int = 0, limit: int = 100, solo_activos: bool = True, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los recursos de un nivel de dificultad específico.
     """
     query = db.query(Recurso).filter(Recurso.nivel_dificultad == nivel)
     if solo_activos:
         query = query.filter(Recurso.activo == True)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Recurso.id, Recurso.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Actualizar un recurso -----------------
 def update_recurso(db: Session, db_recurso: Recurso, recurso_in: RecursoUpdate) -> Recurso:
@@ -76,6 +79,7 @@ def update_recurso(db: Session, db_recurso: Recurso, recurso_in: RecursoUpdate)
     
     db.add(db_recurso)
     db.commit()
+    response_cache.invalidate(TAG_RECURSOS)
     db.refresh(db_recurso)
     return db_recurso
 
@@ -88,6 +92,7 @@ def delete_recurso(db: Session, recurso_id: int) -> Optional[Recurso]:
     if db_recurso:
         db.delete(db_recurso)
         db.commit()
+        response_cache.invalidate(TAG_RECURSOS)
     return db_recurso
 
 # ----------------- Activar/Desactivar un recurso -----------------
@@ -100,11 +105,12 @@ def toggle_recurso_activo(db: Session, recurso_id: int) -> Optional[Recurso]:
         db_recurso.activo = not db_recurso.activo
         db.add(db_recurso)
         db.commit()
+        response_cache.invalidate(TAG_RECURSOS)
         db.refresh(db_recurso)
     return db_recurso
 
 # ----------------- Obtener recursos por categorías de conceptos -----------------
-def get_recursos_by_categorias_conceptos(db: Session, categorias: List[str], skip: int = 0, limit: int = 100, solo_activos: bool = True) -> List[Recurso]:
+def get_recursos_by_categorias_conceptos(db: Session, categorias: List[str], skip: int = 0, limit: int = 100, solo_activos: bool = True, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todos los recursos que están asociados a conceptos que pertenecen
     a alguna de las categorías especificadas.
@@ -113,7 +119,7 @@ def get_recursos_by_categorias_conceptos(db: Session, categorias: List[str], ski
     from app.models.recurso_concepto import RecursoConcepto
     
     if not categorias:
-        return []
+        return CursorPage()
     
     query = db.query(Recurso).distinct().join(
         RecursoConcepto, RecursoConcepto.recurso_id == Recurso.id
@@ -126,6 +132,33 @@ def get_recursos_by_categorias_conceptos(db: Session, categorias: List[str], ski
     if solo_activos:
         query = query.filter(Recurso.activo == True)
     
-    return query.offset(skip).limit(limit).all()
-
+    return paginate(query, Recurso.id, Recurso.id, cursor=cursor, skip=skip, limit=limit)
 
+# ----------------- Obtener recursos de las categorías de un profesor -----------------
+def get_recursos_by_teacher(db: Session, teacher_id: int, tipo: Optional[str] = None, nivel_dificultad: Optional[str] = None, skip: int = 0, limit: int = 100, solo_activos: bool = True, cursor: Optional[str] = None) -> CursorPage:
+    """
+    Obtiene los recursos asociados a conceptos de las categorías de los cursos de
+    un profesor, en una sola consulta contra el índice docente_categorias.
+    Filtros opcionales: tipo y nivel_dificultad.
+    """
+    from app.models.concepto import Concepto
+    from app.models.recurso_concepto import RecursoConcepto
+    from app.crud.crud_docente_categoria import categorias_docente_subquery
+    
+    # EXISTS en vez de JOIN + DISTINCT: cada recurso aparece una vez aunque cubra varios conceptos
+    del_docente = db.query(RecursoConcepto.id).join(
+        Concepto, Concepto.id == RecursoConcepto.concepto_id
+    ).filter(
+        RecursoConcepto.recurso_id == Recurso.id,
+        Concepto.categoria.in_(categorias_docente_subquery(teacher_id))
+    ).exists()
+    query = db.query(Recurso).filter(del_docente)
+    
+    if solo_activos:
+        query = query.filter(Recurso.activo == True)
+    if tipo:
+        query = query.filter(Recurso.tipo == tipo)
+    if nivel_dificultad:
+        query = query.filter(Recurso.nivel_dificultad == nivel_dificultad)
+    
+    return paginate(query, Recurso.id, Recurso.id, cursor=cursor, skip=skip, limit=limit)
@@ -5,6 +5,7 @@ from decimal import Decimal
 
 from app.models.recurso_concepto import RecursoConcepto
 from app.schemas.recurso_concepto import RecursoConceptoCreate, RecursoConceptosCreate
+from app.services.response_cache import TAG_RECURSOS, response_cache
 
 # ----------------- Crear una relación recurso-concepto -----------------
 def create_recurso_concepto(db: Session, recurso_concepto_in: RecursoConceptoCreate) -> RecursoConcepto:
@@ -18,6 +19,7 @@ def create_recurso_concepto(db: Session, recurso_concepto_in: RecursoConceptoCre
     )
     db.add(db_recurso_concepto)
     db.commit()
+    response_cache.invalidate(TAG_RECURSOS)
     db.refresh(db_recurso_concepto)
     return db_recurso_concepto
 
@@ -43,6 +45,7 @@ def associate_conceptos_to_recurso(db: Session, recurso_id: int, concepto_ids: L
         relaciones.append(db_recurso_concepto)
     
     db.commit()
+    response_cache.invalidate(TAG_RECURSOS)
     for rel in relaciones:
         db.refresh(rel)
     return relaciones
@@ -78,6 +81,7 @@ def delete_recurso_concepto(db: Session, recurso_id: int, concepto_id: int) -> b
     if db_recurso_concepto:
         db.delete(db_recurso_concepto)
         db.commit()
+        response_cache.invalidate(TAG_RECURSOS)
         return True
     return False
 
@@ -89,6 +93,7 @@ def delete_all_recurso_conceptos(db: Session, recurso_id: int) -> int:
     """
     count = db.query(RecursoConcepto).filter(RecursoConcepto.recurso_id == recurso_id).delete()
     db.commit()
+    response_cache.invalidate(TAG_RECURSOS)
     return count
 
 
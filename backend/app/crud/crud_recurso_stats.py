@@ -0,0 +1,193 @@
+# backend/app/crud/crud_recurso_stats.py
+"""
+Mantenimiento del resumen recurso_stats (contadores de interacciones por recurso).
+
+- apply_deltas(): suma (o resta) el aporte de las interacciones creadas,
+  modificadas o eliminadas con un INSERT ... ON CONFLICT DO UPDATE relativo
+  (col = col + delta). No hace commit: crud_interaccion_recurso lo llama dentro
+  de la transacción de la interacción, así que ambos se confirman juntos.
+- rebuild_recurso_stats(): recalcula desde interacciones_recursos por tramos de
+  recursos, un commit por tramo. Cada tramo bloquea sus filas del resumen antes
+  de agregar, así que las escrituras concurrentes esperan y se suman después.
+- find_drift(): compara el resumen con la agregación, también por tramos.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.interaccion_recurso import InteraccionRecurso
+from app.models.recurso import Recurso
+from app.models.recurso_stats import RecursoStats
+
+# Columnas del resumen, en el orden de la agregación
+COUNTERS = (
+    "total_interacciones", "total_views", "total_completions",
+    "total_ratings", "suma_calificaciones", "total_mejoras",
+)
+
+# ----------------- Aporte de una interacción -----------------
+def aporte(tipo_interaccion: Optional[str], calificacion: Optional[int], mejora_nota: Optional[bool]) -> Dict[str, int]:
+    """
+    Lo que una interacción suma a cada contador del resumen de su recurso.
+    """
+    return {
+        "total_interacciones": 1,
+        "total_views": int(tipo_interaccion == "viewed"),
+        "total_completions": int(tipo_interaccion == "completed"),
+        "total_ratings": int(tipo_interaccion == "rated"),
+        "suma_calificaciones": calificacion or 0,
+        "total_mejoras": int(bool(mejora_nota)),
+    }
+
+def aporte_de(interaccion: InteraccionRecurso) -> Dict[str, int]:
+    return aporte(interaccion.tipo_interaccion, interaccion.calificacion, interaccion.mejora_nota)
+
+def sumar_aportes(deltas: Dict[int, Dict[str, int]], recurso_id: int, valores: Dict[str, int], signo: int = 1) -> None:
+    """Acumula `valores` (multiplicados por signo) en los deltas del recurso."""
+    acumulado = deltas.setdefault(recurso_id, dict.fromkeys(COUNTERS, 0))
+    for campo in COUNTERS:
+        acumulado[campo] += signo * valores[campo]
+
+# ----------------- Aplicar deltas al resumen -----------------
+def apply_deltas(db: Session, deltas: Dict[int, Dict[str, int]]) -> None:
+    """
+    Suma los deltas {recurso_id: {contador: delta}} al resumen en una sola sentencia.
+    No hace commit.
+    """
+    filas = [
+        {"recurso_id": recurso_id, **valores}
+        for recurso_id, valores in sorted(deltas.items())  # Orden fijo: sin deadlocks entre transacciones
+        if any(valores.values())
+    ]
+    if not filas:
+        return
+    stmt = pg_insert(RecursoStats).values(filas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RecursoStats.recurso_id],
+        set_={
+            **{campo: getattr(RecursoStats, campo) + getattr(stmt.excluded, campo) for campo in COUNTERS},
+            "fecha_actualizacion": func.now(),
+        }
+    )
+    db.execute(stmt)
+
+# ----------------- Leer el resumen -----------------
+def get_stats_rows(db: Session, recurso_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """
+    Contadores de los recursos dados (búsqueda por clave primaria).
+    Los recursos sin fila en el resumen no tienen interacciones y no aparecen.
+    """
+    recurso_ids = list(recurso_ids)
+    if not recurso_ids:
+        return {}
+    filas = db.execute(
+        select(RecursoStats.recurso_id, *[getattr(RecursoStats, campo) for campo in COUNTERS])
+        .where(RecursoStats.recurso_id.in_(recurso_ids))
+    )
+    return {fila.recurso_id: {campo: getattr(fila, campo) for campo in COUNTERS} for fila in filas}
+
+# ----------------- Agregación desde interacciones_recursos -----------------
+def _agregadas(recurso_ids: List[int]):
+    """
+    Contadores calculados desde interacciones_recursos (un GROUP BY con FILTER).
+    Es la definición del resumen: la usan la reconstrucción y el chequeo.
+    """
+    tipo = InteraccionRecurso.tipo_interaccion
+    return select(
+        InteraccionRecurso.recurso_id,
+        func.count().label("total_interacciones"),
+        func.count().filter(tipo == "viewed").label("total_views"),
+        func.count().filter(tipo == "completed").label("total_completions"),
+        func.count().filter(tipo == "rated").label("total_ratings"),
+        func.coalesce(func.sum(InteraccionRecurso.calificacion), 0).label("suma_calificaciones"),
+        func.count().filter(InteraccionRecurso.mejora_nota == True).label("total_mejoras")
+    ).where(
+        InteraccionRecurso.recurso_id.in_(recurso_ids)
+    ).group_by(InteraccionRecurso.recurso_id)
+
+def _tramos_de_recursos(db: Session, chunk_size: int) -> Iterator[List[int]]:
+    """IDs de todos los recursos, en tramos de chunk_size (keyset sobre recursos.id)."""
+    ultimo = 0
+    while True:
+        ids = list(db.scalars(
+            select(Recurso.id).where(Recurso.id > ultimo).order_by(Recurso.id).limit(chunk_size)
+        ))
+        if not ids:
+            return
+        yield ids
+        ultimo = ids[-1]
+
+# ----------------- Reconstrucción por tramos -----------------
+def rebuild_recurso_stats(db: Session, chunk_size: int = 1000, recurso_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recalcula el resumen desde interacciones_recursos: de todos los recursos, o
+    solo de recurso_ids. Un commit por tramo. Retorna el número de recursos procesados.
+    """
+    if recurso_ids is None:
+        tramos = _tramos_de_recursos(db, chunk_size)
+    else:
+        ids = sorted(set(recurso_ids))
+        tramos = (ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size))
+
+    procesados = 0
+    for ids in tramos:
+        # 1. Crear las filas que falten y bloquearlas: las escrituras concurrentes de
+        #    estos recursos esperan a este commit y aplican su delta sobre el recálculo
+        existentes = set(db.scalars(select(Recurso.id).where(Recurso.id.in_(ids))))
+        if existentes:
+            db.execute(
+                pg_insert(RecursoStats).values([{"recurso_id": rid} for rid in sorted(existentes)])
+                .on_conflict_do_nothing(index_elements=[RecursoStats.recurso_id])
+            )
+            db.execute(
+                select(RecursoStats.recurso_id).where(RecursoStats.recurso_id.in_(existentes))
+                .order_by(RecursoStats.recurso_id).with_for_update()
+            ).all()
+        # 2. Agregar (ve todo lo confirmado antes del bloqueo) y escribir los valores absolutos
+        calculadas = {fila.recurso_id: fila for fila in db.execute(_agregadas(sorted(existentes)))}
+        filas = [
+            {"recurso_id": rid, **{campo: getattr(calculadas[rid], campo) if rid in calculadas else 0 for campo in COUNTERS}}
+            for rid in sorted(existentes)
+        ]
+        if filas:
+            stmt = pg_insert(RecursoStats).values(filas)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[RecursoStats.recurso_id],
+                set_={
+                    **{campo: getattr(stmt.excluded, campo) for campo in COUNTERS},
+                    "fecha_actualizacion": func.now(),
+                }
+            ))
+        db.commit()
+        procesados += len(existentes)
+    return procesados
+
+# ----------------- Chequeo de consistencia -----------------
+def find_drift(db: Session, chunk_size: int = 1000) -> List[Tuple[int, Dict[str, int], Dict[str, int]]]:
+    """
+    Compara el resumen con la agregación, por tramos de recursos.
+    Retorna [(recurso_id, guardado, calculado)] de los recursos que no coinciden.
+    """
+    diferencias = []
+    for ids in _tramos_de_recursos(db, chunk_size):
+        calculadas = _agregadas(ids).subquery()
+        # Una sola sentencia por tramo: resumen y agregación salen de la misma instantánea
+        filas = db.execute(
+            select(
+                Recurso.id,
+                *[func.coalesce(getattr(calculadas.c, campo), 0).label(f"calc_{campo}") for campo in COUNTERS],
+                *[func.coalesce(getattr(RecursoStats, campo), 0).label(f"guard_{campo}") for campo in COUNTERS]
+            )
+            .outerjoin(calculadas, calculadas.c.recurso_id == Recurso.id)
+            .outerjoin(RecursoStats, RecursoStats.recurso_id == Recurso.id)
+            .where(Recurso.id.in_(ids))
+        )
+        for fila in filas:
+            calculado = {campo: getattr(fila, f"calc_{campo}") for campo in COUNTERS}
+            guardado = {campo: getattr(fila, f"guard_{campo}") for campo in COUNTERS}
+            if calculado != guardado:
+                diferencias.append((fila.id, guardado, calculado))
+        db.rollback()  # Cerrar la transacción del tramo
+    return diferencias
@@ -1,10 +1,14 @@
 # backend/app/crud/crud_submission.py
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.models.submission import Submission
+from app.models.task import Task
+from app.models.course import Course
 from app.models.user import User
-from app.schemas.submission import SubmissionCreate, SubmissionUpdate
+from app.crud.pagination import CursorPage, paginate
+from app.schemas.submission import SubmissionCreate, SubmissionUpdate, SubmissionGradeItem
 
 # ----------------- Crear una nueva entrega -----------------
 def create_submission(db: Session, submission_in: SubmissionCreate, task_id: int, student_id: int, file_path: Optional[str] = None) -> Submission:
@@ -44,13 +48,35 @@ def get_submission_by_id(db: Session, submission_id: int) -> Optional[Submission
     """
     return db.query(Submission).filter(Submission.id == submission_id).first()
 
+# ----------------- Obtener una entrega con el docente dueño del curso -----------------
+def get_submission_with_course_owner(db: Session, submission_id: int) -> Optional[Tuple[Submission, int]]:
+    """
+    Obtiene la entrega y el ID del propietario del curso de su tarea en una sola
+    consulta (entrega -> tarea -> curso), para autorizar descargas.
+    """
+    return db.query(Submission, Course.propietario_id).join(
+        Task, Task.id == Submission.tarea_id
+    ).join(
+        Course, Course.id == Task.curso_id
+    ).filter(Submission.id == submission_id).first()
+
 # ----------------- Obtener entregas por Task ID -----------------
-def get_submissions_by_task(db: Session, task_id: int, skip: int = 0, limit: int = 100) -> List[Submission]:
+def get_submissions_by_task(db: Session, task_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todas las entregas de una tarea específica.
     Incluye la relación con el estudiante para acceder a su información.
     """
-    return db.query(Submission).filter(Submission.tarea_id == task_id).offset(skip).limit(limit).all()
+    query = db.query(Submission).filter(Submission.tarea_id == task_id)
+    return paginate(query, Submission.id, Submission.id, cursor=cursor, skip=skip, limit=limit)
+
+# ----------------- Obtener entregas por IDs -----------------
+def get_submissions_by_ids(db: Session, submission_ids: List[int]) -> List[Submission]:
+    """
+    Obtiene varias entregas por sus IDs en una sola consulta.
+    """
+    if not submission_ids:
+        return []
+    return db.query(Submission).filter(Submission.id.in_(submission_ids)).order_by(Submission.id).all()
 
 # ----------------- Obtener la entrega de un estudiante para una tarea -----------------
 def get_submission_by_task_and_student(db: Session, task_id: int, student_id: int) -> Optional[Submission]:
@@ -85,6 +111,33 @@ def update_submission(db: Session, db_submission: Submission, submission_in: Sub
     db.refresh(db_submission)
     return db_submission
 
+# ----------------- Calificar varias entregas (executemany) -----------------
+def grade_submissions_bulk(db: Session, grades: List[SubmissionGradeItem], commit: bool = True) -> int:
+    """
+    Aplica notas y feedback a varias entregas con un UPDATE por clave primaria
+    ejecutado en lote (executemany). Solo se actualizan los campos enviados.
+    Con commit=False el llamador controla la transacción.
+    Retorna el número de entregas actualizadas.
+    """
+    field_mapping = {
+        'grade': 'calificacion',
+        'feedback': 'retroalimentacion'
+    }
+    
+    rows = []
+    for item in grades:
+        update_data = item.model_dump(exclude_unset=True, exclude={'submission_id'})
+        row = {field_mapping[field]: value for field, value in update_data.items()}
+        if row:
+            row['id'] = item.submission_id
+            rows.append(row)
+    
+    if rows:
+        db.execute(update(Submission), rows)
+    if commit:
+        db.commit()
+    return len(rows)
+
 # ----------------- Eliminar una entrega -----------------
 def delete_submission(db: Session, submission_id: int) -> Optional[Submission]:
     """
@@ -7,6 +7,8 @@ from app.models.tarea_concepto import TareaConcepto
 from app.models.task import Task
 from app.models.concepto import Concepto
 from app.schemas.tarea_concepto import TareaConceptoCreate, TareaConceptosCreate
+from app.crud.crud_docente_categoria import docentes_de_tareas, refresh_docente_categorias
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, response_cache
 
 # ----------------- Crear una relación tarea-concepto -----------------
 def create_tarea_concepto(db: Session, tarea_concepto_in: TareaConceptoCreate) -> TareaConcepto:
@@ -19,7 +21,9 @@ def create_tarea_concepto(db: Session, tarea_concepto_in: TareaConceptoCreate) -
         peso=Decimal(str(tarea_concepto_in.peso)) if tarea_concepto_in.peso else Decimal('1.0')
     )
     db.add(db_tarea_concepto)
+    refresh_docente_categorias(db, docentes_de_tareas(db, [tarea_concepto_in.tarea_id]))
     db.commit()
+    response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
     db.refresh(db_tarea_concepto)
     return db_tarea_concepto
 
@@ -44,7 +48,9 @@ def associate_conceptos_to_tarea(db: Session, tarea_id: int, concepto_ids: List[
         db.add(db_tarea_concepto)
         relaciones.append(db_tarea_concepto)
     
+    refresh_docente_categorias(db, docentes_de_tareas(db, [tarea_id]))
     db.commit()
+    response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
     for rel in relaciones:
         db.refresh(rel)
     return relaciones
@@ -74,7 +80,9 @@ def delete_tarea_concepto(db: Session, tarea_id: int, concepto_id: int) -> bool:
     ).first()
     if db_tarea_concepto:
         db.delete(db_tarea_concepto)
+        refresh_docente_categorias(db, docentes_de_tareas(db, [tarea_id]))
         db.commit()
+        response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
         return True
     return False
 
@@ -85,7 +93,9 @@ def delete_all_tarea_conceptos(db: Session, tarea_id: int) -> int:
     Retorna el número de relaciones eliminadas.
     """
     count = db.query(TareaConcepto).filter(TareaConcepto.tarea_id == tarea_id).delete()
+    refresh_docente_categorias(db, docentes_de_tareas(db, [tarea_id]))
     db.commit()
+    response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
     return count
 
 
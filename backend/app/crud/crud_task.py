@@ -1,9 +1,12 @@
 # backend/app/crud/crud_task.py
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 
 from app.models.task import Task # Importa el modelo de SQLAlchemy
 from app.schemas.task import TaskCreate, TaskUpdate # Importa los esquemas de Pydantic
+from app.crud.pagination import CursorPage, paginate
+from app.crud.crud_docente_categoria import docentes_de_tareas, refresh_docente_categorias
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, response_cache
 
 # ----------------- Crear una nueva tarea -----------------
 def create_task(db: Session, task_in: TaskCreate, course_id: int) -> Task:
@@ -19,6 +22,7 @@ def create_task(db: Session, task_in: TaskCreate, course_id: int) -> Task:
     )
     db.add(db_task)
     db.commit()
+    response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
     db.refresh(db_task)
     return db_task
 
@@ -27,21 +31,22 @@ def get_task_by_id(db: Session, task_id: int) -> Optional[Task]:
     """
     Obtiene una tarea específica por su ID.
     """
-    return db.query(Task).filter(Task.id == task_id).first()
+    return db.get(Task, task_id)
 
 # ----------------- Obtener tareas por Course ID -----------------
-def get_tasks_by_course(db: Session, course_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
+def get_tasks_by_course(db: Session, course_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todas las tareas de un curso específico.
     """
-    return db.query(Task).filter(Task.curso_id == course_id).offset(skip).limit(limit).all()
+    query = db.query(Task).filter(Task.curso_id == course_id)
+    return paginate(query, Task.id, Task.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Obtener todas las tareas (para administradores, etc.) -----------------
-def get_all_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[Task]:
+def get_all_tasks(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
     """
     Obtiene todas las tareas existentes en la base de datos.
     """
-    return db.query(Task).offset(skip).limit(limit).all()
+    return paginate(db.query(Task), Task.id, Task.id, cursor=cursor, skip=skip, limit=limit)
 
 # ----------------- Actualizar una tarea -----------------
 def update_task(db: Session, db_task: Task, task_in: TaskUpdate) -> Task:
@@ -56,6 +61,7 @@ def update_task(db: Session, db_task: Task, task_in: TaskUpdate) -> Task:
 
     db.add(db_task)
     db.commit()
+    response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
     db.refresh(db_task)
     return db_task
 
@@ -66,6 +72,9 @@ def delete_task(db: Session, task_id: int) -> Optional[Task]:
     """
     db_task = db.query(Task).filter(Task.id == task_id).first()
     if db_task:
+        docentes = docentes_de_tareas(db, [task_id])
         db.delete(db_task)
+        refresh_docente_categorias(db, docentes)
         db.commit()
+        response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
     return db_task
\ No newline at end of file
@@ -1,19 +1,43 @@
 # backend/app/crud/crud_user.py
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
-from typing import Optional
+from app.core.security import get_password_hash, verify_and_update_password
+from app.crud.pagination import CursorPage, paginate
+from typing import Dict, Iterable, List, Optional, Set
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.correo == email).first()
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+    return db.get(User, user_id)
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    """Obtiene una lista de usuarios"""
-    return db.query(User).offset(skip).limit(limit).all()
+def get_users_by_ids(db: Session, user_ids: Iterable[int]) -> Dict[int, User]:
+    """
+    Obtiene varios usuarios con una sola consulta (IN) y los devuelve indexados por ID.
+    Se usa para enriquecer listados (propietarios, autores, estudiantes) sin caer en N+1.
+    Los usuarios ya cargados en la sesión se reutilizan sin volver a consultarlos.
+    """
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    found: Dict[int, User] = {}
+    pending = []
+    for user_id in ids:
+        user = db.identity_map.get(identity_key(User, user_id))
+        if user is not None and not inspect(user).expired:
+            found[user_id] = user
+        else:
+            pending.append(user_id)
+    if pending:
+        for user in db.query(User).filter(User.id.in_(pending)).all():
+            found[user.id] = user
+    return found
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> CursorPage:
+    """Obtiene una lista de usuarios, ordenados por ID"""
+    return paginate(db.query(User), User.id, User.id, cursor=cursor, skip=skip, limit=limit)
 
 def create_user(db: Session, user_in: UserCreate) -> User:
     hashed_password = get_password_hash(user_in.password)
@@ -28,10 +52,40 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     db.refresh(db_user)
     return db_user
 
+def get_existing_emails(db: Session, correos: Iterable[str]) -> Set[str]:
+    """
+    Cuáles de los correos dados ya están registrados (una sola consulta IN).
+    """
+    correos = set(correos)
+    if not correos:
+        return set()
+    return set(db.scalars(select(User.correo).where(User.correo.in_(correos))))
+
+def bulk_create_users(db: Session, usuarios: List[dict]) -> Dict[str, int]:
+    """
+    Inserta varios usuarios (dicts con las columnas, contraseña ya hasheada) en un
+    solo INSERT multi-fila. Los correos que ya existen se omiten (ON CONFLICT DO
+    NOTHING), incluso si otro proceso los registró recién. Hace commit.
+    Retorna {correo: id} de los usuarios creados.
+    """
+    if not usuarios:
+        return {}
+    stmt = pg_insert(User).values(usuarios).on_conflict_do_nothing(
+        index_elements=[User.correo]
+    ).returning(User.id, User.correo)
+    creados = {fila.correo: fila.id for fila in db.execute(stmt)}
+    db.commit()
+    return creados
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.contraseña_hash):
+    valid, new_hash = verify_and_update_password(password, user.contraseña_hash)
+    if not valid:
         return None
+    if new_hash:
+        # El hash usaba otro costo de bcrypt: se reemplaza ahora que se conoce la contraseña
+        user.contraseña_hash = new_hash
+        db.commit()
     return user
\ No newline at end of file
@@ -0,0 +1,147 @@
+# backend/app/crud/pagination.py
+"""
+Paginación por cursor (keyset) para los listados CRUD.
+
+Cada listado se ordena por (clave_de_orden, id), un orden total y estable, y el
+cursor codifica esos dos valores de la última fila entregada. La página siguiente
+se pide con WHERE (clave, id) > (valor, id) (o < si el orden es descendente), que
+el índice resuelve directamente en vez de recorrer y descartar filas como OFFSET.
+
+El cursor es opaco para el cliente (base64 de un JSON). skip/limit sigue
+funcionando igual que antes; si llegan cursor y skip, manda el cursor. Los
+endpoints aceptan limit entre 1 y MAX_LIMIT.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+MAX_LIMIT = 1000  # Máximo de filas por página que acepta un endpoint
+
+
+class InvalidCursorError(ValueError):
+    """El cursor no es válido o corresponde a otro listado (se responde 400)."""
+
+
+class CursorPage(list):
+    """
+    Lista de resultados de un listado paginado. next_cursor es el cursor de la
+    página siguiente, o None si no hay más resultados.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort_key: str, values: Sequence[Any]) -> str:
+    payload = {"k": sort_key, "v": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> List[Any]:
+    """
+    Retorna los valores (clave, id) del cursor. Lanza InvalidCursorError si no
+    se puede leer o si pertenece a un listado ordenado por otra clave.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(value) for value in payload["v"]]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Cursor de paginación inválido")
+    if payload.get("k") != sort_key or len(values) != 2:
+        raise InvalidCursorError("El cursor no corresponde a este listado")
+    return values
+
+
+def _check_value_types(values: Sequence[Any], columns: Sequence[InstrumentedAttribute]) -> None:
+    """
+    Lanza InvalidCursorError si algún valor del cursor no es del tipo de su
+    columna (un cursor armado a mano): sin esto la consulta falla en la base de
+    datos con un DataError (500) en vez de un 400.
+    """
+    for value, column in zip(values, columns):
+        try:
+            expected = column.type.python_type
+        except NotImplementedError:
+            continue
+        if value is None:
+            continue
+        if isinstance(value, bool) and expected is not bool:
+            raise InvalidCursorError("Cursor de paginación inválido")
+        if expected is float and isinstance(value, int):
+            continue
+        if not isinstance(value, expected):
+            raise InvalidCursorError("Cursor de paginación inválido")
+
+
+def _keyset_columns(sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute):
+    if sort_column is id_column:
+        return [id_column]
+    return [sort_column, id_column]
+
+
+def apply_keyset(query, sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, *,
+                 cursor: Optional[str] = None, skip: int = 0, limit: int = 100, descending: bool = False):
+    """
+    Aplica el orden estable, el filtro del cursor (o el OFFSET de skip) y pide
+    limit + 1 filas para saber si hay página siguiente. Sirve para Query y Select.
+    """
+    columns = _keyset_columns(sort_column, id_column)
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+    if cursor:
+        values = decode_cursor(cursor, sort_column.key)
+        _check_value_types(values, [sort_column, id_column])
+        if len(columns) == 1:
+            condition = id_column < values[1] if descending else id_column > values[1]
+        else:
+            clave, ultimo = tuple_(*columns), tuple_(*values)
+            condition = clave < ultimo if descending else clave > ultimo
+        query = query.where(condition)
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, limit: int) -> CursorPage:
+    """Recorta las limit + 1 filas a limit y calcula el cursor de la página siguiente."""
+    if limit <= 0:
+        return CursorPage()
+    if len(rows) <= limit:
+        return CursorPage(rows)
+    items = rows[:limit]
+    last = items[-1]
+    next_cursor = encode_cursor(
+        sort_column.key,
+        [getattr(last, sort_column.key), getattr(last, id_column.key)]
+    )
+    return CursorPage(items, next_cursor)
+
+
+def paginate(query, sort_column: InstrumentedAttribute, id_column: InstrumentedAttribute, *,
+             cursor: Optional[str] = None, skip: int = 0, limit: int = 100, descending: bool = False) -> CursorPage:
+    """
+    Ejecuta un Query (sesión sync) paginado por (sort_column, id_column).
+    """
+    query = apply_keyset(query, sort_column, id_column, cursor=cursor, skip=skip, limit=limit, descending=descending)
+    return build_page(query.all(), sort_column, id_column, limit)
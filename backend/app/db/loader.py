@@ -0,0 +1,53 @@
+# backend/app/db/loader.py
+from typing import Any, Optional, Set, Tuple, Type
+
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.course import Course
+from app.models.task import Task
+from app.models.exam import Exam
+from app.models.announcement import Announcement
+
+
+class RequestLoader:
+    """
+    Cargador por request para búsquedas por clave primaria (User, Course, Task, Exam, Announcement).
+
+    Se apoya en el identity map de la sesión: un objeto ya cargado en el mismo request
+    (por ejemplo, el usuario que cargó deps.get_current_user) no se vuelve a consultar.
+    Para varios usuarios a la vez, ver crud_user.get_users_by_ids (una consulta IN).
+    También recuerda los IDs que no existen para no repetir la consulta.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._missing: Set[Tuple[Type[Any], Any]] = set()
+
+    # ----------------- Búsquedas genéricas -----------------
+    def get(self, model: Type[Any], pk: Any) -> Optional[Any]:
+        """
+        Obtiene un objeto por clave primaria, usando el identity map si ya está cargado.
+        """
+        if pk is None or (model, pk) in self._missing:
+            return None
+        obj = self.db.get(model, pk)
+        if obj is None:
+            self._missing.add((model, pk))
+        return obj
+
+    # ----------------- Atajos por modelo -----------------
+    def user(self, user_id: Optional[int]) -> Optional[User]:
+        return self.get(User, user_id)
+
+    def course(self, course_id: Optional[int]) -> Optional[Course]:
+        return self.get(Course, course_id)
+
+    def task(self, task_id: Optional[int]) -> Optional[Task]:
+        return self.get(Task, task_id)
+
+    def exam(self, exam_id: Optional[int]) -> Optional[Exam]:
+        return self.get(Exam, exam_id)
+
+    def announcement(self, announcement_id: Optional[int]) -> Optional[Announcement]:
+        return self.get(Announcement, announcement_id)
@@ -0,0 +1,64 @@
+# backend/app/db/migrations.py
+"""
+Aplicación de las migraciones de Alembic (backend/alembic) desde código.
+
+Reemplaza a Base.metadata.create_all: init_db.py y los scripts de arranque llaman
+a upgrade_database() antes de levantar la API. Las bases de datos creadas con
+create_all (sin tabla alembic_version) se marcan primero en la revisión inicial,
+que corresponde exactamente a ese esquema, y luego reciben las migraciones nuevas.
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+from app.db.session import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+BASELINE_REVISION = "0001_esquema_inicial"
+
+# Clave del advisory lock de PostgreSQL: si arrancan varias réplicas a la vez,
+# solo una migra y las demás esperan a que termine
+MIGRATION_LOCK_KEY = 0x5041490001
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    # La aplicación ya configuró su logging; no pisarlo con el de alembic.ini
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def _is_unversioned_legacy_database(connection) -> bool:
+    tablas = set(inspect(connection).get_table_names())
+    return "alembic_version" not in tablas and "users" in tablas
+
+
+def upgrade_database(revision: str = "head") -> None:
+    """
+    Lleva la base de datos a la revisión indicada (por defecto, la última).
+    """
+    config = alembic_config()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+        try:
+            config.attributes["connection"] = connection
+            legacy = _is_unversioned_legacy_database(connection)
+            # Alembic debe recibir la conexión fuera de transacción: maneja las suyas
+            # (una por migración) y algunas migraciones usan autocommit_block()
+            connection.commit()
+            if legacy:
+                print(f"Base de datos sin versionar: se marca en la revisión {BASELINE_REVISION}")
+                command.stamp(config, BASELINE_REVISION)
+                connection.commit()
+            command.upgrade(config, revision)
+            connection.commit()
+        except BaseException:
+            connection.rollback()  # No dejar a medias la migración que falló
+            raise
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            connection.commit()
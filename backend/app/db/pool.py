@@ -0,0 +1,177 @@
+# backend/app/db/pool.py
+"""
+Configuración y métricas de los pools de conexiones a PostgreSQL.
+
+- engine_options(): argumentos de create_engine / create_async_engine según
+  Settings (tamaño por worker, timeout, recycle, pre-ping, statement_timeout,
+  modo PgBouncer).
+- InstrumentedQueuePool / InstrumentedAsyncQueuePool: QueuePool que mide cuánto
+  tarda cada checkout (espera en la cola + conexión nueva si hace falta) y cuenta
+  los timeouts. pool_stats() lo combina con el estado actual (en uso, overflow).
+- install_disconnect_handler() cuenta y registra las desconexiones que detecta
+  SQLAlchemy. Es la alternativa al pre-ping (DB_POOL_PRE_PING=false): al detectar
+  una, SQLAlchemy invalida todo el pool, así que solo falla la consulta que la
+  encontró y no cada conexión vieja, sin pagar un round-trip en cada checkout.
+"""
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Contadores de un pool (acumulados desde que arrancó el proceso)."""
+
+    def __init__(self, max_muestras: int = 1000):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.desconexiones = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self._esperas = deque(maxlen=max_muestras)  # Últimas esperas, para el p95
+
+    def record_checkout(self, segundos: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += segundos
+            self.espera_max = max(self.espera_max, segundos)
+            self._esperas.append(segundos)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_disconnect(self) -> None:
+        with self._lock:
+            self.desconexiones += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            esperas = list(self._esperas)
+            promedio = self.espera_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "disconnects": self.desconexiones,
+                "checkout_wait_avg_ms": round(promedio * 1000, 3),
+                "checkout_wait_p95_ms": round(_p95(esperas) * 1000, 3),
+                "checkout_wait_max_ms": round(self.espera_max * 1000, 3),
+            }
+
+
+def _p95(valores) -> float:
+    if len(valores) < 2:
+        return valores[0] if valores else 0.0
+    return statistics.quantiles(valores, n=20, method="inclusive")[-1]
+
+
+class _InstrumentedPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - inicio)
+        return conexion
+
+    def recreate(self):
+        # engine.dispose() reemplaza el pool: las métricas siguen en el nuevo
+        nuevo = super().recreate()
+        nuevo.metrics = self.metrics
+        return nuevo
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """Estado actual del pool más sus métricas acumuladas."""
+    stats = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),  # Conexiones en uso
+        "checked_in": pool.checkedin(),  # Conexiones libres en el pool
+        "overflow": max(0, pool.overflow()),  # Conexiones abiertas por encima de pool_size
+        "max_overflow": pool._max_overflow,
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Argumentos para create_engine (o create_async_engine si is_async) a partir de Settings.
+    """
+    opciones: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size(),
+        "max_overflow": settings.db_max_overflow(),
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if not make_url(url).get_backend_name().startswith("postgresql"):
+        return opciones
+
+    connect_args: Dict[str, Any] = {}
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if is_async:
+        if settings.DB_PGBOUNCER:
+            # PgBouncer en modo transaction no mantiene la conexión del servidor entre
+            # transacciones: sin sentencias preparadas con nombre fijo ni caché de ellas
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        elif timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout_ms)}
+    else:
+        # Keepalives TCP: detectan antes las conexiones cortadas por un proxy o firewall
+        connect_args.update(keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3)
+        if timeout_ms and not settings.DB_PGBOUNCER:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+    # Con PgBouncer los parámetros de arranque no llegan a Postgres: statement_timeout
+    # se configura en el rol (ALTER ROLE ... SET statement_timeout = ...)
+    opciones["connect_args"] = connect_args
+    return opciones
+
+
+def install_disconnect_handler(engine) -> None:
+    """
+    Registra las desconexiones detectadas (engine sync o async).
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        if context.is_disconnect:
+            metrics = getattr(sync_engine.pool, "metrics", None)
+            if metrics is not None:
+                metrics.record_disconnect()
+            logger.warning(
+                "Conexión a la base de datos perdida (%s); se invalida el pool",
+                type(context.original_exception).__name__
+            )
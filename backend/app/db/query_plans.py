@@ -0,0 +1,87 @@
+# backend/app/db/query_plans.py
+"""
+Consultas de las rutas más usadas y verificación de que sus planes usan índices.
+
+seq_scans() ejecuta EXPLAIN sobre una consulta (las mismas que arman los CRUD)
+y retorna las tablas que recorre con Seq Scan. Quien llama debe desactivar
+enable_seqscan: en una base con pocas filas el planificador prefiere recorrer
+la tabla aunque exista el índice, pero si aun así elige Seq Scan es porque no
+hay un índice utilizable. Lo usan tests/test_query_plans.py y check_query_plans.py.
+"""
+import json
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.crud.pagination import apply_keyset, encode_cursor
+from app.models.announcement import Announcement
+from app.models.comment import Comment
+from app.crud.crud_docente_categoria import categorias_docente_subquery
+from app.models.concepto import Concepto
+from app.models.course import Course
+from app.models.docente_categoria import DocenteCategoria
+from app.models.enrollment import Enrollment
+from app.models.recomendacion_estudiante import RecomendacionEstudiante
+from app.models.exam import Exam, ExamSubmission
+from app.models.submission import Submission
+from app.models.task import Task
+
+_AHORA = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def hot_queries():
+    """(nombre, sentencia) de las consultas de las rutas más usadas."""
+    return [
+        ("inscripción por estudiante y curso",
+         select(Enrollment).where(Enrollment.estudiante_id == 1, Enrollment.curso_id == 1).limit(1)),
+        ("estudiantes inscritos en un curso",
+         select(Enrollment.estudiante_id).where(Enrollment.curso_id == 1)),
+        ("entrega por tarea y estudiante",
+         select(Submission).where(Submission.tarea_id == 1, Submission.estudiante_id == 1).limit(1)),
+        ("entregas de una tarea",
+         select(Submission).where(Submission.tarea_id == 1)),
+        ("tareas de un curso (página siguiente)",
+         apply_keyset(select(Task).where(Task.curso_id == 1), Task.id, Task.id,
+                      cursor=encode_cursor("id", [10, 10]))),
+        ("comunicados de un curso (página siguiente)",
+         apply_keyset(select(Announcement).where(Announcement.curso_id == 1),
+                      Announcement.fecha_creacion, Announcement.id,
+                      cursor=encode_cursor("fecha_creacion", [_AHORA, 10]), descending=True)),
+        ("comentarios de un comunicado (página siguiente)",
+         apply_keyset(select(Comment).where(Comment.anuncio_id == 1),
+                      Comment.fecha_creacion, Comment.id,
+                      cursor=encode_cursor("fecha_creacion", [_AHORA, 10]))),
+        ("entrega de examen por examen y estudiante",
+         select(ExamSubmission).where(ExamSubmission.exam_id == 1, ExamSubmission.estudiante_id == 1).limit(1)),
+        ("exámenes de un curso",
+         select(Exam).where(Exam.curso_id == 1)),
+        ("cursos de un docente",
+         select(Course).where(Course.propietario_id == 1)),
+        ("recomendaciones no vistas de un estudiante (página siguiente)",
+         apply_keyset(select(RecomendacionEstudiante).where(RecomendacionEstudiante.estudiante_id == 1,
+                                                           RecomendacionEstudiante.vista == False),
+                      RecomendacionEstudiante.fecha_recomendacion, RecomendacionEstudiante.id,
+                      cursor=encode_cursor("fecha_recomendacion", [_AHORA, 10]), descending=True)),
+        ("categorías de conceptos de un docente",
+         select(DocenteCategoria.categoria).where(DocenteCategoria.docente_id == 1)),
+        ("conceptos de las categorías de un docente",
+         select(Concepto).where(Concepto.categoria.in_(categorias_docente_subquery(1))).order_by(Concepto.id).limit(100)),
+    ]
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for hijo in plan.get("Plans", []):
+        yield from _seq_scans(hijo)
+
+
+def seq_scans(connection, stmt) -> List[str]:
+    """Tablas que el plan de `stmt` recorre con Seq Scan (vacío si todo usa índices)."""
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return sorted(set(_seq_scans(plan[0]["Plan"])))
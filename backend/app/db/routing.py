@@ -0,0 +1,124 @@
+# backend/app/db/routing.py
+"""
+Enrutamiento de lecturas a la réplica (DATABASE_REPLICA_URL).
+
+- RoutingSession: Session que envía las consultas a la réplica cuando
+  use_replica=True y todo lo demás (flush, INSERT/UPDATE/DELETE, SELECT ... FOR
+  UPDATE) al primario. Después del primer flush la sesión queda en el primario.
+- Read-your-writes: cuando un usuario confirma escrituras, sus requests GET de
+  los próximos DB_REPLICA_STICKY_SECONDS van al primario, para que vea lo que
+  acaba de escribir aunque la réplica venga con retraso. El registro es por
+  proceso: con varios workers, la ventana debe cubrir el retraso de la réplica.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+
+# Métodos HTTP que solo leen: candidatos a la réplica
+READ_METHODS = ("GET", "HEAD")
+
+
+class ReadYourWritesTracker:
+    """Usuarios que escribieron hace poco (hasta cuándo leen del primario)."""
+
+    def __init__(self, ventana_segundos: float):
+        self.ventana = ventana_segundos
+        self._lock = threading.Lock()
+        self._hasta: Dict[int, float] = {}
+
+    def mark(self, user_id: int) -> None:
+        ahora = time.monotonic()
+        with self._lock:
+            self._hasta[user_id] = ahora + self.ventana
+            # Limpiar las entradas vencidas de vez en cuando
+            if len(self._hasta) > 1000:
+                self._hasta = {k: v for k, v in self._hasta.items() if v > ahora}
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            hasta = self._hasta.get(user_id)
+        return hasta is not None and hasta > time.monotonic()
+
+
+recent_writers = ReadYourWritesTracker(settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def request_user_id(request: Request) -> Optional[int]:
+    """
+    ID de usuario del token Bearer, sin validarlo: solo decide a qué base se lee.
+    La autenticación la sigue haciendo deps.get_current_user.
+    """
+    autorizacion = request.headers.get("authorization", "")
+    if not autorizacion.lower().startswith("bearer "):
+        return None
+    try:
+        return int(jwt.get_unverified_claims(autorizacion[7:].strip())["sub"])
+    except Exception:
+        return None
+
+
+def prefer_replica(request: Request, user_id: Optional[int]) -> bool:
+    """El request puede leer de la réplica: es de lectura y el usuario no escribió hace poco."""
+    return request.method in READ_METHODS and not recent_writers.is_sticky(user_id)
+
+
+class RoutingSession(Session):
+    """
+    Session con un engine primario y uno de réplica (opcional).
+    En un AsyncSession se usa como sync_session_class, con los sync_engine de
+    los engines async.
+    """
+
+    def __init__(self, *args, primary=None, replica=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.use_replica = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.use_replica
+            and self.replica is not None
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return self.replica
+        return self.primary
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    # Lo que se lea después de escribir debe verlo: el resto de la sesión va al primario
+    session.use_replica = False
+    session.info["escribio"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    if session.info.pop("escribio", False):
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            recent_writers.mark(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("escribio", None)
+
+
+def route_session(session: RoutingSession, request: Request) -> None:
+    """Prepara la sesión de un request: réplica o primario, y a quién marcar si escribe."""
+    user_id = request_user_id(request)
+    session.info["user_id"] = user_id
+    session.use_replica = prefer_replica(request, user_id)
@@ -1,25 +1,88 @@
 # backend/app/db/session.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request
 from app.core.config import settings # Importa la configuración
+from app.db.pool import engine_options, install_disconnect_handler
+from app.db.routing import RoutingSession, route_session
 
 # ¡Esta es la línea clave! Usa la URL que definimos en config.py
-# Configuración mejorada del pool para evitar bloqueos
-engine = create_engine(
-    settings.DATABASE_URL, 
-    pool_pre_ping=True,  # Verifica conexiones antes de usarlas
-    pool_size=5,  # Número de conexiones a mantener en el pool
-    max_overflow=10,  # Conexiones adicionales permitidas
-    pool_timeout=30,  # Tiempo máximo de espera para obtener conexión (segundos)
-    pool_recycle=3600  # Recicla conexiones después de 1 hora
-)
+# El pool (tamaño, timeouts, pre-ping, PgBouncer) se configura en Settings: ver app.db.pool
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+install_disconnect_handler(engine)
+
+# Réplica de lectura opcional: sin DATABASE_REPLICA_URL todo va al primario
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
+    install_disconnect_handler(replica_engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Las sesiones usan el primario salvo que el request las marque para la réplica (route_session)
+SessionLocal = sessionmaker(
+    class_=RoutingSession, primary=engine, replica=replica_engine, autocommit=False, autoflush=False
+)
 
 # Dependencia para los endpoints (la usa deps.py)
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    route_session(db, request)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ----------------- Acceso asíncrono (asyncpg) -----------------
+# Los endpoints más usados declarados con `async def` usan esta sesión para no
+# bloquear el event loop en cada consulta. El resto sigue usando SessionLocal.
+
+def _async_database_url(url: str):
+    """
+    Convierte DATABASE_URL (postgres:// o postgresql://, driver psycopg2) a la
+    variante asyncpg. asyncpg no entiende 'sslmode', así que se traduce a 'ssl'.
+    Retorna (url, connect_args).
+    """
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    connect_args = {}
+    sslmode = async_url.query.get("sslmode")
+    if sslmode:
+        async_url = async_url.difference_update_query(["sslmode"])
+        connect_args["ssl"] = sslmode
+    return async_url, connect_args
+
+_async_url, _async_connect_args = _async_database_url(settings.DATABASE_URL)
+_async_options = engine_options(settings.DATABASE_URL, is_async=True)
+_async_options["connect_args"] = {**_async_options.get("connect_args", {}), **_async_connect_args}
+
+async_engine = create_async_engine(_async_url, **_async_options)
+install_disconnect_handler(async_engine)
+
+# La réplica async solo existe si la réplica es PostgreSQL (asyncpg)
+async_replica_engine = None
+if replica_engine is not None and replica_engine.dialect.name == "postgresql":
+    _replica_url, _replica_connect_args = _async_database_url(settings.DATABASE_REPLICA_URL)
+    _replica_options = engine_options(settings.DATABASE_REPLICA_URL, is_async=True)
+    _replica_options["connect_args"] = {**_replica_options.get("connect_args", {}), **_replica_connect_args}
+    async_replica_engine = create_async_engine(_replica_url, **_replica_options)
+    install_disconnect_handler(async_replica_engine)
+
+# expire_on_commit=False: tras el commit los objetos siguen legibles sin otra consulta
+# (en una sesión async no se puede cargar atributos de forma implícita)
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    primary=async_engine.sync_engine,
+    replica=async_replica_engine.sync_engine if async_replica_engine is not None else None,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Dependencia async para los endpoints (la usa deps.py)
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        route_session(db.sync_session, request)
+        yield db
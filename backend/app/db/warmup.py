@@ -0,0 +1,155 @@
+# backend/app/db/warmup.py
+"""
+Calentamiento de la base de datos al arrancar la API (lo llama el lifespan de app.main).
+
+- Abre de una vez las conexiones del pool (sync y async), para que los primeros
+  requests no paguen la conexión TCP + TLS + autenticación con Postgres.
+- Ejecuta una vez las consultas de las rutas más usadas a través de los propios
+  CRUD, con IDs que no existen: SQLAlchemy deja cada sentencia compilada en su
+  caché y los primeros requests reales ya no la compilan.
+- Con réplica de lectura (DATABASE_REPLICA_URL), hace lo mismo con sus engines.
+
+Si la base de datos no responde, se registra una advertencia y la API arranca
+igual: las conexiones se abrirán con el primer request, como antes.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, List
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.crud import crud_announcement, crud_async, crud_comment, crud_course, crud_enrollment
+from app.crud import crud_exam, crud_submission, crud_task, crud_user
+from app.crud.pagination import encode_cursor
+from app.db.session import AsyncSessionLocal, SessionLocal, async_engine, async_replica_engine, engine, replica_engine
+
+logger = logging.getLogger(__name__)
+
+# ID que no corresponde a ninguna fila (las consultas no traen datos)
+_SIN_FILA = 0
+
+
+def _hot_sync_queries() -> List[Callable]:
+    cursor_id = encode_cursor("id", [_SIN_FILA, _SIN_FILA])
+    return [
+        lambda db: crud_user.get_user_by_id(db, _SIN_FILA),
+        lambda db: crud_user.get_user_by_email(db, ""),
+        lambda db: crud_enrollment.get_enrollment_by_user_and_course(db, student_id=_SIN_FILA, course_id=_SIN_FILA),
+        lambda db: crud_course.get_courses_by_owner(db, owner_id=_SIN_FILA),
+        lambda db: crud_task.get_tasks_by_course(db, course_id=_SIN_FILA),
+        lambda db: crud_task.get_tasks_by_course(db, course_id=_SIN_FILA, cursor=cursor_id),
+        lambda db: crud_submission.get_submission_by_task_and_student(db, task_id=_SIN_FILA, student_id=_SIN_FILA),
+        lambda db: crud_submission.get_submission_with_course_owner(db, _SIN_FILA),
+        lambda db: crud_announcement.get_announcements_by_course(db, course_id=_SIN_FILA),
+        lambda db: crud_comment.get_comments_by_announcement(db, announcement_id=_SIN_FILA),
+        lambda db: crud_exam.get_exams_by_course(db, course_id=_SIN_FILA),
+        lambda db: crud_exam.get_submission_by_student(db, exam_id=_SIN_FILA, student_id=_SIN_FILA),
+    ]
+
+
+def _hot_async_queries() -> List[Callable]:
+    return [
+        lambda db: crud_async.get_user_by_id(db, _SIN_FILA),
+        lambda db: crud_async.get_task_by_id(db, _SIN_FILA),
+        lambda db: crud_async.get_course_by_id(db, _SIN_FILA),
+        lambda db: crud_async.get_enrollment_by_user_and_course(db, student_id=_SIN_FILA, course_id=_SIN_FILA),
+        lambda db: crud_async.get_submissions_by_task(db, task_id=_SIN_FILA),
+        lambda db: crud_async.get_submission_by_task_and_student(db, task_id=_SIN_FILA, student_id=_SIN_FILA),
+        lambda db: crud_async.get_exam_with_questions(db, _SIN_FILA),
+    ]
+
+
+def _pool_size(pool) -> int:
+    # QueuePool expone size(); otros pools (NullPool, StaticPool) no mantienen conexiones
+    return pool.size() if hasattr(pool, "size") else 1
+
+
+def _open_sync_connections(sync_engine) -> int:
+    conexiones = []
+    try:
+        # Se toman todas a la vez para que el pool abra conexiones distintas
+        for _ in range(_pool_size(sync_engine.pool)):
+            conexiones.append(sync_engine.connect())
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+    return len(conexiones)
+
+
+def warm_up_sync_engine() -> int:
+    """
+    Abre las conexiones del pool sync (y de la réplica) y compila las consultas frecuentes.
+    Retorna cuántas conexiones quedaron abiertas.
+    """
+    conexiones = _open_sync_connections(engine)
+    usar_replica = [False]
+    if replica_engine is not None:
+        conexiones += _open_sync_connections(replica_engine)
+        usar_replica.append(True)
+
+    for replica in usar_replica:
+        db = SessionLocal()
+        db.use_replica = replica
+        try:
+            for consulta in _hot_sync_queries():
+                consulta(db)
+        finally:
+            db.rollback()
+            db.close()
+    return conexiones
+
+
+async def _open_async_connections(engine_async) -> int:
+    resultados = await asyncio.gather(
+        *[engine_async.connect() for _ in range(_pool_size(engine_async.pool))],
+        return_exceptions=True
+    )
+    conexiones = [r for r in resultados if not isinstance(r, BaseException)]
+    for conexion in conexiones:
+        await conexion.close()
+    errores = [r for r in resultados if isinstance(r, BaseException)]
+    if errores:
+        raise errores[0]
+    return len(conexiones)
+
+
+async def warm_up_async_engine() -> int:
+    """
+    Igual que warm_up_sync_engine, para los engines async (asyncpg).
+    """
+    conexiones = await _open_async_connections(async_engine)
+    usar_replica = [False]
+    if async_replica_engine is not None:
+        conexiones += await _open_async_connections(async_replica_engine)
+        usar_replica.append(True)
+
+    for replica in usar_replica:
+        async with AsyncSessionLocal() as db:
+            db.sync_session.use_replica = replica
+            for consulta in _hot_async_queries():
+                await consulta(db)
+            await db.rollback()
+    return conexiones
+
+
+async def warm_up_database() -> None:
+    """
+    Calienta ambos pools. Nunca lanza: un fallo solo se registra.
+    """
+    if not settings.DB_WARMUP_ON_STARTUP:
+        return
+    inicio = time.perf_counter()
+    try:
+        sync_conexiones, async_conexiones = await asyncio.wait_for(
+            asyncio.gather(run_in_threadpool(warm_up_sync_engine), warm_up_async_engine()),
+            timeout=settings.DB_WARMUP_TIMEOUT_SECONDS
+        )
+    except Exception as e:
+        logger.warning("No se pudo calentar la base de datos al arrancar: %s", e)
+        return
+    logger.info(
+        "Base de datos lista en %.0f ms (%s conexiones sync, %s async)",
+        (time.perf_counter() - inicio) * 1000, sync_conexiones, async_conexiones
+    )
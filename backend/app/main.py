@@ -1,30 +1,53 @@
 # backend/app/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from typing import List
 from pathlib import Path
 
 # Importa los routers de la API
-from app.api.endpoints import users, courses, tasks, enrollments, submissions, announcements, student_profiles, exams
+from app.api.endpoints import users, courses, tasks, enrollments, submissions, announcements, student_profiles, exams, jobs, metrics
 from app.api.endpoints.login import router as login_router
 
 from app.core.config import settings # <-- Importa la configuración
-from app.db.base import Base
-from app.db.session import engine # <-- Importa el engine de la sesión
+from app.core.security import PasswordHashingBusy
+from app.crud.crud_interaccion_recurso import VistaAcumuladaDuplicada
+from app.crud.pagination import InvalidCursorError
+from app.db.session import async_engine, async_replica_engine, engine, replica_engine
+from app.db.warmup import warm_up_database
+from app.services.blob_storage import blob_store
+from app.services.interaction_buffer import InteractionBufferFull, interaction_buffer
+from app.services.job_queue import job_queue
+from app.services import remedial_jobs  # noqa: F401 (registra los handlers de la cola)
 
-# --- Función para crear las tablas ---
-def create_tables():
-    print("Creando tablas en la base de datos...")
-    Base.metadata.create_all(bind=engine) # Usa el engine de session.py
-    print("Tablas creadas.")
+# El esquema de la base de datos lo gestionan las migraciones (backend/alembic);
+# se aplican con `python init_db.py` antes de arrancar la API (ver start.sh / start.py).
+# Importar este módulo no se conecta a la base de datos.
 
-create_tables()
+# --- Ciclo de vida: pools de la base de datos, workers de la cola de trabajos y buffer de interacciones ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_database()
+    job_queue.start()
+    blob_store.schedule_collection(huerfanos=True)  # Archivos de subidas revertidas antes del reinicio
+    interaction_buffer.start()
+    yield
+    interaction_buffer.stop()  # Escribe las interacciones pendientes antes de cerrar los pools
+    job_queue.stop()
+    engine.dispose()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        replica_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
 
 # --- Instancia de la aplicación FastAPI ---
 app = FastAPI(
     title=settings.PROJECT_NAME, # <-- Usa el nombre del proyecto de config
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" # <-- Usa la ruta de config
+    openapi_url=f"{settings.API_V1_STR}/openapi.json", # <-- Usa la ruta de config
+    lifespan=lifespan
 )
 
 # --- Configuración de CORS ---
@@ -34,8 +57,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Job-Id", "X-Next-Cursor", "ETag", "Last-Modified", "Content-Range", "Accept-Ranges", "Content-Disposition"],
 )
 
+# --- Cursor de paginación inválido -> 400 ---
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+@app.exception_handler(VistaAcumuladaDuplicada)
+async def vista_acumulada_duplicada_handler(request: Request, exc: VistaAcumuladaDuplicada):
+    return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": str(exc)})
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(InteractionBufferFull)
+async def interaction_buffer_full_handler(request: Request, exc: InteractionBufferFull):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)}, headers={"Retry-After": "5"}
+    )
+
 # --- Crear directorio de uploads si no existe ---
 from app.core.config import settings
 upload_dir = Path(settings.UPLOAD_DIR)
@@ -56,14 +101,17 @@ app.include_router(announcements.router, prefix="/announcements", tags=["announc
 
 app.include_router(student_profiles.router, prefix=f"{settings.API_V1_STR}/student-profile", tags=["Student Profile"])
 app.include_router(exams.router, prefix=f"{settings.API_V1_STR}/exams", tags=["Exams"])
+app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 
 
-from app.api.endpoints import conceptos, recursos, recomendaciones, tareas_conceptos
+from app.api.endpoints import conceptos, recursos, recomendaciones, tareas_conceptos, interacciones
 app.include_router(conceptos.router, prefix="/conceptos", tags=["Conceptos"])
 app.include_router(recursos.router, prefix="/recursos", tags=["Recursos"])
 app.include_router(recomendaciones.router, prefix="/recomendaciones", tags=["Recomendaciones"])
 app.include_router(tareas_conceptos.router, prefix="", tags=["Tareas-Conceptos"])
+app.include_router(interacciones.router, prefix="/interacciones", tags=["Interacciones"])
 
 @app.get("/", tags=["Root"])
 def read_root():
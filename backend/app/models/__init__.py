@@ -18,4 +18,19 @@ from .recurso import Recurso
 from .tarea_concepto import TareaConcepto
 from .recurso_concepto import RecursoConcepto
 from .recomendacion_estudiante import RecomendacionEstudiante
-from .interaccion_recurso import InteraccionRecurso
\ No newline at end of file
+from .interaccion_recurso import InteraccionRecurso
+
+# Cola de trabajos en segundo plano
+from .background_job import BackgroundJob
+
+# Almacenamiento de archivos por contenido
+from .blob import Blob
+
+# Refresh tokens revocados
+from .revoked_token import RevokedToken
+
+# Índice materializado docente -> categorías de conceptos
+from .docente_categoria import DocenteCategoria
+
+# Resumen de interacciones por recurso
+from .recurso_stats import RecursoStats
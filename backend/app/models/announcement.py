@@ -1,5 +1,5 @@
 # backend/app/models/announcement.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
@@ -24,6 +24,11 @@ class Announcement(Base):
     author = relationship("User", back_populates="announcements")
     comments = relationship("Comment", back_populates="announcement", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Listado de comunicados de un curso, paginado por (fecha_creacion, id)
+        Index("ix_announcements_curso_fecha_creacion", "curso_id", "fecha_creacion", "id"),
+    )
+
     def __repr__(self):
         return f"<Announcement(id={self.id}, titulo='{self.titulo}', curso_id={self.curso_id})>"
 
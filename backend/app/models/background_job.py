@@ -0,0 +1,41 @@
+# backend/app/models/background_job.py
+from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import text
+
+from app.db.base import Base
+
+class EstadoJob(str):
+    """Enum para estados de un trabajo en segundo plano (usado como string en la BD)"""
+    PENDIENTE = "pending"
+    EJECUTANDO = "running"
+    COMPLETADO = "done"
+    FALLIDO = "failed"
+
+class BackgroundJob(Base):
+    """
+    Modelo para la cola de trabajos en segundo plano respaldada por la base de datos.
+    Permite que varias réplicas de la API compartan la misma cola (los workers
+    toman trabajos con SELECT ... FOR UPDATE SKIP LOCKED). Un trabajo 'running'
+    cuyo bloqueado_hasta ya pasó (el worker murió) vuelve a tomarse.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column("tipo", String(100), nullable=False)  # Nombre del handler registrado
+    payload = Column("payload", JSON, nullable=False)
+    estado = Column("estado", String(20), default=EstadoJob.PENDIENTE, nullable=False)  # pending, running, done, failed
+    intentos = Column("intentos", Integer, default=0, nullable=False)
+    max_intentos = Column("max_intentos", Integer, default=5, nullable=False)
+    ultimo_error = Column("ultimo_error", Text, nullable=True)
+    ejecutar_despues = Column("ejecutar_despues", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)  # Para reintentos con backoff
+    fecha_creacion = Column("fecha_creacion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
+    fecha_actualizacion = Column("fecha_actualizacion", DateTime(timezone=True), nullable=True)
+    bloqueado_hasta = Column("bloqueado_hasta", DateTime(timezone=True), nullable=True)  # Lease del worker que lo ejecuta
+    solicitante_id = Column("solicitante_id", Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Quien lo encoló
+
+    __table_args__ = (
+        Index("ix_background_jobs_estado_ejecutar_despues", "estado", "ejecutar_despues"),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob(id={self.id}, tipo='{self.tipo}', estado='{self.estado}', intentos={self.intentos})>"
@@ -0,0 +1,22 @@
+# backend/app/models/blob.py
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime
+from sqlalchemy.sql import text
+
+from app.db.base import Base
+
+class Blob(Base):
+    """
+    Modelo para los archivos almacenados por contenido (content-addressed).
+    Cada contenido distinto se guarda una sola vez, identificado por su SHA-256;
+    las filas que lo usan (entregas, exámenes, recursos) guardan 'cas://<sha256>'
+    y 'referencias' cuenta cuántas lo apuntan.
+    """
+    __tablename__ = "blobs"
+
+    sha256 = Column("sha256", String(64), primary_key=True)
+    tamano = Column("tamano", BigInteger, nullable=False)  # Bytes
+    referencias = Column("referencias", Integer, default=0, nullable=False)  # 0 = candidato a recolección
+    fecha_creacion = Column("fecha_creacion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
+
+    def __repr__(self):
+        return f"<Blob(sha256='{self.sha256[:12]}...', tamano={self.tamano}, referencias={self.referencias})>"
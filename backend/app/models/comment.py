@@ -1,5 +1,5 @@
 # backend/app/models/comment.py
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
@@ -21,6 +21,11 @@ class Comment(Base):
     announcement = relationship("Announcement", back_populates="comments", foreign_keys=[anuncio_id])
     author = relationship("User", back_populates="comments", foreign_keys=[autor_id])
 
+    __table_args__ = (
+        # Listado de comentarios de un comunicado, paginado por (fecha_creacion, id)
+        Index("ix_comments_anuncio_fecha_creacion", "anuncio_id", "fecha_creacion", "id"),
+    )
+
     def __repr__(self):
         return f"<Comment(id={self.id}, anuncio_id={self.anuncio_id}, autor_id={self.autor_id})>"
 
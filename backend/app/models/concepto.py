@@ -15,7 +15,7 @@ class Concepto(Base):
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column("nombre", String(255), unique=True, nullable=False, index=True)
     descripcion = Column("descripcion", Text, nullable=True)
-    categoria = Column("categoria", String(100), nullable=True)  # ej: "Matemáticas", "Lenguaje", "Ciencias"
+    categoria = Column("categoria", String(100), nullable=True, index=True)  # ej: "Matemáticas", "Lenguaje", "Ciencias"
     nivel = Column("nivel", String(50), nullable=True)  # ej: "Básico", "Intermedio", "Avanzado"
     fecha_creacion = Column("fecha_creacion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
 
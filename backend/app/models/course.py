@@ -14,7 +14,7 @@ class Course(Base):
     
     fecha_creacion = Column("fecha_creacion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
     
-    propietario_id = Column("propietario_id", Integer, ForeignKey("users.id"), nullable=False)
+    propietario_id = Column("propietario_id", Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     # --- Relaciones ---
     owner = relationship("User", back_populates="courses", foreign_keys=[propietario_id])
@@ -0,0 +1,19 @@
+# backend/app/models/docente_categoria.py
+from sqlalchemy import Column, Integer, String, ForeignKey
+
+from app.db.base import Base
+
+class DocenteCategoria(Base):
+    """
+    Índice materializado docente -> categoría de concepto: las categorías de los
+    conceptos asociados a tareas de los cursos de cada docente.
+    Se mantiene desde los CRUD que cambian esa relación (ver crud_docente_categoria);
+    la clave primaria (docente_id, categoria) resuelve la consulta por docente.
+    """
+    __tablename__ = "docente_categorias"
+
+    docente_id = Column("docente_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    categoria = Column("categoria", String(100), primary_key=True)
+
+    def __repr__(self):
+        return f"<DocenteCategoria(docente_id={self.docente_id}, categoria='{self.categoria}')>"
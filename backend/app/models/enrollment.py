@@ -1,5 +1,5 @@
 # backend/app/models/enrollment.py
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -23,5 +23,11 @@ class Enrollment(Base):
     # Una inscripción pertenece a un curso (Course)
     course = relationship("Course", back_populates="enrollments", foreign_keys=[curso_id]) # <--- USA CADENA
 
+    __table_args__ = (
+        # Una inscripción por estudiante y curso; también resuelve get_enrollment_by_user_and_course
+        Index("uq_enrollments_estudiante_curso", "estudiante_id", "curso_id", unique=True),
+        Index("ix_enrollments_curso_id", "curso_id"),
+    )
+
     def __repr__(self):
         return f"<Enrollment(id={self.id}, estudiante_id={self.estudiante_id}, curso_id={self.curso_id})>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db.base import Base
@@ -10,7 +10,7 @@ class Exam(Base):
     titulo = Column(String, index=True)  # Title
     descripcion = Column(Text, nullable=True)  # Description
     fecha_programada = Column(DateTime, nullable=True)  # Scheduled Date
-    curso_id = Column(Integer, ForeignKey("courses.id"))
+    curso_id = Column(Integer, ForeignKey("courses.id"), index=True)
     
     # PDF del examen (opcional)
     ruta_pdf = Column(String(500), nullable=True)  # Ruta al archivo PDF del examen
@@ -39,3 +39,8 @@ class ExamSubmission(Base):
     # Relaciones
     exam = relationship("Exam", back_populates="submissions")
     estudiante = relationship("User", back_populates="exam_submissions")
+
+    __table_args__ = (
+        # Una entrega por estudiante y examen; también resuelve get_submission_by_student
+        Index("uq_exam_submissions_exam_estudiante", "exam_id", "estudiante_id", unique=True),
+    )
@@ -1,5 +1,5 @@
 # backend/app/models/interaccion_recurso.py
-from sqlalchemy import Column, Integer, ForeignKey, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
@@ -27,6 +27,9 @@ class InteraccionRecurso(Base):
     tiempo_visto_segundos = Column("tiempo_visto_segundos", Integer, nullable=True)  # Para videos
     fecha_interaccion = Column("fecha_interaccion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
     mejora_nota = Column("mejora_nota", Boolean, default=False, nullable=False)  # Si mejoró después de ver el recurso
+    # True: vista que acumula los heartbeats de reproducción de POST /interacciones/batch
+    # (una por estudiante y recurso). Las interacciones creadas una a una quedan en False.
+    acumulada = Column("acumulada", Boolean, default=False, server_default=text("false"), nullable=False)
 
     # --- Relaciones de SQLAlchemy ---
     
@@ -36,6 +39,15 @@ class InteraccionRecurso(Base):
     # Relación con Recurso
     recurso = relationship("Recurso", back_populates="interacciones")
 
+    __table_args__ = (
+        # Una sola vista acumulada por estudiante y recurso: los heartbeats de
+        # reproducción la actualizan con un upsert (ver crud_interaccion_recurso)
+        Index(
+            "uq_interacciones_recursos_vista", "estudiante_id", "recurso_id", unique=True,
+            postgresql_where=text("tipo_interaccion = 'viewed' AND acumulada")
+        ),
+    )
+
     def __repr__(self):
         return f"<InteraccionRecurso(id={self.id}, estudiante_id={self.estudiante_id}, recurso_id={self.recurso_id}, tipo='{self.tipo_interaccion}')>"
 
@@ -1,5 +1,5 @@
 # backend/app/models/recomendacion_estudiante.py
-from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text
 
@@ -34,6 +34,13 @@ class RecomendacionEstudiante(Base):
     # Constraint único para evitar duplicados
     __table_args__ = (
         UniqueConstraint('estudiante_id', 'tarea_id', 'recurso_id', name='uq_recomendacion_estudiante'),
+        # Recomendaciones de un estudiante, paginadas por (fecha_recomendacion, id)
+        Index("ix_recomendaciones_estudiante_fecha", "estudiante_id", "fecha_recomendacion", "id"),
+        # Solo las no vistas (el filtro del dashboard): índice parcial, pequeño aunque el historial crezca
+        Index(
+            "ix_recomendaciones_estudiante_no_vistas", "estudiante_id", "fecha_recomendacion", "id",
+            postgresql_where=text("vista = false")
+        ),
     )
 
     def __repr__(self):
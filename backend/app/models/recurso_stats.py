@@ -0,0 +1,26 @@
+# backend/app/models/recurso_stats.py
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, DateTime
+from sqlalchemy.sql import text
+
+from app.db.base import Base
+
+class RecursoStats(Base):
+    """
+    Resumen (rollup) de las interacciones de cada recurso: contadores y sumas
+    que crud_interaccion_recurso actualiza en la misma transacción que cada
+    interacción (ver crud_recurso_stats). Leer las estadísticas de un recurso
+    es una búsqueda por clave primaria, sin importar cuántas interacciones tenga.
+    """
+    __tablename__ = "recurso_stats"
+
+    recurso_id = Column("recurso_id", Integer, ForeignKey("recursos.id", ondelete="CASCADE"), primary_key=True)
+    total_interacciones = Column("total_interacciones", Integer, nullable=False, server_default="0")
+    total_views = Column("total_views", Integer, nullable=False, server_default="0")
+    total_completions = Column("total_completions", Integer, nullable=False, server_default="0")
+    total_ratings = Column("total_ratings", Integer, nullable=False, server_default="0")
+    suma_calificaciones = Column("suma_calificaciones", BigInteger, nullable=False, server_default="0")
+    total_mejoras = Column("total_mejoras", Integer, nullable=False, server_default="0")
+    fecha_actualizacion = Column("fecha_actualizacion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
+
+    def __repr__(self):
+        return f"<RecursoStats(recurso_id={self.recurso_id}, total_interacciones={self.total_interacciones})>"
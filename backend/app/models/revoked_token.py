@@ -0,0 +1,15 @@
+# backend/app/models/revoked_token.py
+from sqlalchemy import Column, String, DateTime
+
+from app.db.base import Base
+
+class RevokedToken(Base):
+    """
+    Lista de revocación de refresh tokens (por su 'jti').
+    Solo guarda los tokens ya usados (rotación) o cerrados con logout, hasta que
+    expiran: después de 'expira' el token sería rechazado igual y la fila se borra.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column("jti", String(32), primary_key=True)  # uuid4().hex del refresh token
+    expira = Column("expira", DateTime(timezone=True), nullable=False, index=True)
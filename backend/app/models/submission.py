@@ -1,5 +1,5 @@
 # backend/app/models/submission.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import text # Para el valor por defecto NOW()
 
@@ -37,5 +37,10 @@ class Submission(Base):
     # Relación de vuelta a la Tarea (Una tarea tiene muchas entregas)
     task = relationship("Task", back_populates="submissions", foreign_keys=[tarea_id])
 
+    __table_args__ = (
+        # Una entrega por estudiante y tarea; también sirve para listar las entregas de una tarea
+        Index("uq_submissions_tarea_estudiante", "tarea_id", "estudiante_id", unique=True),
+    )
+
     def __repr__(self):
         return f"<Submission(id={self.id}, estudiante_id={self.estudiante_id}, tarea_id={self.tarea_id})>"
\ No newline at end of file
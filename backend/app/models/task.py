@@ -19,7 +19,7 @@ class Task(Base):
     fecha_creacion = Column("fecha_creacion", DateTime(timezone=True), server_default=text("NOW()"), nullable=False)
 
     # Clave foránea al curso al que pertenece
-    curso_id = Column("curso_id", Integer, ForeignKey("courses.id"), nullable=False)
+    curso_id = Column("curso_id", Integer, ForeignKey("courses.id"), nullable=False, index=True)
 
     # --- Relaciones de SQLAlchemy ---
 
@@ -5,8 +5,16 @@ from .recurso import Recurso, RecursoCreate, RecursoUpdate, RecursoWithConcepts
 from .tarea_concepto import TareaConcepto, TareaConceptoCreate, TareaConceptosCreate
 from .recurso_concepto import RecursoConcepto, RecursoConceptoCreate, RecursoConceptosCreate
 from .recomendacion_estudiante import RecomendacionEstudiante, RecomendacionEstudianteCreate, RecomendacionEstudianteWithRecurso
-from .interaccion_recurso import InteraccionRecurso, InteraccionRecursoCreate
-
+from .interaccion_recurso import (
+    InteraccionRecurso, InteraccionRecursoCreate, RecursoStats,
+    InteraccionRecursoEvento, InteraccionRecursoBatch, InteraccionRecursoBatchResult
+)
 
+# Cola de trabajos en segundo plano
+from .background_job import BackgroundJob
 
+# Métricas de los pools de conexiones
+from .db_pool import PoolStats, DatabasePoolStats
 
+# Métricas de la caché de respuestas
+from .cache_stats import CacheNamespaceStats, CacheStats
@@ -0,0 +1,19 @@
+# backend/app/schemas/background_job.py
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+# Esquema para consultar el estado de un trabajo en segundo plano
+class BackgroundJob(BaseModel):
+    id: int
+    tipo: str
+    estado: str  # pending, running, done, failed
+    intentos: int
+    max_intentos: int
+    ultimo_error: Optional[str] = None
+    ejecutar_despues: Optional[datetime] = None
+    fecha_creacion: Optional[datetime] = None
+    fecha_actualizacion: Optional[datetime] = None
+    solicitante_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
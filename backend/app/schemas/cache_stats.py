@@ -0,0 +1,16 @@
+# backend/app/schemas/cache_stats.py
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+# Aciertos y fallos de un namespace de la caché de respuestas (ver app.services.response_cache)
+class CacheNamespaceStats(BaseModel):
+    hits: int
+    misses: int
+    errors: int  # Fallos del backend (se respondió desde la base de datos)
+    hit_ratio: float
+
+# Métricas del proceso que responde (con backend "memory", cada worker tiene las suyas)
+class CacheStats(BaseModel):
+    backend: Optional[str] = None  # None = caché desactivada
+    namespaces: Dict[str, CacheNamespaceStats]
+    invalidations: Dict[str, int]  # Invalidaciones por tag
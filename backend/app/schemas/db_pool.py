@@ -0,0 +1,26 @@
+# backend/app/schemas/db_pool.py
+from pydantic import BaseModel
+from typing import Optional
+
+# Estado y métricas de un pool de conexiones (ver app.db.pool)
+class PoolStats(BaseModel):
+    pool_size: int
+    checked_out: int  # Conexiones en uso
+    checked_in: int  # Conexiones libres en el pool
+    overflow: int  # Conexiones abiertas por encima de pool_size
+    max_overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    disconnects: int
+    checkout_wait_avg_ms: float
+    checkout_wait_p95_ms: float
+    checkout_wait_max_ms: float
+
+# Pools del proceso que responde (cada worker de uvicorn tiene los suyos)
+class DatabasePoolStats(BaseModel):
+    pid: int
+    sync_pool: PoolStats
+    async_pool: PoolStats
+    # Solo con DATABASE_REPLICA_URL
+    replica_sync_pool: Optional[PoolStats] = None
+    replica_async_pool: Optional[PoolStats] = None
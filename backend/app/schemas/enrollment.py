@@ -1,7 +1,7 @@
 # backend/app/schemas/enrollment.py
 from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 from app.schemas.user import User as UserSchema
 from app.schemas.course import Course as CourseSchema
@@ -29,4 +29,27 @@ class Enrollment(BaseModel):
     # course: CourseSchema
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Inscripción masiva (POST /enrollments/admin/bulk y /admin/bulk/csv) ---
+# Una fila: estudiante por correo y curso por ID
+class BulkEnrollmentRow(BaseModel):
+    correo: str
+    course_id: int
+
+class BulkEnrollmentRequest(BaseModel):
+    inscripciones: List[BulkEnrollmentRow]
+
+# Fila rechazada (linea: número de fila en el archivo o posición en la lista, desde 1)
+class BulkEnrollmentError(BaseModel):
+    linea: int
+    correo: Optional[str] = None
+    course_id: Optional[str] = None
+    error: str
+
+class BulkEnrollmentResult(BaseModel):
+    procesadas: int
+    inscritas: int
+    ya_inscritas: int  # Ya existían (en la base de datos o repetidas en el archivo)
+    total_errores: int
+    errores: List[BulkEnrollmentError]  # Los primeros BULK_IMPORT_MAX_ERRORS
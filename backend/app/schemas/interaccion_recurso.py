@@ -1,6 +1,6 @@
 # backend/app/schemas/interaccion_recurso.py
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 
 # Esquema base para InteraccionRecurso
@@ -30,6 +30,28 @@ class InteraccionRecurso(InteraccionRecursoBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+# Estadísticas de interacciones de un recurso
+class RecursoStats(BaseModel):
+    recurso_id: int
+    total_interacciones: int
+    total_views: int
+    total_completions: int
+    total_ratings: int
+    avg_rating: Optional[float] = None
+    total_mejoras: int
+
+# Evento de interacción para la ingesta por lotes (el estudiante sale del token)
+class InteraccionRecursoEvento(BaseModel):
+    recurso_id: int = Field(..., ge=1, le=2147483647)
+    tipo_interaccion: Literal["viewed", "completed", "rated"]  # viewed: heartbeat de reproducción
+    calificacion: Optional[int] = Field(None, ge=1, le=5)
+    tiempo_visto_segundos: Optional[int] = Field(None, ge=0, le=2147483647)  # Columna INTEGER
+    mejora_nota: Optional[bool] = False
 
+# Lote de eventos para POST /interacciones/batch
+class InteraccionRecursoBatch(BaseModel):
+    eventos: List[InteraccionRecursoEvento]
 
-
+# Respuesta de POST /interacciones/batch
+class InteraccionRecursoBatchResult(BaseModel):
+    aceptados: int
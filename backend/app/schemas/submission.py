@@ -1,6 +1,6 @@
 # backend/app/schemas/submission.py
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # Campos que se comparten (base)
@@ -20,6 +20,16 @@ class SubmissionUpdate(BaseModel):
     grade: Optional[float] = None  # Nota de 0 a 100
     feedback: Optional[str] = None  # Comentarios del docente
 
+# Esquema para calificar una entrega dentro de una calificación masiva
+class SubmissionGradeItem(BaseModel):
+    submission_id: int
+    grade: Optional[float] = None  # Nota de 0 a 100
+    feedback: Optional[str] = None  # Comentarios del docente
+
+# Esquema para calificar varias entregas de una tarea en una sola operación
+class SubmissionBulkGrade(BaseModel):
+    grades: List[SubmissionGradeItem]
+
 # Esquema para leer una entrega (lo que la API devuelve)
 class Submission(SubmissionBase):
     id: int
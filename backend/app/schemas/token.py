@@ -2,9 +2,19 @@
 from pydantic import BaseModel
 from typing import Optional
 
+from app.models.user import UserRole
+
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None  # Para POST /login/refresh-token
 
 class TokenPayload(BaseModel):
-    sub: Optional[int] = None # <-- ¡ESTO DEBE SER INT!
\ No newline at end of file
+    sub: Optional[int] = None # <-- ¡ESTO DEBE SER INT!
+    # Claims firmados del access token: las dependencias de rol autorizan con ellos sin ir a la BD
+    rol: Optional[UserRole] = None
+    activo: Optional[bool] = None
+    type: Optional[str] = None  # "access" o "refresh"
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
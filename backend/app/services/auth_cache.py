@@ -0,0 +1,107 @@
+# backend/app/services/auth_cache.py
+"""
+Cachés de autenticación usadas por deps.get_current_user.
+
+- Tokens: sha256(token) -> (claims, expiración). Evita decodificar y
+  verificar la firma del mismo JWT en cada request. La entrada nunca vive más
+  que el token: al expirar, el request recibe 401 igual que sin caché.
+- Usuarios: ID -> columnas del usuario, por AUTH_USER_CACHE_TTL_SECONDS. Con
+  un acierto, el usuario se incorpora a la sesión del request con
+  merge(load=False), sin consultar la base de datos.
+
+Cualquier UPDATE o DELETE de un User por el ORM (desactivación, cambio de rol)
+invalida su entrada al hacer commit. Los cambios hechos con SQL directo deben
+llamar a invalidate_user(); los de otros procesos expiran con el TTL.
+"""
+import hashlib
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+from app.services.response_cache import TAG_USERS, response_cache
+
+token_cache = TTLCache(settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+user_cache = TTLCache(settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_claims(token: str) -> Optional[Tuple[Any, float]]:
+    """(claims, exp) de un token ya verificado, o None."""
+    return token_cache.get(_token_key(token))
+
+
+def cache_claims(token: str, claims: Any, exp: Optional[float]) -> None:
+    if exp is None:
+        return  # Sin expiración no se sabe cuánto tiempo es válido
+    restante = exp - time.time()
+    if restante > 0:
+        token_cache.set(_token_key(token), (claims, exp), ttl=restante)
+
+
+# ----------------- Usuarios -----------------
+def _user_columns(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+def cache_user(user: User) -> None:
+    user_cache.set(user.id, _user_columns(user))
+
+
+def get_cached_user(db: Session, user_id: int) -> Optional[User]:
+    """
+    Usuario en caché, ya incorporado a la sesión `db` (sync) sin consultar la base de datos.
+    """
+    columnas = user_cache.get(user_id)
+    if columnas is None:
+        return None
+    return db.merge(detached_user(columnas), load=False)
+
+
+async def get_cached_user_async(db, user_id: int) -> Optional[User]:
+    """Igual que get_cached_user, para una AsyncSession."""
+    columnas = user_cache.get(user_id)
+    if columnas is None:
+        return None
+    return await db.merge(detached_user(columnas), load=False)
+
+
+def detached_user(columnas: Dict[str, Any]) -> User:
+    """User desvinculado con las columnas dadas (para merge(load=False))."""
+    user = User(**columnas)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.pop(user_id)
+
+
+# Invalidación: se anotan los usuarios modificados y se descartan al confirmar
+@event.listens_for(Session, "after_flush")
+def _collect_modified_users(session, flush_context):
+    ids = {obj.id for obj in list(session.dirty) + list(session.deleted) if isinstance(obj, User)}
+    if ids:
+        session.info.setdefault("usuarios_modificados", set()).update(ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_modified_users(session):
+    modificados = session.info.pop("usuarios_modificados", ())
+    for user_id in modificados:
+        invalidate_user(user_id)
+    if modificados:
+        # Las respuestas cacheadas de cursos incluyen nombre y correo del propietario
+        response_cache.invalidate(TAG_USERS)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_modified_users(session):
+    session.info.pop("usuarios_modificados", None)
@@ -0,0 +1,334 @@
+# backend/app/services/blob_storage.py
+"""
+Almacenamiento de archivos por contenido (content-addressed), con deduplicación.
+
+Cada PDF subido se identifica por su SHA-256 y se guarda una sola vez, aunque lo
+entreguen varios integrantes de un grupo o se reenvíe idéntico. Las filas que lo
+usan (Submission.ruta_archivo, Exam.ruta_pdf, Recurso.ruta_archivo) guardan
+'cas://<sha256>' y la tabla blobs lleva la cuenta de referencias.
+
+Backends (BLOB_STORAGE_BACKEND):
+- LocalBlobBackend: BLOB_STORAGE_DIR/ab/cd/abcd... (directorios por prefijo del hash).
+- S3BlobBackend: bucket S3 o compatible (MinIO en docker-compose), requiere boto3.
+
+Orden de operaciones al guardar: primero se suma la referencia (la fila queda
+bloqueada hasta el commit de quien llama) y después se escribe el contenido.
+La recolección de blobs sin referencias bloquea las filas con SKIP LOCKED, así que
+nunca borra un contenido que otra transacción acaba de volver a referenciar.
+
+Si la transacción de quien sube se revierte, el contenido ya escrito queda sin
+fila en blobs. El barrido de huérfanos (sweep_orphans, al arrancar la API) los
+registra con 0 referencias y la recolección los elimina como a cualquier otro.
+"""
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_async, crud_blob
+from app.services.job_queue import job_queue
+from app.services.uploads import remove_quietly, stream_pdf_to_temp
+
+logger = logging.getLogger(__name__)
+
+JOB_COLLECT_BLOBS = "collect_blob_garbage"
+
+
+@dataclass
+class StoredBlob:
+    """Resultado de guardar un archivo en el almacenamiento por contenido."""
+    uri: str  # 'cas://<sha256>', lo que se guarda en la BD
+    sha256: str
+    size: int
+
+
+def iter_file_range(path: Union[str, Path], start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    """Lee los bytes [start, end] (inclusive) de un archivo local por bloques."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        restantes = end - start + 1
+        while restantes > 0:
+            chunk = f.read(min(chunk_size, restantes))
+            if not chunk:
+                return
+            restantes -= len(chunk)
+            yield chunk
+
+
+# ----------------- Backends -----------------
+
+class BlobBackend:
+    """Interfaz de un backend de blobs, indexado por SHA-256."""
+
+    def exists(self, sha256: str) -> bool:
+        raise NotImplementedError
+
+    def put_file(self, sha256: str, tmp_path: Union[str, Path]) -> None:
+        """Mueve el temporal al almacenamiento (o lo descarta si el contenido ya existe)."""
+        raise NotImplementedError
+
+    def delete(self, sha256: str) -> None:
+        raise NotImplementedError
+
+    def local_path(self, sha256: str) -> Optional[Path]:
+        """Ruta en disco del blob, si el backend es local (None si no)."""
+        return None
+
+    def stat(self, sha256: str) -> Tuple[int, float]:
+        """Tamaño en bytes y fecha de modificación (timestamp) del blob."""
+        raise NotImplementedError
+
+    def iter_range(self, sha256: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        """Lee los bytes [start, end] (inclusive) del blob por bloques."""
+        raise NotImplementedError
+
+    def iter_blobs(self) -> Iterator[Tuple[str, int, float]]:
+        """Todos los blobs guardados: (sha256, tamaño, fecha de modificación)."""
+        raise NotImplementedError
+
+
+class LocalBlobBackend(BlobBackend):
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self._path(sha256).exists()
+
+    def put_file(self, sha256: str, tmp_path: Union[str, Path]) -> None:
+        path = self._path(sha256)
+        if path.exists():
+            remove_quietly(tmp_path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+
+    def delete(self, sha256: str) -> None:
+        remove_quietly(self._path(sha256))
+
+    def local_path(self, sha256: str) -> Optional[Path]:
+        return self._path(sha256)
+
+    def stat(self, sha256: str) -> Tuple[int, float]:
+        st = os.stat(self._path(sha256))
+        return st.st_size, st.st_mtime
+
+    def iter_range(self, sha256: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        return iter_file_range(self._path(sha256), start, end, chunk_size)
+
+    def iter_blobs(self) -> Iterator[Tuple[str, int, float]]:
+        # Solo root/ab/cd/<sha256>: los temporales de subida (root/tmp) no son blobs
+        for path in self.root.glob("??/??/*"):
+            sha256 = path.name
+            if len(sha256) != 64 or path.parent.parent.name != sha256[:2] or path.parent.name != sha256[2:4]:
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # Recolectado mientras se recorría
+            yield sha256, st.st_size, st.st_mtime
+
+
+class S3BlobBackend(BlobBackend):
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None,
+                 access_key_id: Optional[str] = None, secret_access_key: Optional[str] = None,
+                 prefix: str = "blobs/"):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("BLOB_STORAGE_BACKEND='s3' requiere boto3 (pip install boto3)") from e
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None
+        )
+
+    def _key(self, sha256: str) -> str:
+        return f"{self.prefix}{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def exists(self, sha256: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put_file(self, sha256: str, tmp_path: Union[str, Path]) -> None:
+        try:
+            if not self.exists(sha256):
+                self.client.upload_file(
+                    str(tmp_path), self.bucket, self._key(sha256),
+                    ExtraArgs={"ContentType": "application/pdf"}
+                )
+        finally:
+            remove_quietly(tmp_path)
+
+    def delete(self, sha256: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(sha256))
+
+    def stat(self, sha256: str) -> Tuple[int, float]:
+        head = self.client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+        return head["ContentLength"], head["LastModified"].timestamp()
+
+    def iter_range(self, sha256: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        body = self.client.get_object(
+            Bucket=self.bucket, Key=self._key(sha256), Range=f"bytes={start}-{end}"
+        )["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def iter_blobs(self) -> Iterator[Tuple[str, int, float]]:
+        paginas = self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self.prefix)
+        for pagina in paginas:
+            for objeto in pagina.get("Contents", []):
+                sha256 = objeto["Key"].rsplit("/", 1)[-1]
+                if len(sha256) == 64:
+                    yield sha256, objeto["Size"], objeto["LastModified"].timestamp()
+
+
+# ----------------- Almacén -----------------
+
+class BlobStore:
+    def __init__(self, backend: BlobBackend, staging_dir: Union[str, Path]):
+        self.backend = backend
+        # Temporales de subida; en el backend local está dentro de la misma raíz,
+        # así el paso final es un rename atómico en el mismo sistema de archivos
+        self.staging_dir = Path(staging_dir)
+
+    async def store_pdf_upload(self, db: Union[Session, AsyncSession], file: UploadFile, max_bytes: Optional[int] = None) -> StoredBlob:
+        """
+        Guarda un PDF subido y suma una referencia a su blob, en la transacción
+        de db (sin commit). Retorna la URI 'cas://<sha256>' a guardar en la fila.
+        """
+        stored = await stream_pdf_to_temp(file, self.staging_dir, max_bytes)
+        try:
+            if isinstance(db, AsyncSession):
+                await crud_async.add_blob_reference(db, stored.sha256, stored.size)
+            else:
+                crud_blob.add_blob_reference(db, stored.sha256, stored.size)
+            await run_in_threadpool(self.backend.put_file, stored.sha256, stored.path)
+        except BaseException:
+            await run_in_threadpool(remove_quietly, stored.path)
+            raise
+        return StoredBlob(uri=crud_blob.blob_uri(stored.sha256), sha256=stored.sha256, size=stored.size)
+
+    def release(self, db: Session, ruta: Optional[str]) -> bool:
+        """
+        Resta una referencia al blob de la ruta (sin commit). Retorna True si quedó
+        sin referencias: quien llama debe invocar schedule_collection() tras el commit.
+        """
+        return crud_blob.release_blob_reference(db, ruta) == 0
+
+    def release_many(self, db: Session, rutas: Iterable[Optional[str]]) -> bool:
+        """
+        Igual que release() para varias rutas (p. ej. los archivos que se eliminan en
+        cascada con una tarea o un curso), en una sola sentencia.
+        """
+        return crud_blob.release_blob_references(db, rutas)
+
+    def schedule_collection(self, huerfanos: bool = False) -> int:
+        """
+        Encola la recolección de blobs sin referencias; con huerfanos=True, antes
+        barre el almacenamiento en busca de archivos sin fila en blobs.
+        """
+        return job_queue.enqueue(JOB_COLLECT_BLOBS, {"huerfanos": True} if huerfanos else {})
+
+    def local_path(self, ruta: Optional[str]) -> Optional[Path]:
+        """
+        Ruta en disco de un archivo: la del blob si es 'cas://' y el backend es local,
+        la ruta tal cual si es un archivo antiguo, o None si está en un backend remoto.
+        """
+        if not ruta:
+            return None
+        sha256 = crud_blob.parse_blob_uri(ruta)
+        if sha256 is None:
+            return Path(ruta)
+        return self.backend.local_path(sha256)
+
+    def sweep_orphans(self, db: Session, min_age_seconds: float, batch_size: int = 500) -> int:
+        """
+        Registra con 0 referencias los archivos del backend sin fila en blobs y más
+        antiguos que min_age_seconds, para que collect_garbage() los elimine.
+        Un commit por lote. Retorna cuántos registró.
+        """
+        limite = time.time() - min_age_seconds
+        registrados = 0
+        lote = []
+        for sha256, tamano, modificado in self.backend.iter_blobs():
+            if modificado > limite:
+                continue
+            lote.append((sha256, tamano))
+            if len(lote) >= batch_size:
+                registrados += crud_blob.adopt_orphan_blobs(db, lote)
+                db.commit()
+                lote = []
+        if lote:
+            registrados += crud_blob.adopt_orphan_blobs(db, lote)
+            db.commit()
+        return registrados
+
+    def collect_garbage(self, db: Session, batch_size: int = 100) -> int:
+        """
+        Elimina los blobs sin referencias (contenido y fila). Retorna cuántos eliminó.
+        """
+        eliminados = 0
+        while True:
+            blobs = crud_blob.lock_unreferenced_blobs(db, limit=batch_size)
+            if not blobs:
+                db.commit()
+                return eliminados
+            for blob in blobs:
+                self.backend.delete(blob.sha256)
+                db.delete(blob)
+            db.commit()
+            eliminados += len(blobs)
+
+
+def _build_backend() -> BlobBackend:
+    if settings.BLOB_STORAGE_BACKEND == "local":
+        return LocalBlobBackend(settings.BLOB_STORAGE_DIR)
+    if settings.BLOB_STORAGE_BACKEND == "s3":
+        return S3BlobBackend(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY
+        )
+    raise ValueError(f"BLOB_STORAGE_BACKEND desconocido: {settings.BLOB_STORAGE_BACKEND}")
+
+
+blob_store = BlobStore(
+    backend=_build_backend(),
+    staging_dir=Path(settings.BLOB_STORAGE_DIR) / "tmp"
+)
+
+
+@job_queue.register(JOB_COLLECT_BLOBS)
+def run_blob_garbage_collection(db: Session, payload: dict) -> None:
+    if payload.get("huerfanos"):
+        huerfanos = blob_store.sweep_orphans(db, settings.BLOB_ORPHAN_MIN_AGE_SECONDS)
+        if huerfanos:
+            logger.warning("Recolección de blobs: %s archivos sin fila en blobs", huerfanos)
+    eliminados = blob_store.collect_garbage(db)
+    if eliminados:
+        logger.info("Recolección de blobs: %s eliminados", eliminados)
@@ -0,0 +1,35 @@
+# backend/app/services/csv_import.py
+"""
+Lectura en streaming de archivos CSV para las importaciones masivas.
+
+Las filas se leen de a una desde el archivo (subido o local), así que un CSV de
+cientos de miles de filas no se carga entero en memoria: quien consume el
+generador decide cuántas acumula (p. ej. un tramo por consulta).
+"""
+import csv
+import io
+from typing import BinaryIO, Iterator, List, Sequence, Tuple
+
+
+def iter_csv_rows(stream: BinaryIO, columnas: Sequence[str]) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Genera (linea, valores) por cada fila no vacía de un CSV en UTF-8 (con o sin BOM).
+    `valores` siempre tiene len(columnas) elementos: las columnas faltantes quedan
+    como "" y las sobrantes se ignoran. Si la primera fila son los nombres de
+    `columnas`, se toma como encabezado y se omite.
+    Lanza UnicodeDecodeError o csv.Error si el archivo no es un CSV válido.
+    """
+    texto = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        lector = csv.reader(texto)
+        esperado = [c.lower() for c in columnas]
+        for fila in lector:
+            if not any(valor.strip() for valor in fila):
+                continue
+            if lector.line_num == 1 and [valor.strip().lower() for valor in fila[:len(esperado)]] == esperado:
+                continue
+            valores = [valor.strip() for valor in fila[:len(columnas)]]
+            valores += [""] * (len(columnas) - len(valores))
+            yield lector.line_num, valores
+    finally:
+        texto.detach()  # No cerrar el archivo de quien llama
@@ -0,0 +1,200 @@
+# backend/app/services/file_downloads.py
+"""
+Respuestas de descarga de PDFs (entregas y exámenes) con soporte HTTP completo:
+
+- ETag fuerte derivado del SHA-256 del contenido (el de blob_storage, o calculado
+  y cacheado por ruta/mtime/tamaño para archivos antiguos fuera del almacén).
+- If-None-Match / If-Modified-Since -> 304 sin cuerpo.
+- Range de un solo intervalo (con If-Range) -> 206; rango imposible -> 416.
+- Modo X-Accel-Redirect opcional (DOWNLOAD_X_ACCEL_REDIRECT): la API autoriza y
+  responde solo cabeceras; nginx envía los bytes desde X_ACCEL_LOCATION.
+
+La autorización se hace antes, en el endpoint.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+from app.core.config import settings
+from app.crud import crud_blob
+from app.services.blob_storage import blob_store, iter_file_range
+
+PDF_MEDIA_TYPE = "application/pdf"
+
+
+class _RangeNotSatisfiable(Exception):
+    pass
+
+
+@dataclass
+class _FileInfo:
+    size: int
+    mtime: float
+    etag: str
+    local_path: Optional[Path]  # None si el contenido está en un backend remoto
+    sha256: Optional[str]  # Solo para blobs
+
+
+@lru_cache(maxsize=4096)
+def _legacy_content_hash(path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns y size forman parte de la clave: si el archivo cambia, se recalcula
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(settings.UPLOAD_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+async def _file_info(ruta: str) -> Optional[_FileInfo]:
+    sha256 = crud_blob.parse_blob_uri(ruta)
+    local_path = blob_store.local_path(ruta)
+
+    if local_path is None:
+        # Blob en un backend remoto (S3)
+        try:
+            size, mtime = await run_in_threadpool(blob_store.backend.stat, sha256)
+        except Exception:
+            return None
+        return _FileInfo(size=size, mtime=mtime, etag=f'"{sha256}"', local_path=None, sha256=sha256)
+
+    try:
+        st = await run_in_threadpool(os.stat, local_path)
+    except FileNotFoundError:
+        return None
+    if sha256 is None:
+        content_hash = await run_in_threadpool(_legacy_content_hash, str(local_path), st.st_mtime_ns, st.st_size)
+    else:
+        content_hash = sha256
+    return _FileInfo(size=st.st_size, mtime=st.st_mtime, etag=f'"{content_hash}"', local_path=local_path, sha256=sha256)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Comparación débil, como exige If-None-Match
+    candidatos = [tag.strip() for tag in header.split(",")]
+    return etag in candidatos or f"W/{etag}" in candidatos
+
+
+def _is_not_modified(request: Request, info: _FileInfo) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Si viene If-None-Match, If-Modified-Since se ignora (RFC 9110)
+        return _etag_matches(if_none_match, info.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(info.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _requested_range(request: Request, info: _FileInfo) -> Optional[Tuple[int, int]]:
+    """
+    Retorna (inicio, fin) inclusive si hay que responder un rango, None para el
+    archivo completo. Lanza _RangeNotSatisfiable si el rango no cabe en el archivo.
+    """
+    header = request.headers.get("range")
+    if not header or not header.startswith("bytes="):
+        return None
+
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != info.etag and if_range.strip() != formatdate(info.mtime, usegmt=True):
+        return None  # El archivo cambió: se envía completo
+
+    spec = header[len("bytes="):].strip()
+    if "," in spec:
+        return None  # Múltiples rangos: se envía el archivo completo
+    inicio_txt, _, fin_txt = spec.partition("-")
+    try:
+        if inicio_txt == "":
+            sufijo = int(fin_txt)
+            if sufijo <= 0:
+                raise _RangeNotSatisfiable()
+            inicio, fin = max(0, info.size - sufijo), info.size - 1
+        else:
+            inicio = int(inicio_txt)
+            fin = min(int(fin_txt), info.size - 1) if fin_txt else info.size - 1
+    except ValueError:
+        return None  # Cabecera mal formada: se ignora
+    if inicio < 0 or inicio > fin or inicio >= info.size:
+        raise _RangeNotSatisfiable()
+    return inicio, fin
+
+
+def _iter_content(info: _FileInfo, inicio: int, fin: int) -> Iterator[bytes]:
+    if info.local_path is not None:
+        return iter_file_range(info.local_path, inicio, fin, settings.UPLOAD_CHUNK_SIZE)
+    return blob_store.backend.iter_range(info.sha256, inicio, fin, settings.UPLOAD_CHUNK_SIZE)
+
+
+def _accel_redirect_uri(info: _FileInfo) -> Optional[str]:
+    if not settings.DOWNLOAD_X_ACCEL_REDIRECT or info.local_path is None:
+        return None
+    try:
+        relativa = info.local_path.resolve().relative_to(Path(settings.X_ACCEL_FILES_ROOT).resolve())
+    except ValueError:
+        return None  # Fuera de la raíz que ve nginx: la API lo sirve directamente
+    return settings.X_ACCEL_LOCATION.rstrip("/") + "/" + quote(relativa.as_posix())
+
+
+async def pdf_download_response(request: Request, ruta: str, download_name: str) -> Response:
+    """
+    Construye la respuesta de descarga de un PDF ya autorizado.
+    Lanza HTTPException 404 si el archivo no existe.
+    """
+    info = await _file_info(ruta)
+    if info is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="El archivo no existe en el servidor")
+
+    headers: Dict[str, str] = {
+        "ETag": info.etag,
+        "Last-Modified": formatdate(info.mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        # Contenido privado: el navegador puede guardarlo, pero debe revalidar (304)
+        "Cache-Control": "private, no-cache",
+    }
+
+    if _is_not_modified(request, info):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+
+    accel_uri = _accel_redirect_uri(info)
+    if accel_uri:
+        headers["X-Accel-Redirect"] = accel_uri
+        return Response(media_type=PDF_MEDIA_TYPE, headers=headers)
+
+    try:
+        rango = _requested_range(request, info)
+    except _RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{info.size}"}
+        )
+
+    if rango is None:
+        inicio, fin, status_code = 0, info.size - 1, status.HTTP_200_OK
+    else:
+        inicio, fin = rango
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {inicio}-{fin}/{info.size}"
+    headers["Content-Length"] = str(fin - inicio + 1)
+
+    return StreamingResponse(
+        iterate_in_threadpool(_iter_content(info, inicio, fin)),
+        status_code=status_code,
+        media_type=PDF_MEDIA_TYPE,
+        headers=headers
+    )
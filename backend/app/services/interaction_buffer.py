@@ -0,0 +1,211 @@
+# backend/app/services/interaction_buffer.py
+"""
+Buffer de ingesta de interacciones (POST /interacciones/batch).
+
+Los endpoints agregan eventos al buffer y responden de inmediato; un thread,
+iniciado en el lifespan de app.main, los escribe en lotes con
+crud_interaccion_recurso.create_interacciones_batch:
+
+- cada INTERACTION_FLUSH_INTERVAL_SECONDS (el retraso máximo de un evento), o
+- antes, al juntarse INTERACTION_FLUSH_MAX_EVENTS.
+
+Los heartbeats "viewed" del mismo estudiante y recurso se fusionan ya en el
+buffer (mayor tiempo visto): mil heartbeats de un video son una sola fila del lote.
+
+Si un lote falla por un error transitorio (conexión, deadlock, pool agotado), sus
+eventos vuelven al buffer y se reintentan en el siguiente ciclo. Si falla por
+cualquier otro error (p. ej. DataError o IntegrityError de un evento), el lote se
+divide en mitades hasta aislar los eventos que no se pueden escribir, que se
+descartan con un log de error: un evento malo no bloquea a los demás ni se
+reintenta para siempre. Con más de INTERACTION_BUFFER_MAX_PENDING eventos
+pendientes, add() lanza InteractionBufferFull (503). stop() escribe lo pendiente antes de salir; los
+eventos que estaban en memoria se pierden si el proceso muere sin apagarse.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_interaccion_recurso
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Escribe un lote de eventos y retorna cuántos escribió
+BatchWriter = Callable[[Session, List[dict]], int]
+
+
+class InteractionBufferFull(Exception):
+    """Demasiados eventos pendientes de escribir (se responde 503)."""
+
+
+def _es_transitorio(error: Exception) -> bool:
+    """Errores que no dependen de los eventos: el mismo lote puede escribirse más tarde."""
+    if isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class InteractionBuffer:
+    def __init__(
+        self,
+        flush_interval: float,
+        max_events: int,
+        max_pending: int,
+        writer: BatchWriter = crud_interaccion_recurso.create_interacciones_batch
+    ):
+        self.flush_interval = flush_interval
+        self.max_events = max_events
+        self.max_pending = max_pending
+        self.writer = writer
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Un solo lote a la vez
+        self._vistas: Dict[Tuple[int, int], dict] = {}
+        self._otras: List[dict] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        # Métricas (acumuladas desde que arrancó el proceso)
+        self.recibidos = 0
+        self.fusionados = 0
+        self.escritos = 0
+        self.lotes_fallidos = 0
+        self.descartados = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._vistas) + len(self._otras)
+
+    def add(self, eventos: List[dict]) -> int:
+        """
+        Agrega eventos (dicts de crud_interaccion_recurso.nuevo_evento) al buffer.
+        Retorna cuántos quedaron pendientes en total.
+        """
+        with self._lock:
+            if self.pending + len(eventos) > self.max_pending:
+                raise InteractionBufferFull("Demasiadas interacciones pendientes, reintenta en unos segundos")
+            self._merge(eventos)
+            self.recibidos += len(eventos)
+            pendientes = self.pending
+        if pendientes >= self.max_events:
+            self._wakeup.set()
+        return pendientes
+
+    def _merge(self, eventos: List[dict]) -> None:
+        # Llamar con self._lock tomado
+        for evento in eventos:
+            if evento["tipo_interaccion"] == crud_interaccion_recurso.TIPO_VISTA:
+                clave = (evento["estudiante_id"], evento["recurso_id"])
+                anterior = self._vistas.get(clave)
+                if anterior is not None:
+                    evento = crud_interaccion_recurso.merge_vista(anterior, evento)
+                    self.fusionados += 1
+                self._vistas[clave] = evento
+            else:
+                self._otras.append(evento)
+
+    def flush(self) -> int:
+        """
+        Escribe lo pendiente en un lote (ver _write). Los eventos que fallan por un
+        error transitorio vuelven al buffer. Retorna el número de eventos escritos.
+        """
+        with self._flush_lock:
+            with self._lock:
+                lote = list(self._vistas.values()) + self._otras
+                self._vistas, self._otras = {}, []
+            if not lote:
+                return 0
+
+            inicio = time.perf_counter()
+            escritos, reintentar = self._write(lote)
+            with self._lock:
+                self.escritos += escritos
+                if reintentar:
+                    self.lotes_fallidos += 1
+                    self._merge(reintentar)  # Los que llegaron mientras tanto se fusionan con estos
+            logger.debug("Lote de %s interacciones escrito en %.1f ms", escritos, (time.perf_counter() - inicio) * 1000)
+            return escritos
+
+    def _write(self, lote: List[dict]) -> Tuple[int, List[dict]]:
+        """
+        Escribe `lote` y retorna (escritos, eventos a reintentar). Ante un error que
+        no es transitorio divide el lote en mitades y descarta el evento que falla
+        solo; ante uno transitorio deja de intentar y devuelve todo lo no escrito.
+        """
+        db = SessionLocal()
+        try:
+            return self.writer(db, lote), []
+        except Exception as e:
+            db.rollback()
+            error = e
+        finally:
+            db.close()
+
+        if _es_transitorio(error):
+            logger.error("No se pudo escribir un lote de %s interacciones; se reintentará: %s", len(lote), error)
+            return 0, lote
+        if len(lote) == 1:
+            logger.error("Se descarta una interacción que no se puede escribir: %s (%s)", lote[0], error)
+            with self._lock:
+                self.descartados += 1
+            return 0, []
+
+        logger.warning("Falló un lote de %s interacciones (%s); se divide para aislar el evento", len(lote), type(error).__name__)
+        mitad = len(lote) // 2
+        escritos, reintentar = self._write(lote[:mitad])
+        if reintentar:
+            return escritos, reintentar + lote[mitad:]
+        escritos_resto, reintentar = self._write(lote[mitad:])
+        return escritos + escritos_resto, reintentar
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pendientes": self.pending,
+                "recibidos": self.recibidos,
+                "fusionados": self.fusionados,
+                "escritos": self.escritos,
+                "lotes_fallidos": self.lotes_fallidos,
+                "descartados": self.descartados,
+            }
+
+    def start(self) -> None:
+        """Inicia el thread que escribe los lotes (idempotente)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="interaction-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Detiene el thread y escribe lo pendiente (drenado del buffer)."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+        if self.pending:
+            logger.error("Se apagó la API con %s interacciones sin escribir", self.pending)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                return  # stop() escribe lo pendiente
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error inesperado al escribir interacciones")
+
+
+interaction_buffer = InteractionBuffer(
+    flush_interval=settings.INTERACTION_FLUSH_INTERVAL_SECONDS,
+    max_events=settings.INTERACTION_FLUSH_MAX_EVENTS,
+    max_pending=settings.INTERACTION_BUFFER_MAX_PENDING
+)
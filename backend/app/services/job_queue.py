@@ -0,0 +1,393 @@
+# backend/app/services/job_queue.py
+"""
+Cola de trabajos en segundo plano.
+
+Los endpoints encolan trabajos (por ejemplo, generar recomendaciones remediales
+después de calificar) y un pool de threads, iniciado en el lifespan de app.main,
+los ejecuta fuera del request. El backend de almacenamiento es intercambiable:
+
+- InMemoryJobBackend: cola en proceso, sin dependencias externas.
+- DatabaseJobBackend: tabla background_jobs, compartida entre réplicas.
+
+Los trabajos que fallan se reintentan con backoff exponencial hasta agotar sus intentos.
+En DatabaseJobBackend, el worker que toma un trabajo lo reserva por
+JOB_LEASE_SECONDS (bloqueado_hasta): si el proceso muere a mitad de camino, al
+vencer la reserva otro worker lo vuelve a tomar como un intento más.
+"""
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.background_job import BackgroundJob, EstadoJob
+
+logger = logging.getLogger(__name__)
+
+# Un handler recibe una sesión propia del trabajo y el payload encolado
+JobHandler = Callable[[Session, dict], Any]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class JobRecord:
+    """Vista de un trabajo, independiente del backend que lo almacena."""
+    id: int
+    tipo: str
+    payload: dict
+    estado: str = EstadoJob.PENDIENTE
+    intentos: int = 0
+    max_intentos: int = 5
+    ultimo_error: Optional[str] = None
+    ejecutar_despues: datetime = field(default_factory=_now)
+    fecha_creacion: datetime = field(default_factory=_now)
+    fecha_actualizacion: Optional[datetime] = None
+    solicitante_id: Optional[int] = None  # Usuario que lo encoló (None: lo encoló el sistema)
+
+
+# ----------------- Backends -----------------
+
+class JobBackend:
+    """
+    Interfaz de almacenamiento de la cola. Un backend debe permitir que varios
+    workers tomen trabajos concurrentemente sin ejecutar dos veces el mismo.
+    """
+
+    def enqueue(self, tipo: str, payload: dict, max_intentos: int, solicitante_id: Optional[int] = None) -> int:
+        raise NotImplementedError
+
+    def claim(self) -> Optional[JobRecord]:
+        """Toma el siguiente trabajo listo para ejecutarse (o None) y lo marca como 'running'."""
+        raise NotImplementedError
+
+    def mark_done(self, job: JobRecord) -> None:
+        raise NotImplementedError
+
+    def mark_failed(self, job: JobRecord, error: str, retry_at: Optional[datetime]) -> None:
+        """Registra el error; si retry_at no es None, el trabajo vuelve a quedar pendiente."""
+        raise NotImplementedError
+
+    def get(self, job_id: int) -> Optional[JobRecord]:
+        raise NotImplementedError
+
+
+class InMemoryJobBackend(JobBackend):
+    """
+    Cola en memoria del proceso. Suficiente con un solo worker de uvicorn;
+    los trabajos pendientes se pierden si el proceso se reinicia.
+    """
+
+    def __init__(self, max_finished: int = 10000):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, JobRecord] = {}
+        self._pending: List[tuple] = []  # heap de (ejecutar_despues, id)
+        self._finished: List[int] = []  # orden de término, para acotar la memoria
+        self._max_finished = max_finished
+
+    def enqueue(self, tipo: str, payload: dict, max_intentos: int, solicitante_id: Optional[int] = None) -> int:
+        with self._lock:
+            job = JobRecord(
+                id=next(self._ids), tipo=tipo, payload=payload, max_intentos=max_intentos, solicitante_id=solicitante_id
+            )
+            self._jobs[job.id] = job
+            heapq.heappush(self._pending, (job.ejecutar_despues, job.id))
+            return job.id
+
+    def claim(self) -> Optional[JobRecord]:
+        now = _now()
+        with self._lock:
+            if not self._pending or self._pending[0][0] > now:
+                return None
+            _, job_id = heapq.heappop(self._pending)
+            job = self._jobs[job_id]
+            job.estado = EstadoJob.EJECUTANDO
+            job.intentos += 1
+            job.fecha_actualizacion = now
+            return job
+
+    def mark_done(self, job: JobRecord) -> None:
+        with self._lock:
+            job = self._jobs[job.id]
+            job.estado = EstadoJob.COMPLETADO
+            job.fecha_actualizacion = _now()
+            self._record_finished(job.id)
+
+    def mark_failed(self, job: JobRecord, error: str, retry_at: Optional[datetime]) -> None:
+        with self._lock:
+            job_id = job.id
+            job = self._jobs[job_id]
+            job.ultimo_error = error
+            job.fecha_actualizacion = _now()
+            if retry_at is not None:
+                job.estado = EstadoJob.PENDIENTE
+                job.ejecutar_despues = retry_at
+                heapq.heappush(self._pending, (retry_at, job_id))
+            else:
+                job.estado = EstadoJob.FALLIDO
+                self._record_finished(job_id)
+
+    def get(self, job_id: int) -> Optional[JobRecord]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _record_finished(self, job_id: int) -> None:
+        self._finished.append(job_id)
+        while len(self._finished) > self._max_finished:
+            self._jobs.pop(self._finished.pop(0), None)
+
+
+class DatabaseJobBackend(JobBackend):
+    """
+    Cola respaldada por la tabla background_jobs. Los workers de todas las réplicas
+    toman trabajos con SELECT ... FOR UPDATE SKIP LOCKED, así que nunca dos workers
+    ejecutan el mismo trabajo a la vez.
+
+    Al tomarlo, el trabajo queda reservado por lease_seconds (bloqueado_hasta). Un
+    trabajo 'running' con la reserva vencida es de un worker que murió: claim lo
+    vuelve a tomar (como un intento más), o lo marca 'failed' si ya agotó sus
+    intentos. mark_done/mark_failed solo aplican si el trabajo sigue en el intento
+    que se tomó, así que un worker lento no pisa el resultado del que lo retomó.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, lease_seconds: float = 600.0):
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds
+
+    def enqueue(self, tipo: str, payload: dict, max_intentos: int, solicitante_id: Optional[int] = None) -> int:
+        db = self.session_factory()
+        try:
+            job = BackgroundJob(
+                tipo=tipo, payload=payload, max_intentos=max_intentos, intentos=0,
+                estado=EstadoJob.PENDIENTE, solicitante_id=solicitante_id
+            )
+            db.add(job)
+            db.commit()
+            return job.id
+        finally:
+            db.close()
+
+    def claim(self) -> Optional[JobRecord]:
+        db = self.session_factory()
+        try:
+            while True:
+                now = _now()
+                job = db.query(BackgroundJob).filter(or_(
+                    and_(BackgroundJob.estado == EstadoJob.PENDIENTE, BackgroundJob.ejecutar_despues <= now),
+                    and_(BackgroundJob.estado == EstadoJob.EJECUTANDO, BackgroundJob.bloqueado_hasta < now)
+                )).order_by(
+                    BackgroundJob.ejecutar_despues, BackgroundJob.id
+                ).with_for_update(skip_locked=True).first()
+                if job is None:
+                    db.rollback()
+                    return None
+
+                if job.estado == EstadoJob.EJECUTANDO:
+                    logger.warning("Trabajo %s (%s): venció la reserva del intento %s", job.id, job.tipo, job.intentos)
+                    if job.intentos >= job.max_intentos:
+                        job.estado = EstadoJob.FALLIDO
+                        job.ultimo_error = "El worker que lo ejecutaba no terminó antes de que venciera la reserva"
+                        job.bloqueado_hasta = None
+                        job.fecha_actualizacion = now
+                        db.commit()
+                        continue
+
+                job.estado = EstadoJob.EJECUTANDO
+                job.intentos += 1
+                job.bloqueado_hasta = now + timedelta(seconds=self.lease_seconds)
+                job.fecha_actualizacion = now
+                record = self._to_record(job)
+                db.commit()
+                return record
+        finally:
+            db.close()
+
+    def mark_done(self, job: JobRecord) -> None:
+        self._update(job, estado=EstadoJob.COMPLETADO)
+
+    def mark_failed(self, job: JobRecord, error: str, retry_at: Optional[datetime]) -> None:
+        if retry_at is not None:
+            self._update(job, estado=EstadoJob.PENDIENTE, ultimo_error=error, ejecutar_despues=retry_at)
+        else:
+            self._update(job, estado=EstadoJob.FALLIDO, ultimo_error=error)
+
+    def get(self, job_id: int) -> Optional[JobRecord]:
+        db = self.session_factory()
+        try:
+            job = db.get(BackgroundJob, job_id)
+            return self._to_record(job) if job else None
+        finally:
+            db.close()
+
+    def _update(self, job: JobRecord, **values) -> None:
+        db = self.session_factory()
+        try:
+            values["fecha_actualizacion"] = _now()
+            values["bloqueado_hasta"] = None
+            actualizados = db.query(BackgroundJob).filter(
+                BackgroundJob.id == job.id,
+                BackgroundJob.estado == EstadoJob.EJECUTANDO,
+                BackgroundJob.intentos == job.intentos
+            ).update(values, synchronize_session=False)
+            db.commit()
+            if not actualizados:
+                logger.warning("Trabajo %s: el intento %s ya no es el vigente (venció su reserva)", job.id, job.intentos)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_record(job: BackgroundJob) -> JobRecord:
+        return JobRecord(
+            id=job.id,
+            tipo=job.tipo,
+            payload=job.payload,
+            estado=job.estado,
+            intentos=job.intentos,
+            max_intentos=job.max_intentos,
+            ultimo_error=job.ultimo_error,
+            ejecutar_despues=job.ejecutar_despues,
+            fecha_creacion=job.fecha_creacion,
+            fecha_actualizacion=job.fecha_actualizacion,
+            solicitante_id=job.solicitante_id
+        )
+
+
+# ----------------- Cola y workers -----------------
+
+class JobQueue:
+    """
+    Registro de handlers + pool de threads que consume el backend configurado.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        workers: int = 2,
+        max_intentos: int = 5,
+        backoff_seconds: float = 2.0,
+        poll_interval: float = 1.0,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.backend = backend
+        self.workers = workers
+        self.max_intentos = max_intentos
+        self.backoff_seconds = backoff_seconds
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self._handlers: Dict[str, JobHandler] = {}
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def register(self, tipo: str) -> Callable[[JobHandler], JobHandler]:
+        """Decorador para registrar el handler de un tipo de trabajo."""
+        def decorator(handler: JobHandler) -> JobHandler:
+            self._handlers[tipo] = handler
+            return handler
+        return decorator
+
+    def enqueue(
+        self, tipo: str, payload: dict, max_intentos: Optional[int] = None, solicitante_id: Optional[int] = None
+    ) -> int:
+        """
+        Encola un trabajo y retorna su ID (para consultar su estado). solicitante_id
+        es el usuario que lo pidió: solo él (o un admin) puede consultarlo.
+        """
+        if tipo not in self._handlers:
+            raise ValueError(f"No hay un handler registrado para el trabajo '{tipo}'")
+        job_id = self.backend.enqueue(tipo, payload, max_intentos or self.max_intentos, solicitante_id)
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: int) -> Optional[JobRecord]:
+        return self.backend.get(job_id)
+
+    def start(self) -> None:
+        """Inicia los threads consumidores (idempotente)."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Cola de trabajos iniciada con %s workers (%s)", self.workers, type(self.backend).__name__)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Detiene los workers; el trabajo en curso termina antes de salir."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def run_pending(self) -> int:
+        """Ejecuta en el thread actual todos los trabajos listos. Útil en scripts."""
+        ejecutados = 0
+        while self._run_one():
+            ejecutados += 1
+        return ejecutados
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                ran = self._run_one()
+            except Exception:
+                logger.exception("Error inesperado en el worker de la cola de trabajos")
+                ran = False
+            if not ran:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _run_one(self) -> bool:
+        job = self.backend.claim()
+        if job is None:
+            return False
+
+        db = self.session_factory()
+        try:
+            handler = self._handlers.get(job.tipo)
+            if handler is None:
+                raise LookupError(f"No hay un handler registrado para el trabajo '{job.tipo}'")
+            handler(db, job.payload)
+            self.backend.mark_done(job)
+        except Exception as e:
+            db.rollback()
+            retry_at = None
+            if job.intentos < job.max_intentos:
+                retry_at = _now() + timedelta(seconds=self.backoff_seconds * 2 ** (job.intentos - 1))
+            logger.warning(
+                "Trabajo %s (%s) falló en el intento %s/%s: %s",
+                job.id, job.tipo, job.intentos, job.max_intentos, e
+            )
+            self.backend.mark_failed(job, f"{type(e).__name__}: {e}", retry_at)
+        finally:
+            db.close()
+        return True
+
+
+def _build_backend() -> JobBackend:
+    if settings.JOB_QUEUE_BACKEND == "database":
+        return DatabaseJobBackend(lease_seconds=settings.JOB_LEASE_SECONDS)
+    if settings.JOB_QUEUE_BACKEND == "memory":
+        return InMemoryJobBackend()
+    raise ValueError(f"JOB_QUEUE_BACKEND desconocido: {settings.JOB_QUEUE_BACKEND}")
+
+
+job_queue = JobQueue(
+    backend=_build_backend(),
+    workers=settings.JOB_QUEUE_WORKERS,
+    max_intentos=settings.JOB_MAX_ATTEMPTS,
+    backoff_seconds=settings.JOB_RETRY_BACKOFF_SECONDS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS
+)
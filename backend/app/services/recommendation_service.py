@@ -2,16 +2,22 @@
 """
 Servicio de Recomendación de Contenido Remedial - Nivel 1: Motor Basado en Reglas
 """
+from sqlalchemy import case, exists, func
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timezone
 
 from app.models.recomendacion_estudiante import RecomendacionEstudiante
 from app.models.recurso import Recurso
 from app.models.tarea_concepto import TareaConcepto
 from app.models.recurso_concepto import RecursoConcepto
-from app.crud import crud_task, crud_recomendacion_estudiante
-from app.schemas.recomendacion_estudiante import RecomendacionEstudianteCreate
+from app.crud import crud_recomendacion_estudiante
+
+# Score por nivel de dificultad (básico primero)
+NIVEL_SCORES = {
+    "básico": 3,
+    "intermedio": 2,
+    "avanzado": 1
+}
 
 class RecommendationService:
     """
@@ -46,6 +52,10 @@ class RecommendationService:
         """
         Genera recomendaciones de recursos cuando un estudiante obtiene una nota baja.
         
+        La búsqueda de candidatos, el conteo de conceptos coincidentes, el filtro de
+        recomendaciones ya existentes y la priorización se resuelven en una sola consulta
+        agregada; los recursos elegidos se insertan en una sola sentencia.
+        
         Args:
             estudiante_id: ID del estudiante
             tarea_id: ID de la tarea calificada
@@ -58,161 +68,75 @@ class RecommendationService:
         if nota >= self.umbral_nota:
             return []
         
-        # 1. Obtener conceptos asociados a la tarea
-        conceptos_ids = self._get_conceptos_from_tarea(tarea_id)
-        
-        if not conceptos_ids:
-            print(f"⚠️  La tarea {tarea_id} no tiene conceptos asociados. No se pueden generar recomendaciones.")
-            return []
-        
-        # 2. Buscar recursos que cubran esos conceptos
-        recursos = self._find_recursos_by_conceptos(conceptos_ids)
+        # 1. Candidatos ya filtrados, priorizados y limitados (una consulta)
+        recursos_finales = self._rank_recursos_candidatos(estudiante_id, tarea_id)
         
-        if not recursos:
-            print(f"⚠️  No se encontraron recursos para los conceptos de la tarea {tarea_id}.")
+        if not recursos_finales:
+            print(f"⚠️  No se encontraron recursos nuevos para los conceptos de la tarea {tarea_id}.")
             return []
         
-        # 3. Filtrar recursos ya recomendados para esta tarea (evitar duplicados)
-        recursos_filtrados = self._filter_existing_recommendations(
-            estudiante_id, tarea_id, recursos
+        # 2. Crear registros de recomendaciones (un INSERT multi-fila)
+        creadas = crud_recomendacion_estudiante.create_recomendaciones_bulk(
+            db=self.db,
+            estudiante_id=estudiante_id,
+            tarea_id=tarea_id,
+            recurso_ids=[recurso.id for recurso in recursos_finales]
         )
         
-        # 4. Priorizar recursos (por ahora, por número de conceptos coincidentes y nivel básico)
-        recursos_priorizados = self._priorize_recursos(recursos_filtrados, conceptos_ids)
-        
-        # 5. Limitar número de recomendaciones
-        recursos_finales = recursos_priorizados[:self.max_recomendaciones]
-        
-        # 6. Crear registros de recomendaciones
-        recomendaciones_creadas = []
-        for recurso in recursos_finales:
-            try:
-                recomendacion_in = RecomendacionEstudianteCreate(
-                    estudiante_id=estudiante_id,
-                    tarea_id=tarea_id,
-                    recurso_id=recurso.id
-                )
-                recomendacion = crud_recomendacion_estudiante.create_recomendacion(
-                    db=self.db,
-                    recomendacion_in=recomendacion_in
-                )
-                recomendaciones_creadas.append(recomendacion)
-            except Exception as e:
-                print(f"⚠️  Error al crear recomendación para recurso {recurso.id}: {e}")
-                # Continuar con los demás recursos
-        
-        print(f"✅ Generadas {len(recomendaciones_creadas)} recomendaciones para estudiante {estudiante_id} en tarea {tarea_id}")
+        print(f"✅ Generadas {creadas} recomendaciones para estudiante {estudiante_id} en tarea {tarea_id}")
         
         return recursos_finales
     
-    def _get_conceptos_from_tarea(self, tarea_id: int) -> List[int]:
-        """
-        Obtiene los IDs de los conceptos asociados a una tarea.
-        """
-        tarea_conceptos = self.db.query(TareaConcepto).filter(
-            TareaConcepto.tarea_id == tarea_id
-        ).all()
-        
-        return [tc.concepto_id for tc in tarea_conceptos]
-    
-    def _find_recursos_by_conceptos(self, conceptos_ids: List[int]) -> List[Recurso]:
-        """
-        Busca recursos que cubran al menos uno de los conceptos dados.
-        Solo retorna recursos activos.
-        """
-        # Buscar recursos que tengan al menos uno de los conceptos
-        recursos_conceptos = self.db.query(RecursoConcepto).join(Recurso).filter(
-            RecursoConcepto.concepto_id.in_(conceptos_ids),
-            Recurso.activo == True
-        ).distinct().all()
-        
-        # Obtener los IDs de recursos únicos
-        recurso_ids = list(set([rc.recurso_id for rc in recursos_conceptos]))
-        
-        # Obtener los objetos Recurso
-        recursos = self.db.query(Recurso).filter(
-            Recurso.id.in_(recurso_ids),
-            Recurso.activo == True
-        ).all()
-        
-        return recursos
-    
-    def _filter_existing_recommendations(
-        self,
-        estudiante_id: int,
-        tarea_id: int,
-        recursos: List[Recurso]
-    ) -> List[Recurso]:
-        """
-        Filtra recursos que ya fueron recomendados para esta tarea.
-        """
-        # Obtener recomendaciones existentes para esta tarea y estudiante
-        recomendaciones_existentes = self.db.query(RecomendacionEstudiante).filter(
-            RecomendacionEstudiante.estudiante_id == estudiante_id,
-            RecomendacionEstudiante.tarea_id == tarea_id
-        ).all()
-        
-        recurso_ids_recomendados = {rec.recurso_id for rec in recomendaciones_existentes}
-        
-        # Filtrar recursos ya recomendados
-        recursos_filtrados = [
-            r for r in recursos
-            if r.id not in recurso_ids_recomendados
-        ]
-        
-        return recursos_filtrados
-    
-    def _priorize_recursos(
-        self,
-        recursos: List[Recurso],
-        conceptos_ids: List[int]
-    ) -> List[Recurso]:
+    def _rank_recursos_candidatos(self, estudiante_id: int, tarea_id: int) -> List[Recurso]:
         """
-        Prioriza recursos según:
+        Obtiene los recursos activos que cubren conceptos de la tarea y que aún no fueron
+        recomendados al estudiante para esa tarea, priorizados según:
         1. Número de conceptos coincidentes (más es mejor)
         2. Nivel de dificultad (básico primero)
         3. Duración (más cortos primero)
         """
-        def calcular_score(recurso: Recurso) -> tuple:
-            # 1. Contar conceptos coincidentes
-            recursos_conceptos = self.db.query(RecursoConcepto).filter(
-                RecursoConcepto.recurso_id == recurso.id,
-                RecursoConcepto.concepto_id.in_(conceptos_ids)
-            ).all()
-            
-            num_conceptos = len(recursos_conceptos)
-            
-            # 2. Score por nivel de dificultad (básico = 3, intermedio = 2, avanzado = 1)
-            nivel_scores = {
-                "básico": 3,
-                "intermedio": 2,
-                "avanzado": 1
-            }
-            nivel_score = nivel_scores.get(recurso.nivel_dificultad, 0)
-            
-            # 3. Score por duración (más cortos = mejor, pero invertido para ordenar descendente)
-            # Si no tiene duración, usar 0 (se prioriza al final)
-            duracion_score = 1000 - (recurso.duracion_minutos or 0)
-            
-            # Score total: (conceptos, nivel, duración)
-            return (-num_conceptos, -nivel_score, -duracion_score)
-        
-        # Ordenar por score (tuplas se ordenan lexicográficamente)
-        recursos_ordenados = sorted(recursos, key=calcular_score)
+        num_conceptos = func.count(func.distinct(RecursoConcepto.concepto_id))
+        nivel_score = case(NIVEL_SCORES, value=Recurso.nivel_dificultad, else_=0)
+        ya_recomendado = exists().where(
+            RecomendacionEstudiante.estudiante_id == estudiante_id,
+            RecomendacionEstudiante.tarea_id == tarea_id,
+            RecomendacionEstudiante.recurso_id == Recurso.id
+        )
         
-        return recursos_ordenados
+        return self.db.query(Recurso).join(
+            RecursoConcepto, RecursoConcepto.recurso_id == Recurso.id
+        ).join(
+            TareaConcepto, TareaConcepto.concepto_id == RecursoConcepto.concepto_id
+        ).filter(
+            TareaConcepto.tarea_id == tarea_id,
+            Recurso.activo == True,
+            ~ya_recomendado
+        ).group_by(
+            Recurso.id
+        ).order_by(
+            num_conceptos.desc(),
+            nivel_score.desc(),
+            func.coalesce(Recurso.duracion_minutos, 0).asc(),
+            Recurso.id
+        ).limit(self.max_recomendaciones).all()
     
     def get_recommendations_for_student(
         self,
         estudiante_id: int,
-        solo_no_vistas: bool = False
+        solo_no_vistas: bool = False,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[RecomendacionEstudiante]:
         """
-        Obtiene todas las recomendaciones de un estudiante.
+        Obtiene las recomendaciones de un estudiante (paginadas, con recurso y tarea).
         """
         return crud_recomendacion_estudiante.get_recomendaciones_by_estudiante(
             db=self.db,
             estudiante_id=estudiante_id,
-            solo_no_vistas=solo_no_vistas
+            solo_no_vistas=solo_no_vistas,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
         )
 
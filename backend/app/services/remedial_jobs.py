@@ -0,0 +1,24 @@
+# backend/app/services/remedial_jobs.py
+"""
+Handlers de la cola de trabajos para el sistema de contenido remedial.
+Importar este módulo registra los handlers en app.services.job_queue.job_queue.
+"""
+from sqlalchemy.orm import Session
+
+from app.crud import crud_recomendacion_estudiante
+from app.services.job_queue import job_queue
+
+# Tipos de trabajo
+JOB_REMEDIAL_RECOMMENDATIONS = "remedial_recommendations"
+
+
+@job_queue.register(JOB_REMEDIAL_RECOMMENDATIONS)
+def run_remedial_recommendations(db: Session, payload: dict) -> None:
+    """
+    payload: {"submission_ids": [...]}
+    Recomienda los recursos de los conceptos de la tarea a cada entrega con nota baja.
+    """
+    crud_recomendacion_estudiante.create_remedial_recomendaciones(
+        db, submission_ids=payload["submission_ids"]
+    )
+
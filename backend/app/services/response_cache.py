@@ -0,0 +1,209 @@
+# backend/app/services/response_cache.py
+"""
+Caché de respuestas para catálogos que cambian poco (cursos, conceptos, recursos).
+
+Backends (CACHE_BACKEND):
+- "memory": TTLCache por proceso (LRU con TTL).
+- "redis": compartido entre workers y réplicas, requiere redis-py. Se le puede
+  pasar cualquier cliente compatible (por ejemplo fakeredis.FakeRedis()).
+- "none": sin caché.
+
+Invalidación por tags: cada entrada se guarda bajo una clave que incluye la
+versión actual de sus tags (p. ej. "courses", "users"). invalidate("courses")
+incrementa la versión del tag y todas las entradas que lo usaban dejan de
+encontrarse, sin recorrerlas; expiran solas con el TTL. Los CRUD de
+creación/actualización/eliminación llaman a invalidate() después del commit.
+
+La versión de los tags se lee antes de consultar la base de datos: si otra
+request invalida mientras tanto, el resultado se guarda con la versión vieja y
+nunca se sirve.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tags de invalidación
+TAG_COURSES = "courses"
+TAG_USERS = "users"  # Nombre y correo del propietario en las respuestas de cursos
+TAG_CONCEPTOS = "conceptos"
+TAG_RECURSOS = "recursos"
+TAG_CATEGORIAS_DOCENTE = "categorias_docente"  # Cursos -> tareas -> conceptos de cada docente
+
+
+class MemoryCacheBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self._datos = TTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self._versiones: Dict[str, int] = defaultdict(int)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._datos.get(key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._datos.set(key, value, ttl=ttl)
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._versiones[tag] for tag in tags]
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versiones[tag] += 1
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str = "", client: Any = None, prefix: str = "pai:cache:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BACKEND='redis' requiere redis (pip install redis)") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        valor = self.client.get(self.prefix + key)
+        return valor.decode() if isinstance(valor, bytes) else valor
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        if not tags:
+            return []
+        return [int(v or 0) for v in self.client.mget([f"{self.prefix}tag:{tag}" for tag in tags])]
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.incr(f"{self.prefix}tag:{tag}")
+        pipe.execute()
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+class ResponseCache:
+    """
+    Fachada sobre el backend: claves, serialización JSON, métricas y tolerancia a
+    fallos (si el backend falla, se consulta la base de datos como si no hubiera caché).
+    """
+
+    def __init__(self, backend, default_ttl: float):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._metricas: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "errors": 0})
+        self._invalidaciones: Dict[str, int] = defaultdict(int)
+
+    def _count(self, namespace: str, campo: str) -> None:
+        with self._lock:
+            self._metricas[namespace][campo] += 1
+
+    def _key(self, namespace: str, key: Any, tags: Sequence[str]) -> str:
+        versiones = self.backend.tag_versions(tags)
+        firma = json.dumps([key, list(tags), versiones], sort_keys=True, default=str)
+        return f"{namespace}:{hashlib.sha1(firma.encode()).hexdigest()}"
+
+    def get_or_set(self, namespace: str, key: Any, tags: Sequence[str], loader: Callable[[], Any],
+                   ttl: Optional[float] = None) -> Any:
+        """
+        Valor en caché o, si no está, el que retorna loader() (debe ser serializable a JSON).
+        """
+        if self.backend is None:
+            return loader()
+        try:
+            clave = self._key(namespace, key, tags)
+            guardado = self.backend.get(clave)
+        except Exception as e:
+            logger.warning("Caché no disponible (%s): %s", namespace, e)
+            self._count(namespace, "errors")
+            return loader()
+        if guardado is not None:
+            self._count(namespace, "hits")
+            return json.loads(guardado)
+
+        self._count(namespace, "misses")
+        valor = loader()
+        try:
+            self.backend.set(clave, json.dumps(valor, default=str), self.default_ttl if ttl is None else ttl)
+        except Exception as e:
+            logger.warning("No se pudo guardar en la caché (%s): %s", namespace, e)
+            self._count(namespace, "errors")
+        return valor
+
+    def cached_response(self, namespace: str, key: Any, tags: Sequence[str], response: Response,
+                        schema: Any, build: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Para endpoints: guarda la respuesta ya serializada con `schema` (el response_model)
+        junto con la cabecera X-Next-Cursor, y la restaura en los aciertos.
+        """
+        def loader():
+            datos = build()
+            return {
+                "data": _adapter(schema).dump_python(
+                    _adapter(schema).validate_python(datos, from_attributes=True), mode="json"
+                ),
+                "next_cursor": response.headers.get("X-Next-Cursor"),
+            }
+
+        entrada = self.get_or_set(namespace, key, tags, loader, ttl=ttl)
+        if entrada["next_cursor"]:
+            response.headers["X-Next-Cursor"] = entrada["next_cursor"]
+        return entrada["data"]
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalida todas las entradas que usan alguno de los tags."""
+        if self.backend is None or not tags:
+            return
+        try:
+            self.backend.bump_tags(tags)
+        except Exception as e:
+            # Sin poder invalidar, las entradas viejas se sirven hasta su TTL
+            logger.error("No se pudo invalidar la caché (tags %s): %s", tags, e)
+            return
+        with self._lock:
+            for tag in tags:
+                self._invalidaciones[tag] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {}
+            for ns, m in self._metricas.items():
+                consultas = m["hits"] + m["misses"]
+                namespaces[ns] = {**m, "hit_ratio": round(m["hits"] / consultas, 4) if consultas else 0.0}
+            return {
+                "backend": type(self.backend).__name__ if self.backend is not None else None,
+                "namespaces": namespaces,
+                "invalidations": dict(self._invalidaciones),
+            }
+
+
+def _build_backend():
+    backend = settings.CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+    if backend == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    if backend == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_DEFAULT_TTL_SECONDS)
+    raise ValueError(f"CACHE_BACKEND desconocido: {settings.CACHE_BACKEND!r} (usa 'memory', 'redis' o 'none')")
+
+
+response_cache = ResponseCache(_build_backend(), settings.CACHE_DEFAULT_TTL_SECONDS)
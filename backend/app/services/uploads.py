@@ -0,0 +1,111 @@
+# backend/app/services/uploads.py
+"""
+Guardado de archivos PDF subidos (entregas de tareas y exámenes).
+
+El archivo se copia por bloques a un temporal, sin bloquear el event loop,
+validando en el camino:
+- el tamaño máximo (MAX_UPLOAD_SIZE_MB), cortando apenas se supera;
+- la firma '%PDF' de los primeros bytes (no solo la extensión);
+- el SHA-256 del contenido, calculado mientras se escribe.
+Al terminar, app.services.blob_storage mueve el temporal de forma atómica a su
+ubicación definitiva, así que nunca queda un PDF a medio escribir a la vista.
+"""
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+PDF_MAGIC = b"%PDF"
+
+
+@dataclass
+class StoredUpload:
+    """Resultado de guardar un archivo subido."""
+    path: str
+    size: int
+    sha256: str
+
+
+def _max_upload_bytes() -> int:
+    return settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"El archivo supera el tamaño máximo de {max_bytes / (1024 * 1024):g} MB."
+    )
+
+
+def validate_pdf_filename(file: UploadFile, max_bytes: Optional[int] = None) -> None:
+    """Valida la extensión y, si se conoce, el tamaño declarado, antes de leer nada."""
+    max_bytes = max_bytes or _max_upload_bytes()
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Solo se permiten archivos PDF."
+        )
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+
+async def stream_pdf_to_temp(file: UploadFile, tmp_dir: Path, max_bytes: Optional[int] = None) -> StoredUpload:
+    """
+    Copia un PDF subido a un archivo temporal en tmp_dir, validándolo y calculando
+    su SHA-256. Retorna el temporal; quien llama debe moverlo o eliminarlo.
+    Lanza HTTPException 400 si no es un PDF y 413 si supera el tamaño máximo.
+    """
+    max_bytes = max_bytes or _max_upload_bytes()
+    validate_pdf_filename(file, max_bytes)
+
+    tmp_dir = Path(tmp_dir)
+    await run_in_threadpool(tmp_dir.mkdir, parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f".upload.{uuid.uuid4().hex}.part"
+
+    sha256 = hashlib.sha256()
+    size = 0
+    buffer = await run_in_threadpool(open, tmp_path, "wb")
+    try:
+        try:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(PDF_MAGIC):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="El archivo no es un PDF válido."
+                    )
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                sha256.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+        finally:
+            await run_in_threadpool(buffer.close)
+
+        if size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El archivo está vacío."
+            )
+    except BaseException:
+        await run_in_threadpool(remove_quietly, tmp_path)
+        raise
+
+    return StoredUpload(path=str(tmp_path), size=size, sha256=sha256.hexdigest())
+
+
+def remove_quietly(path) -> None:
+    """Elimina un archivo si existe."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,227 @@
+# backend/app/services/user_import.py
+"""
+Alta masiva de usuarios desde CSV o JSONL (ver import_users.py).
+
+El costo de importar está casi todo en bcrypt (~100-300 ms de CPU por
+contraseña), así que las filas se procesan por lotes y, en cada lote:
+
+1. se validan con el schema UserCreate y los largos de las columnas de users
+   (las inválidas se reportan y se omiten);
+2. se descartan los correos repetidos en el archivo y los ya registrados (una
+   consulta IN por lote), ANTES de hashear: no se gasta bcrypt en filas que no
+   se van a insertar;
+3. las contraseñas se hashean en paralelo en el executor recibido (un pool de
+   procesos, uno por núcleo);
+4. se insertan con un INSERT multi-fila ... ON CONFLICT DO NOTHING y un commit.
+
+Si la base de datos rechaza un lote, se revierte y sus filas se reportan como
+error; la importación sigue con el lote siguiente.
+
+Volver a importar el mismo archivo es seguro: los usuarios ya creados salen como
+"existente". Las contraseñas nunca se incluyen en los resultados.
+"""
+import io
+import json
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.crud import crud_user
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.csv_import import iter_csv_rows
+
+FORMATOS = ("csv", "jsonl")
+COLUMNAS = ("correo", "nombre_completo", "password", "rol")
+
+# Estados de una fila en los resultados
+CREADO = "creado"
+EXISTENTE = "existente"  # El correo ya estaba registrado
+DUPLICADO = "duplicado"  # El correo se repite en el archivo (cuenta la primera aparición)
+ERROR = "error"
+
+# Largo máximo de las columnas de texto que vienen del archivo (String(n) en el modelo)
+LARGOS_MAXIMOS = {
+    "correo": User.__table__.c.correo.type.length,
+    "nombre_completo": User.__table__.c.nombre_completo.type.length,
+}
+
+# (linea, datos): datos es un dict con COLUMNAS, o un str con el error de la línea
+FilaUsuario = Tuple[int, Union[Dict[str, Any], str]]
+
+
+@dataclass
+class ProgresoImportacion:
+    """Contadores de una importación, actualizados después de cada lote."""
+    procesadas: int = 0
+    creados: int = 0
+    existentes: int = 0
+    duplicados: int = 0
+    errores: int = 0
+    segundos: float = 0.0
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.procesadas / self.segundos if self.segundos else 0.0
+
+
+# ----------------- Lectura de filas -----------------
+def iter_user_rows(stream: BinaryIO, formato: str) -> Iterator[FilaUsuario]:
+    """
+    Filas de un archivo CSV (columnas COLUMNAS, encabezado opcional) o JSONL (un
+    objeto por línea), leídas en streaming.
+    """
+    if formato == "csv":
+        for linea, valores in iter_csv_rows(stream, COLUMNAS):
+            yield linea, dict(zip(COLUMNAS, valores))
+        return
+    if formato != "jsonl":
+        raise ValueError(f"Formato desconocido: {formato!r} (usa {', '.join(FORMATOS)})")
+
+    texto = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    try:
+        for linea, contenido in enumerate(texto, start=1):
+            if not contenido.strip():
+                continue
+            try:
+                datos = json.loads(contenido)
+            except json.JSONDecodeError as e:
+                yield linea, f"JSON inválido: {e.msg}"
+                continue
+            yield linea, datos if isinstance(datos, dict) else "Se esperaba un objeto JSON"
+    finally:
+        texto.detach()  # No cerrar el archivo de quien llama
+
+
+def _validar(datos: Dict[str, Any]) -> UserCreate:
+    """UserCreate de una fila; lanza ValueError con un mensaje legible si no es válida."""
+    datos = {campo: valor for campo, valor in datos.items() if valor not in (None, "")}
+    if "rol" in datos and isinstance(datos["rol"], str):
+        datos["rol"] = datos["rol"].strip().lower()
+    if not datos.get("password"):
+        raise ValueError("Falta la contraseña")
+    try:
+        usuario = UserCreate.model_validate(datos)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(parte) for parte in error['loc'])}: {error['msg']}" for error in e.errors()
+        ))
+    for campo, largo in LARGOS_MAXIMOS.items():
+        valor = getattr(usuario, campo)
+        if valor is not None and len(valor) > largo:
+            raise ValueError(f"{campo}: supera el máximo de {largo} caracteres")
+    return usuario
+
+
+# ----------------- Importación por lotes -----------------
+def import_users(
+    db: Session,
+    filas: Iterable[FilaUsuario],
+    executor: Executor,
+    batch_size: int = 1000,
+    on_resultado: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_progreso: Optional[Callable[[ProgresoImportacion], None]] = None
+) -> ProgresoImportacion:
+    """
+    Crea los usuarios de `filas` por lotes de batch_size, hasheando las contraseñas
+    en `executor`. Por cada fila llama a on_resultado con {linea, correo, estado,
+    id, detalle} (en el orden del archivo) y, después de cada lote, a on_progreso.
+    """
+    progreso = ProgresoImportacion()
+    vistos: Set[str] = set()  # Correos ya procesados en esta importación
+    inicio = time.perf_counter()
+    lote: List[FilaUsuario] = []
+
+    def procesar():
+        resultados = _import_batch(db, lote, executor, vistos)
+        for resultado in resultados:
+            if on_resultado is not None:
+                on_resultado(resultado)
+        progreso.procesadas += len(resultados)
+        progreso.creados += sum(r["estado"] == CREADO for r in resultados)
+        progreso.existentes += sum(r["estado"] == EXISTENTE for r in resultados)
+        progreso.duplicados += sum(r["estado"] == DUPLICADO for r in resultados)
+        progreso.errores += sum(r["estado"] == ERROR for r in resultados)
+        progreso.segundos = time.perf_counter() - inicio
+        if on_progreso is not None:
+            on_progreso(progreso)
+
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= batch_size:
+            procesar()
+            lote = []
+    if lote:
+        procesar()
+    return progreso
+
+
+def _import_batch(db: Session, lote: List[FilaUsuario], executor: Executor, vistos: Set[str]) -> List[Dict[str, Any]]:
+    resultados: Dict[int, Dict[str, Any]] = {}
+    validos: List[Tuple[int, UserCreate]] = []
+
+    def resultado(linea, correo, estado, user_id=None, detalle=""):
+        resultados[linea] = {"linea": linea, "correo": correo, "estado": estado, "id": user_id, "detalle": detalle}
+
+    # 1. Validar y descartar correos repetidos en el archivo
+    for linea, datos in lote:
+        if isinstance(datos, str):
+            resultado(linea, "", ERROR, detalle=datos)
+            continue
+        try:
+            usuario = _validar(datos)
+        except ValueError as e:
+            resultado(linea, str(datos.get("correo") or ""), ERROR, detalle=str(e))
+            continue
+        if usuario.correo in vistos:
+            resultado(linea, usuario.correo, DUPLICADO, detalle="Correo repetido en el archivo")
+            continue
+        vistos.add(usuario.correo)
+        validos.append((linea, usuario))
+
+    try:
+        # 2. Descartar los ya registrados (una consulta) antes de hashear
+        existentes = crud_user.get_existing_emails(db, (usuario.correo for _, usuario in validos))
+        nuevos = []
+        for linea, usuario in validos:
+            if usuario.correo in existentes:
+                resultado(linea, usuario.correo, EXISTENTE, detalle="El correo ya está registrado")
+            else:
+                nuevos.append((linea, usuario))
+
+        # 3. Hashear en paralelo e insertar
+        hashes = executor.map(get_password_hash, [usuario.password for _, usuario in nuevos], chunksize=8)
+        creados = crud_user.bulk_create_users(db, [
+            {
+                "correo": usuario.correo,
+                "nombre_completo": usuario.nombre_completo,
+                "contraseña_hash": contraseña_hash,
+                "rol": usuario.rol,
+                "activo": True,
+            }
+            for (_, usuario), contraseña_hash in zip(nuevos, hashes)
+        ])
+    except SQLAlchemyError as e:
+        # Se revierte el lote completo; las filas pendientes se reportan con el error
+        db.rollback()
+        detalle = " ".join(f"Error de base de datos en el lote: {type(e).__name__}: {getattr(e, 'orig', None) or e}".split())
+        for linea, usuario in validos:
+            if linea not in resultados:
+                vistos.discard(usuario.correo)  # Una aparición posterior en el archivo puede crearlo
+                resultado(linea, usuario.correo, ERROR, detalle=detalle)
+        return [resultados[linea] for linea in sorted(resultados)]
+
+    for linea, usuario in nuevos:
+        if usuario.correo in creados:
+            resultado(linea, usuario.correo, CREADO, user_id=creados[usuario.correo])
+        else:
+            # Lo registró otro proceso entre la consulta y el INSERT
+            resultado(linea, usuario.correo, EXISTENTE, detalle="El correo ya está registrado")
+
+    return [resultados[linea] for linea in sorted(resultados)]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark de concurrencia para los endpoints más usados de la API.
+
+Lanza muchas peticiones simultáneas contra un servidor en ejecución y mide
+throughput (req/s) y latencias (p50/p95/p99). Sirve para comparar el antes y
+el después de pasar un endpoint a la sesión async: ejecutar el mismo comando
+contra cada versión del servidor (con un solo worker de uvicorn) y comparar.
+
+Ejemplos:
+    python benchmark_concurrency.py --token $TOKEN --path /submissions/task/1
+    python benchmark_concurrency.py --token $TOKEN --path /submissions/task/1/my-submission -c 100 -n 2000
+    python benchmark_concurrency.py --token $TOKEN --path /tasks/1/submit --method POST --form content="respuesta"
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[idx]
+
+
+async def _worker(client, args, cola, latencias, estados):
+    while True:
+        try:
+            cola.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        inicio = time.perf_counter()
+        try:
+            response = await client.request(args.method, args.path, data=args.form or None)
+            estados[response.status_code] = estados.get(response.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            estados[type(e).__name__] = estados.get(type(e).__name__, 0) + 1
+        latencias.append(time.perf_counter() - inicio)
+
+
+async def run_benchmark(args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    cola = asyncio.Queue()
+    for _ in range(args.requests):
+        cola.put_nowait(None)
+
+    latencias = []
+    estados = {}
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=args.timeout) as client:
+        # Calentamiento: abre conexiones y llena los pools antes de medir
+        await asyncio.gather(*(client.request(args.method, args.path, data=args.form or None) for _ in range(min(args.concurrency, 10))), return_exceptions=True)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(_worker(client, args, cola, latencias, estados) for _ in range(args.concurrency)))
+        total = time.perf_counter() - inicio
+
+    print(f"\n📊 {args.method} {args.url}{args.path}")
+    print(f"   Concurrencia: {args.concurrency} | Peticiones: {args.requests}")
+    print("=" * 60)
+    print(f"   Tiempo total:  {total:.2f} s")
+    print(f"   Throughput:    {len(latencias) / total:.1f} req/s")
+    print(f"   Latencia p50:  {_percentil(latencias, 50) * 1000:.1f} ms")
+    print(f"   Latencia p95:  {_percentil(latencias, 95) * 1000:.1f} ms")
+    print(f"   Latencia p99:  {_percentil(latencias, 99) * 1000:.1f} ms")
+    print(f"   Latencia media: {statistics.mean(latencias) * 1000:.1f} ms")
+    print(f"   Respuestas:    {estados}")
+    return estados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de concurrencia para la API de PAI")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base del servidor")
+    parser.add_argument("--path", required=True, help="Ruta del endpoint, ej. /submissions/task/1")
+    parser.add_argument("--method", default="GET", help="Método HTTP")
+    parser.add_argument("--token", default=None, help="JWT (Bearer) del usuario con el que se prueba")
+    parser.add_argument("--form", nargs="*", default=[], help="Campos de formulario clave=valor (para POST)")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="Peticiones simultáneas")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="Total de peticiones")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout por petición (segundos)")
+    args = parser.parse_args()
+    args.form = dict(campo.split("=", 1) for campo in args.form)
+
+    estados = asyncio.run(run_benchmark(args))
+    errores = sum(cantidad for estado, cantidad in estados.items() if not (isinstance(estado, int) and estado < 500))
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark de inicio de sesión (POST /login/access-token).
+
+Simula la ráfaga de logins al comienzo de una clase: para cada nivel de
+concurrencia lanza N logins con credenciales válidas contra un servidor en
+ejecución y reporta logins/s y latencias p50/p99. Las respuestas 503 son
+logins rechazados porque el pool de hash estaba saturado (PASSWORD_HASH_MAX_PENDING).
+
+Ejemplos:
+    python benchmark_login.py --email docente@pai.cl --password secreto
+    python benchmark_login.py --email docente@pai.cl --password secreto -c 1 8 32 128 -n 200
+    # Comparar costos de bcrypt: reiniciar el servidor con otro PASSWORD_BCRYPT_ROUNDS
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmark_concurrency import _percentil
+
+
+async def _login(client, args, latencias, estados):
+    inicio = time.perf_counter()
+    try:
+        response = await client.post(
+            "/login/access-token", data={"username": args.email, "password": args.password}
+        )
+        estados[response.status_code] = estados.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            latencias.append(time.perf_counter() - inicio)
+    except httpx.HTTPError as e:
+        estados[type(e).__name__] = estados.get(type(e).__name__, 0) + 1
+
+
+async def run_level(args, concurrencia: int):
+    limits = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    latencias, estados = [], {}
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def limitado():
+            async with semaforo:
+                await _login(client, args, latencias, estados)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(limitado() for _ in range(args.requests)))
+        total = time.perf_counter() - inicio
+    return {
+        "concurrencia": concurrencia,
+        "logins_s": len(latencias) / total,
+        "p50": _percentil(latencias, 50),
+        "p99": _percentil(latencias, 99),
+        "estados": estados,
+    }
+
+
+async def run_benchmark(args):
+    # Un login previo: verifica las credenciales y re-hashea si cambió el costo
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        response = await client.post("/login/access-token", data={"username": args.email, "password": args.password})
+        if response.status_code != 200:
+            print(f"❌ El login de prueba falló ({response.status_code}): {response.text}")
+            return None
+
+    print(f"\n📊 POST {args.url}/login/access-token ({args.requests} logins por nivel)")
+    print("=" * 72)
+    print(f"{'concurrencia':>12} {'logins/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}   respuestas")
+    resultados = []
+    for concurrencia in args.concurrency:
+        r = await run_level(args, concurrencia)
+        resultados.append(r)
+        print(f"{r['concurrencia']:>12} {r['logins_s']:>10.1f} {r['p50'] * 1000:>10.1f} {r['p99'] * 1000:>10.1f}   {r['estados']}")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicio de sesión para la API de PAI")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base del servidor")
+    parser.add_argument("--email", required=True, help="Correo de un usuario existente")
+    parser.add_argument("--password", required=True, help="Contraseña de ese usuario")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 8, 32, 64], help="Niveles de concurrencia")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="Logins por nivel")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout por petición (segundos)")
+    args = parser.parse_args()
+
+    resultados = asyncio.run(run_benchmark(args))
+    if resultados is None:
+        sys.exit(1)
+    # 503 es el rechazo esperado por saturación; cualquier otro error hace fallar el benchmark
+    errores = sum(
+        cantidad for r in resultados for estado, cantidad in r["estados"].items()
+        if not isinstance(estado, int) or (estado >= 500 and estado != 503)
+    )
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main()
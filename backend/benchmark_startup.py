@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark del arranque de la API.
+
+Mide, en procesos nuevos (como un worker recién levantado por un autoscale):
+- el tiempo de importar app.main;
+- el tiempo hasta que uvicorn responde el primer request (GET /);
+- la latencia del primer request que consulta la base de datos (por defecto un
+  login con credenciales inexistentes) y la de los siguientes.
+
+Ejemplos (con DATABASE_URL apuntando a una base migrada):
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 5 --port 8010
+    DB_WARMUP_ON_STARTUP=false python benchmark_startup.py   # sin calentamiento, para comparar
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import_time() -> float:
+    codigo = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return float(salida.stdout.strip().splitlines()[-1])
+
+
+def _db_request(client: httpx.Client) -> float:
+    inicio = time.perf_counter()
+    client.post("/login/access-token", data={"username": "benchmark@inexistente.cl", "password": "x"})
+    return time.perf_counter() - inicio
+
+
+def measure_first_request(port: int, timeout: float, repeticiones: int) -> dict:
+    inicio = time.perf_counter()
+    servidor = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            while True:
+                if servidor.poll() is not None:
+                    raise RuntimeError("uvicorn terminó antes de responder")
+                if time.perf_counter() - inicio > timeout:
+                    raise RuntimeError(f"Sin respuesta después de {timeout:.0f} s")
+                try:
+                    client.get("/")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.02)
+            primera_respuesta = time.perf_counter() - inicio
+            primera_db = _db_request(client)
+            siguientes = [_db_request(client) for _ in range(repeticiones)]
+    finally:
+        servidor.terminate()
+        servidor.wait(timeout=10)
+    return {
+        "primera_respuesta": primera_respuesta,
+        "primera_db": primera_db,
+        "siguientes_db": statistics.median(siguientes) if siguientes else 0.0,
+    }
+
+
+def _ms(segundos: float) -> str:
+    return f"{segundos * 1000:8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del arranque de la API de PAI")
+    parser.add_argument("--runs", type=int, default=3, help="Arranques a medir")
+    parser.add_argument("--port", type=int, default=8010, help="Puerto para el uvicorn de prueba")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Tiempo máximo de arranque (segundos)")
+    parser.add_argument("--repeat", type=int, default=5, help="Requests a la BD después del primero")
+    args = parser.parse_args()
+
+    importaciones, arranques = [], []
+    for i in range(args.runs):
+        importaciones.append(measure_import_time())
+        arranques.append(measure_first_request(args.port, args.timeout, args.repeat))
+        print(f"Arranque {i + 1}/{args.runs}: import {_ms(importaciones[-1])} | "
+              f"primer request {_ms(arranques[-1]['primera_respuesta'])} | "
+              f"primera consulta a la BD {_ms(arranques[-1]['primera_db'])}")
+
+    print("\nMedianas")
+    print(f"  import app.main:              {_ms(statistics.median(importaciones))}")
+    print(f"  hasta el primer request:      {_ms(statistics.median(a['primera_respuesta'] for a in arranques))}")
+    print(f"  primer request con BD:        {_ms(statistics.median(a['primera_db'] for a in arranques))}")
+    print(f"  requests con BD siguientes:   {_ms(statistics.median(a['siguientes_db'] for a in arranques))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Script para verificar que las consultas más frecuentes usan índices.
+
+Ejecuta EXPLAIN sobre cada consulta de app.db.query_plans.hot_queries() y falla
+si alguna hace un Seq Scan (con enable_seqscan desactivado). Es la misma
+verificación de tests/test_query_plans.py, contra la base de DATABASE_URL.
+
+Uso (con DATABASE_URL apuntando a una base ya migrada):
+    python check_query_plans.py
+"""
+import os
+import sys
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.db.query_plans import hot_queries, seq_scans
+
+
+def check_query_plans() -> bool:
+    print("🔍 Verificando planes de ejecución de las consultas frecuentes...\n")
+    fallidas = []
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for nombre, stmt in hot_queries():
+            tablas = seq_scans(conn, stmt)
+            if tablas:
+                fallidas.append(nombre)
+                print(f"  ❌ {nombre}: Seq Scan sobre {', '.join(tablas)}")
+            else:
+                print(f"  ✅ {nombre}")
+        conn.rollback()
+
+    if fallidas:
+        print(f"\n❌ {len(fallidas)} consulta(s) sin índice. ¿Faltan migraciones? (python init_db.py)")
+        return False
+    print("\n✅ Todas las consultas frecuentes usan índices")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_query_plans() else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Mantenimiento del índice materializado docente_categorias.
+
+- backfill: reconstruye el índice completo desde cursos, tareas y conceptos
+  (después de cargas con SQL directo o si el chequeo encuentra diferencias).
+- check: compara el índice con el JOIN completo; sale con código 1 si no
+  coinciden (para cron o CI). Con --fix hace el backfill al encontrar diferencias.
+
+Uso (con DATABASE_URL apuntando a una base ya migrada):
+    python docente_categorias.py backfill
+    python docente_categorias.py check [--fix]
+"""
+import argparse
+import os
+import sys
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.crud.crud_docente_categoria import backfill_docente_categorias, find_inconsistencies
+from app.db.session import SessionLocal
+from app.services.response_cache import TAG_CATEGORIAS_DOCENTE, response_cache
+
+
+def backfill() -> bool:
+    db = SessionLocal()
+    try:
+        filas = backfill_docente_categorias(db)
+    finally:
+        db.close()
+    response_cache.invalidate(TAG_CATEGORIAS_DOCENTE)
+    print(f"✅ Índice docente_categorias reconstruido: {filas} fila(s)")
+    return True
+
+
+def check(fix: bool = False, max_mostrar: int = 20) -> bool:
+    print("🔍 Comparando docente_categorias con cursos, tareas y conceptos...")
+    db = SessionLocal()
+    try:
+        diferencias = find_inconsistencies(db)
+    finally:
+        db.close()
+
+    faltantes, sobrantes = diferencias["faltantes"], diferencias["sobrantes"]
+    if not faltantes and not sobrantes:
+        print("✅ El índice está al día")
+        return True
+
+    for titulo, pares in (("Faltan", faltantes), ("Sobran", sobrantes)):
+        if pares:
+            print(f"  ❌ {titulo} {len(pares)} fila(s) (docente_id, categoria):")
+            for par in pares[:max_mostrar]:
+                print(f"     {par}")
+            if len(pares) > max_mostrar:
+                print(f"     ... y {len(pares) - max_mostrar} más")
+
+    if fix:
+        return backfill() and check(fix=False, max_mostrar=max_mostrar)
+    print("\n💡 Ejecuta 'python docente_categorias.py backfill' (o check --fix) para corregirlo")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento del índice docente -> categorías de conceptos")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    subparsers.add_parser("backfill", help="Reconstruye el índice completo")
+    parser_check = subparsers.add_parser("check", help="Verifica que el índice coincida con los datos")
+    parser_check.add_argument("--fix", action="store_true", help="Reconstruye el índice si hay diferencias")
+    args = parser.parse_args()
+
+    if args.comando == "backfill":
+        ok = backfill()
+    else:
+        ok = check(fix=args.fix)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
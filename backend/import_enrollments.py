@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Inscripción masiva de estudiantes desde un CSV (correo,course_id).
+
+Lee el archivo en streaming y lo procesa por tramos (una consulta IN de usuarios,
+una de cursos y un INSERT ... ON CONFLICT DO NOTHING por tramo, con su commit).
+Las inscripciones que ya existen se omiten, así que se puede volver a correr
+con el mismo archivo. Sale con código 1 si alguna fila tuvo errores.
+
+Uso (con DATABASE_URL apuntando a una base ya migrada):
+    python import_enrollments.py inscripciones.csv [--chunk-size 5000] [--errores errores.csv]
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.crud.crud_enrollment import bulk_create_enrollments
+from app.db.session import SessionLocal
+from app.services.csv_import import iter_csv_rows
+
+
+def importar(ruta: str, chunk_size: int, ruta_errores: str = None, max_mostrar: int = 20) -> bool:
+    print(f"📥 Importando inscripciones desde {ruta}...")
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with open(ruta, "rb") as archivo:
+            filas = ((linea, correo, course_id) for linea, (correo, course_id) in iter_csv_rows(archivo, ("correo", "course_id")))
+            resultado = bulk_create_enrollments(db, filas, chunk_size=chunk_size)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"❌ No se pudo leer el archivo: {e}")
+        return False
+    finally:
+        db.close()
+    duracion = time.perf_counter() - inicio
+
+    print(f"✅ {resultado['procesadas']} fila(s) en {duracion:.1f}s "
+          f"({resultado['procesadas'] / duracion if duracion else 0:.0f} filas/s)")
+    print(f"   Inscritas: {resultado['inscritas']}")
+    print(f"   Ya inscritas (omitidas): {resultado['ya_inscritas']}")
+
+    errores = resultado["errores"]
+    if not errores:
+        return True
+    print(f"  ❌ {len(errores)} fila(s) con errores:")
+    for error in errores[:max_mostrar]:
+        print(f"     línea {error['linea']}: {error['correo']},{error['course_id']} -> {error['error']}")
+    if len(errores) > max_mostrar:
+        print(f"     ... y {len(errores) - max_mostrar} más")
+    if ruta_errores:
+        with open(ruta_errores, "w", newline="", encoding="utf-8") as salida:
+            escritor = csv.DictWriter(salida, fieldnames=["linea", "correo", "course_id", "error"])
+            escritor.writeheader()
+            escritor.writerows(errores)
+        print(f"   Detalle de errores en {ruta_errores}")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inscribe estudiantes en cursos desde un CSV (correo,course_id)")
+    parser.add_argument("archivo", help="CSV con columnas correo,course_id (encabezado opcional)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Filas por consulta y commit")
+    parser.add_argument("--errores", help="Escribe las filas con errores en este CSV")
+    args = parser.parse_args()
+
+    ok = importar(args.archivo, args.chunk_size, ruta_errores=args.errores)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Alta masiva de usuarios desde un archivo CSV o JSONL.
+
+Columnas (CSV, encabezado opcional) o claves (JSONL, un objeto por línea):
+    correo, nombre_completo, password, rol (estudiante por defecto)
+
+Las contraseñas se hashean con bcrypt en un pool de procesos (uno por núcleo por
+defecto); los correos ya registrados se descartan antes de hashear y los
+usuarios se insertan por lotes. Los correos existentes se omiten, así que se
+puede volver a correr con el mismo archivo. Mientras corre muestra el avance y
+las filas por segundo; al final, cada fila queda en el archivo de resultados
+(linea, correo, estado, id, detalle). Sale con código 1 si alguna fila tuvo errores.
+
+Uso (con DATABASE_URL apuntando a una base ya migrada):
+    python import_users.py usuarios.csv [--resultados resultados.csv] [--workers 8] [--batch-size 1000]
+    python import_users.py usuarios.jsonl
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.services.user_import import FORMATOS, ProgresoImportacion, import_users, iter_user_rows
+
+
+def mostrar_progreso(progreso: ProgresoImportacion) -> None:
+    print(f"   {progreso.procesadas} fila(s) · {progreso.creados} creados · {progreso.existentes} existentes · "
+          f"{progreso.errores} errores · {progreso.filas_por_segundo:.0f} filas/s", flush=True)
+
+
+def importar(ruta: str, formato: str, ruta_resultados: str, workers: int, batch_size: int) -> bool:
+    print(f"📥 Importando usuarios desde {ruta} ({formato}, {workers} proceso(s) de hash)...")
+    # El pool se crea antes de abrir conexiones a la base de datos: los procesos no las heredan
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            open(ruta, "rb") as archivo, \
+            open(ruta_resultados, "w", newline="", encoding="utf-8") as salida:
+        escritor = csv.DictWriter(salida, fieldnames=["linea", "correo", "estado", "id", "detalle"])
+        escritor.writeheader()
+        db = SessionLocal()
+        try:
+            progreso = import_users(
+                db, iter_user_rows(archivo, formato), executor, batch_size=batch_size,
+                on_resultado=escritor.writerow, on_progreso=mostrar_progreso
+            )
+        except (UnicodeDecodeError, csv.Error) as e:
+            print(f"❌ No se pudo leer el archivo: {e} (los lotes anteriores ya quedaron guardados)")
+            return False
+        finally:
+            db.close()
+
+    print(f"✅ {progreso.procesadas} fila(s) en {progreso.segundos:.1f}s ({progreso.filas_por_segundo:.0f} filas/s)")
+    print(f"   Creados: {progreso.creados}")
+    print(f"   Ya registrados (omitidos): {progreso.existentes}")
+    print(f"   Repetidos en el archivo (omitidos): {progreso.duplicados}")
+    print(f"   Errores: {progreso.errores}")
+    print(f"   Resultados por fila en {ruta_resultados}")
+    return progreso.errores == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea usuarios desde un archivo CSV o JSONL")
+    parser.add_argument("archivo", help="CSV (correo,nombre_completo,password,rol) o JSONL")
+    parser.add_argument("--formato", choices=FORMATOS, help="Por defecto, según la extensión del archivo")
+    parser.add_argument("--resultados", help="CSV de resultados (por defecto, <archivo>.resultados.csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos para hashear contraseñas")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote (consulta, hash e INSERT)")
+    args = parser.parse_args()
+
+    if not Path(args.archivo).is_file():
+        print(f"❌ No existe el archivo {args.archivo}")
+        sys.exit(1)
+    formato = args.formato or ("jsonl" if Path(args.archivo).suffix.lower() in (".jsonl", ".ndjson") else "csv")
+    ruta_resultados = args.resultados or f"{args.archivo}.resultados.csv"
+
+    ok = importar(args.archivo, formato, ruta_resultados, max(1, args.workers), max(1, args.batch_size))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
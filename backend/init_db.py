@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 """
 Script para inicializar la base de datos en producción.
-Ejecuta este script después de desplegar en Railway para crear las tablas.
+Aplica las migraciones pendientes (Alembic); los scripts de arranque lo ejecutan
+antes de levantar la API. Es seguro ejecutarlo varias veces.
 """
 import os
 import sys
@@ -9,18 +10,17 @@ import sys
 # Agregar el directorio actual al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.db.session import engine
-from app.db.base import Base
+from app.db.migrations import upgrade_database
 
 def init_database():
-    """Crea todas las tablas en la base de datos."""
+    """Aplica las migraciones pendientes a la base de datos."""
     try:
-        print("🔄 Creando tablas en la base de datos...")
-        Base.metadata.create_all(bind=engine)
-        print("✅ ¡Tablas creadas exitosamente!")
+        print("🔄 Aplicando migraciones de la base de datos...")
+        upgrade_database()
+        print("✅ ¡Base de datos al día!")
         return True
     except Exception as e:
-        print(f"❌ Error al crear tablas: {e}")
+        print(f"❌ Error al aplicar las migraciones: {e}")
         import traceback
         traceback.print_exc()
         return False
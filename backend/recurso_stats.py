@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Mantenimiento del resumen recurso_stats (interacciones por recurso).
+
+- rebuild: recalcula el resumen desde interacciones_recursos por tramos de
+  recursos (un commit por tramo; se puede correr con la aplicación en marcha).
+- check: compara el resumen con la agregación; sale con código 1 si hay
+  diferencias (para cron o CI). Con --fix recalcula solo los recursos con diferencias.
+
+Uso (con DATABASE_URL apuntando a una base ya migrada):
+    python recurso_stats.py rebuild [--chunk-size 1000]
+    python recurso_stats.py check [--fix]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Agregar el directorio actual al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.crud.crud_recurso_stats import find_drift, rebuild_recurso_stats
+from app.db.session import SessionLocal
+
+
+def rebuild(chunk_size: int, recurso_ids=None) -> bool:
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        procesados = rebuild_recurso_stats(db, chunk_size=chunk_size, recurso_ids=recurso_ids)
+    finally:
+        db.close()
+    print(f"✅ recurso_stats recalculado: {procesados} recurso(s) en {time.perf_counter() - inicio:.1f}s")
+    return True
+
+
+def check(chunk_size: int, fix: bool = False, max_mostrar: int = 20) -> bool:
+    print("🔍 Comparando recurso_stats con interacciones_recursos...")
+    db = SessionLocal()
+    try:
+        diferencias = find_drift(db, chunk_size=chunk_size)
+    finally:
+        db.close()
+
+    if not diferencias:
+        print("✅ El resumen está al día")
+        return True
+
+    print(f"  ❌ {len(diferencias)} recurso(s) con diferencias:")
+    for recurso_id, guardado, calculado in diferencias[:max_mostrar]:
+        campos = [f"{campo}: {guardado[campo]} -> {calculado[campo]}" for campo in calculado if guardado[campo] != calculado[campo]]
+        print(f"     recurso {recurso_id}: {', '.join(campos)}")
+    if len(diferencias) > max_mostrar:
+        print(f"     ... y {len(diferencias) - max_mostrar} más")
+
+    if fix:
+        rebuild(chunk_size, recurso_ids=[recurso_id for recurso_id, _, _ in diferencias])
+        return check(chunk_size, fix=False, max_mostrar=max_mostrar)
+    print("\n💡 Ejecuta 'python recurso_stats.py rebuild' (o check --fix) para corregirlo")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento del resumen de interacciones por recurso")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Recursos por tramo")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    subparsers.add_parser("rebuild", help="Recalcula el resumen completo")
+    parser_check = subparsers.add_parser("check", help="Verifica que el resumen coincida con las interacciones")
+    parser_check.add_argument("--fix", action="store_true", help="Recalcula los recursos con diferencias")
+    args = parser.parse_args()
+
+    if args.comando == "rebuild":
+        ok = rebuild(args.chunk_size)
+    else:
+        ok = check(args.chunk_size, fix=args.fix)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Script de inicio para Railway.
 Lee el puerto desde la variable de entorno PORT que Railway proporciona automáticamente.
 """
 import os
+import subprocess
 import sys
 
 # Obtener el puerto desde la variable de entorno PORT (Railway lo proporciona)
@@ -11,6 +12,9 @@ port = int(os.environ.get("PORT", 8000))
 
 # Ejecutar uvicorn con el puerto correcto
 if __name__ == "__main__":
+    # Aplicar las migraciones pendientes de la base de datos
+    subprocess.run([sys.executable, "init_db.py"], check=True)
+
     os.execvp(
         "uvicorn",
         [
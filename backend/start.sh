@@ -5,6 +5,9 @@
 # Si PORT no está definido, usa 8000 por defecto
 PORT=${PORT:-8000}
 
+# Aplicar las migraciones pendientes de la base de datos
+python init_db.py || exit 1
+
 # Ejecutar uvicorn con el puerto correcto
 exec uvicorn app.main:app --host 0.0.0.0 --port $PORT
 
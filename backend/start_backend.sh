@@ -25,6 +25,9 @@ if [ -f "requirements.txt" ]; then
     pip install -q -r requirements.txt
 fi
 
+# Aplicar las migraciones pendientes de la base de datos
+python init_db.py || exit 1
+
 # Iniciar el servidor
 echo "🚀 Iniciando backend en http://localhost:8000"
 echo "📚 Documentación disponible en http://localhost:8000/docs"
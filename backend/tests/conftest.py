@@ -0,0 +1,53 @@
+# backend/tests/conftest.py
+"""
+Fixtures compartidas por los tests que usan PostgreSQL.
+
+Necesitan un servidor en TEST_DATABASE_URL con permiso para crear bases de
+datos: cada módulo de tests crea una temporal y la borra al terminar. Sin esa
+variable, los tests que las usan se omiten:
+    TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest
+"""
+import os
+import uuid
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.db.migrations import alembic_config
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="module")
+def empty_database_url():
+    """URL de una base de datos nueva y vacía, que se borra al terminar el módulo."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL no está definida")
+    admin_url = make_url(TEST_DATABASE_URL)
+    nombre = f"pai_test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(admin_url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        connection.execute(text(f"CREATE DATABASE {nombre} ENCODING 'UTF8' TEMPLATE template0"))
+    try:
+        yield admin_url.set(database=nombre)
+    finally:
+        with admin.connect() as connection:
+            connection.execute(text(f"DROP DATABASE IF EXISTS {nombre} WITH (FORCE)"))
+        admin.dispose()
+
+
+@pytest.fixture(scope="module")
+def migrated_database_url(empty_database_url):
+    """Como empty_database_url, pero ya migrada a la última revisión (alembic upgrade head)."""
+    engine = create_engine(empty_database_url)
+    try:
+        with engine.connect() as connection:
+            config = alembic_config()
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+            connection.commit()
+    finally:
+        engine.dispose()
+    return empty_database_url
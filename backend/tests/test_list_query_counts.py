@@ -0,0 +1,175 @@
+# backend/tests/test_list_query_counts.py
+"""
+Los listados que enriquecen cada fila con su usuario (propietario, autor,
+estudiante) lo resuelven con una sola consulta IN: el número de sentencias SQL
+de un request es el mismo con 1 fila que con N (sin N+1).
+
+Necesita un PostgreSQL en TEST_DATABASE_URL (ver conftest.py); sin esa variable
+se omite.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.security import access_token_claims, create_access_token
+from app.db.session import _async_database_url, get_async_db, get_db
+from app.main import app
+from app.models.announcement import Announcement
+from app.models.comment import Comment
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.exam import Exam, ExamSubmission
+from app.models.submission import Submission
+from app.models.task import Task
+from app.models.user import User, UserRole
+from app.services import auth_cache
+from app.services.response_cache import response_cache
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL no está definida")
+
+N = 5  # Filas del listado "grande"
+
+# (nombre, usuario que consulta, ruta): la ruta se completa con los IDs de _poblar
+LISTADOS = [
+    ("cursos", "admin", "/courses/"),
+    ("cursos del docente", "docente", "/courses/me"),
+    ("cursos disponibles", "estudiante", "/courses/available"),
+    ("cursos inscritos", "estudiante", "/enrollments/me/courses"),
+    ("comunicados de un curso", "docente", "/announcements/course/{curso_id}"),
+    ("comentarios de un comunicado", "docente", "/announcements/{anuncio_id}/comments"),
+    ("entregas de una tarea", "docente", "/submissions/task/{tarea_id}"),
+    ("entregas de un examen", "docente", settings.API_V1_STR + "/exams/{examen_id}/submissions"),
+]
+
+
+@pytest.fixture(scope="module")
+def entorno(migrated_database_url):
+    """
+    App apuntando a la base de datos de prueba (sesiones sync y async), sin caché
+    de respuestas, y un contador de las sentencias que ejecutan ambos engines.
+    """
+    engine = create_engine(migrated_database_url)
+    async_url, connect_args = _async_database_url(migrated_database_url.render_as_string(hide_password=False))
+    # Sin pool: cada request de TestClient corre en su propio event loop
+    async_engine = create_async_engine(async_url, connect_args=connect_args, poolclass=NullPool)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    AsyncSessionTest = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    def get_db_test():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db_test():
+        async with AsyncSessionTest() as db:
+            yield db
+
+    sentencias = []
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", contar)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", contar)
+    app.dependency_overrides[get_db] = get_db_test
+    app.dependency_overrides[get_async_db] = get_async_db_test
+    backend_cache, response_cache.backend = response_cache.backend, None
+    try:
+        yield TestClient(app), engine, Session, sentencias
+    finally:
+        response_cache.backend = backend_cache
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+        engine.dispose()
+        # El engine async se creó sin pool: no quedan conexiones abiertas
+
+
+def _poblar(engine, Session, n: int) -> dict:
+    """
+    Deja en la base de datos n filas por listado, cada una de un usuario distinto.
+    Retorna los IDs para las rutas y los tokens de cada usuario que consulta.
+    """
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE users RESTART IDENTITY CASCADE"))
+    auth_cache.token_cache.clear()
+    auth_cache.user_cache.clear()
+
+    db = Session()
+    try:
+        def usuario(correo, rol):
+            user = User(correo=correo, nombre_completo=correo, contraseña_hash="x", rol=rol, activo=True)
+            db.add(user)
+            return user
+
+        admin = usuario("admin@test.cl", UserRole.ADMINISTRADOR)
+        docente = usuario("docente@test.cl", UserRole.DOCENTE)
+        estudiante = usuario("estudiante@test.cl", UserRole.ESTUDIANTE)
+        docentes = [usuario(f"docente{i}@test.cl", UserRole.DOCENTE) for i in range(n)]
+        estudiantes = [usuario(f"estudiante{i}@test.cl", UserRole.ESTUDIANTE) for i in range(n)]
+        db.flush()
+
+        propios = [Course(titulo=f"Propio {i}", propietario_id=docente.id) for i in range(n)]
+        inscritos = [Course(titulo=f"Inscrito {i}", propietario_id=otro.id) for i, otro in enumerate(docentes)]
+        disponibles = [Course(titulo=f"Disponible {i}", propietario_id=otro.id) for i, otro in enumerate(docentes)]
+        db.add_all(propios + inscritos + disponibles)
+        db.flush()
+        curso = propios[0]
+        db.add_all(Enrollment(estudiante_id=estudiante.id, curso_id=c.id) for c in inscritos + propios)
+
+        anuncios = [
+            Announcement(curso_id=curso.id, autor_id=otro.id, titulo=f"Anuncio {i}", contenido="...")
+            for i, otro in enumerate(docentes)
+        ]
+        tarea = Task(curso_id=curso.id, titulo="Tarea", fecha_limite=datetime.now(timezone.utc) + timedelta(days=7))
+        examen = Exam(curso_id=curso.id, titulo="Examen")
+        db.add_all(anuncios + [tarea, examen])
+        db.flush()
+        db.add_all(Comment(anuncio_id=anuncios[0].id, autor_id=e.id, contenido="...") for e in estudiantes)
+        db.add_all(Submission(tarea_id=tarea.id, estudiante_id=e.id, contenido="...") for e in estudiantes)
+        db.add_all(ExamSubmission(exam_id=examen.id, estudiante_id=e.id, contenido="...") for e in estudiantes)
+        db.commit()
+
+        return {
+            "ids": {"curso_id": curso.id, "anuncio_id": anuncios[0].id, "tarea_id": tarea.id, "examen_id": examen.id},
+            "tokens": {
+                nombre: create_access_token(data=access_token_claims(user))
+                for nombre, user in (("admin", admin), ("docente", docente), ("estudiante", estudiante))
+            },
+        }
+    finally:
+        db.close()
+
+
+def _medir(entorno, n: int, quien: str, ruta: str):
+    """(sentencias, filas) de un GET a `ruta` con n filas por listado."""
+    client, engine, Session, sentencias = entorno
+    datos = _poblar(engine, Session, n)
+    url = ruta.format(**datos["ids"])
+    headers = {"Authorization": f"Bearer {datos['tokens'][quien]}"}
+
+    # El primer request abre las conexiones y llena la caché de autenticación
+    assert client.get(url, headers=headers).status_code == 200
+    auth_cache.user_cache.clear()
+    sentencias.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return len(sentencias), len(response.json())
+
+
+@pytest.mark.parametrize("quien, ruta", [(quien, ruta) for _, quien, ruta in LISTADOS], ids=[nombre for nombre, _, _ in LISTADOS])
+def test_list_statement_count_does_not_grow_with_rows(entorno, quien, ruta):
+    sentencias_una, filas_una = _medir(entorno, 1, quien, ruta)
+    sentencias_n, filas_n = _medir(entorno, N, quien, ruta)
+    assert filas_n > filas_una
+    assert sentencias_n == sentencias_una
@@ -0,0 +1,47 @@
+# backend/tests/test_migrations.py
+"""
+Las migraciones de Alembic, aplicadas sobre una base de datos vacía, dejan
+exactamente el esquema de los modelos (lo mismo que verifica `alembic check`).
+
+Necesita un PostgreSQL en TEST_DATABASE_URL (ver conftest.py); sin esa variable
+se omite.
+"""
+import os
+
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect
+
+from app.db.base import Base
+from app.db.migrations import alembic_config
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL no está definida")
+
+
+def test_upgrade_head_matches_models(empty_database_url):
+    engine = create_engine(empty_database_url)
+    try:
+        with engine.connect() as connection:
+            config = alembic_config()
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+            connection.commit()
+
+            # Lanza AutoGenerateDiffsDetected si el esquema difiere de Base.metadata
+            command.check(config)
+
+            tablas = set(inspect(connection).get_table_names())
+            assert set(Base.metadata.tables) <= tablas
+            indices = {
+                indice["name"]
+                for tabla in Base.metadata.tables
+                for indice in inspect(connection).get_indexes(tabla)
+            }
+            esperados = {
+                indice.name for tabla in Base.metadata.tables.values() for indice in tabla.indexes
+            }
+            assert esperados <= indices
+    finally:
+        engine.dispose()
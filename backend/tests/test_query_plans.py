@@ -0,0 +1,38 @@
+# backend/tests/test_query_plans.py
+"""
+Las consultas de las rutas más usadas (app.db.query_plans.hot_queries) tienen un
+índice utilizable en el esquema migrado: con enable_seqscan desactivado, ningún
+plan hace Seq Scan.
+
+Necesita un PostgreSQL en TEST_DATABASE_URL (ver conftest.py); sin esa variable
+se omite.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.query_plans import hot_queries, seq_scans
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL no está definida")
+
+HOT_QUERIES = hot_queries()
+
+
+@pytest.fixture(scope="module")
+def plan_connection(migrated_database_url):
+    engine = create_engine(migrated_database_url)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SET enable_seqscan = off"))
+            yield connection
+            connection.rollback()
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("stmt", [stmt for _, stmt in HOT_QUERIES], ids=[nombre for nombre, _ in HOT_QUERIES])
+def test_hot_query_uses_index(plan_connection, stmt):
+    assert seq_scans(plan_connection, stmt) == []
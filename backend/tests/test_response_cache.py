@@ -0,0 +1,152 @@
+# backend/tests/test_response_cache.py
+"""
+ResponseCache sobre los dos backends (memoria y Redis, con fakeredis en lugar de
+un servidor): aciertos y fallos, invalidación por versión de tag, restauración
+de X-Next-Cursor, métricas y respaldo en la base de datos si el backend falla.
+"""
+from typing import List
+
+import pytest
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.services.response_cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+class Item(BaseModel):
+    id: int
+    titulo: str
+
+
+class Loader:
+    """Loader que cuenta cuántas veces se llamó (cada llamada es una consulta a la BD)."""
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return self.valor
+
+
+def _memory_backend():
+    return MemoryCacheBackend(maxsize=100, ttl=60)
+
+
+def _redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisCacheBackend(client=fakeredis.FakeRedis(server=fakeredis.FakeServer()))
+
+
+@pytest.fixture(params=[_memory_backend, _redis_backend], ids=["memory", "redis"])
+def cache(request):
+    return ResponseCache(request.param(), default_ttl=60)
+
+
+def test_get_or_set_miss_then_hit(cache):
+    loader = Loader({"cursos": [1, 2, 3]})
+
+    assert cache.get_or_set("courses", ["p1"], ["courses"], loader) == {"cursos": [1, 2, 3]}
+    assert cache.get_or_set("courses", ["p1"], ["courses"], loader) == {"cursos": [1, 2, 3]}
+    assert loader.llamadas == 1
+
+    # Otra clave es otra entrada
+    cache.get_or_set("courses", ["p2"], ["courses"], loader)
+    assert loader.llamadas == 2
+
+
+def test_invalidate_bumps_only_its_tag(cache):
+    cursos, conceptos = Loader([1]), Loader([2])
+    cache.get_or_set("courses", None, ["courses", "users"], cursos)
+    cache.get_or_set("conceptos", None, ["conceptos"], conceptos)
+
+    cache.invalidate("users")
+
+    cache.get_or_set("courses", None, ["courses", "users"], cursos)
+    cache.get_or_set("conceptos", None, ["conceptos"], conceptos)
+    assert cursos.llamadas == 2
+    assert conceptos.llamadas == 1
+
+
+def test_value_invalidated_during_load_is_never_served(cache):
+    def loader_con_invalidacion():
+        # Otra request modifica los cursos mientras esta consulta la base de datos
+        cache.invalidate("courses")
+        return ["viejo"]
+
+    assert cache.get_or_set("courses", None, ["courses"], loader_con_invalidacion) == ["viejo"]
+
+    nuevo = Loader(["nuevo"])
+    assert cache.get_or_set("courses", None, ["courses"], nuevo) == ["nuevo"]
+    assert nuevo.llamadas == 1
+
+
+def test_cached_response_restores_next_cursor(cache):
+    construcciones = []
+
+    def build(response):
+        construcciones.append(1)
+        response.headers["X-Next-Cursor"] = "cursor-2"
+        return [Item(id=1, titulo="Álgebra"), Item(id=2, titulo="Cálculo")]
+
+    primera = Response()
+    datos = cache.cached_response("courses", [0, 2], ["courses"], primera, List[Item], lambda: build(primera))
+    segunda = Response()
+    repetidos = cache.cached_response("courses", [0, 2], ["courses"], segunda, List[Item], lambda: build(segunda))
+
+    assert len(construcciones) == 1
+    assert repetidos == datos == [{"id": 1, "titulo": "Álgebra"}, {"id": 2, "titulo": "Cálculo"}]
+    assert segunda.headers["X-Next-Cursor"] == "cursor-2"
+
+
+def test_cached_response_without_next_cursor(cache):
+    cache.cached_response("courses", None, ["courses"], Response(), List[Item], lambda: [])
+    segunda = Response()
+    assert cache.cached_response("courses", None, ["courses"], segunda, List[Item], lambda: []) == []
+    assert "X-Next-Cursor" not in segunda.headers
+
+
+def test_stats(cache):
+    loader = Loader(1)
+    for _ in range(3):
+        cache.get_or_set("courses", None, ["courses"], loader)
+    cache.invalidate("courses")
+    cache.invalidate("courses", "users")
+
+    stats = cache.stats()
+    assert stats["backend"] == type(cache.backend).__name__
+    assert stats["namespaces"]["courses"] == {"hits": 2, "misses": 1, "errors": 0, "hit_ratio": 0.6667}
+    assert stats["invalidations"] == {"courses": 2, "users": 1}
+
+
+class BrokenBackend:
+    """Backend que falla en todas las operaciones (p. ej. Redis caído)."""
+
+    def _falla(self, *args, **kwargs):
+        raise ConnectionError("backend caído")
+
+    get = set = tag_versions = bump_tags = _falla
+
+
+def test_falls_back_to_loader_when_backend_fails():
+    cache = ResponseCache(BrokenBackend(), default_ttl=60)
+    loader = Loader(["desde la bd"])
+
+    assert cache.get_or_set("courses", None, ["courses"], loader) == ["desde la bd"]
+    assert cache.get_or_set("courses", None, ["courses"], loader) == ["desde la bd"]
+    cache.invalidate("courses")  # No lanza: solo se registra el error
+
+    assert loader.llamadas == 2
+    stats = cache.stats()
+    assert stats["namespaces"]["courses"]["errors"] == 2
+    assert stats["invalidations"] == {}
+
+
+def test_no_backend_always_loads():
+    cache = ResponseCache(None, default_ttl=60)
+    loader = Loader(1)
+    cache.get_or_set("courses", None, ["courses"], loader)
+    cache.get_or_set("courses", None, ["courses"], loader)
+    assert loader.llamadas == 2
+    assert cache.stats()["backend"] is None
@@ -7,21 +7,28 @@ const RecomendacionesStudent = ({ studentId }) => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [filter, setFilter] = useState('all'); // 'all', 'unread', 'read'
+    const [nextCursor, setNextCursor] = useState(null); // Cabecera X-Next-Cursor: hay más páginas
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         fetchRecomendaciones();
     }, [studentId, filter]);
 
+    // El listado viene paginado: cada respuesta trae el cursor de la página siguiente
+    const fetchPage = (cursor) => {
+        const params = {};
+        if (filter === 'unread') params.solo_no_vistas = true;
+        if (cursor) params.cursor = cursor;
+        return apiClient.get('/recomendaciones/me', { params });
+    };
+
     const fetchRecomendaciones = async () => {
         setLoading(true);
         setError(null);
         try {
-            const endpoint = filter === 'unread' 
-                ? '/recomendaciones/me?solo_no_vistas=true'
-                : '/recomendaciones/me';
-            
-            const response = await apiClient.get(endpoint);
+            const response = await fetchPage(null);
             setRecomendaciones(response.data || []);
+            setNextCursor(response.headers['x-next-cursor'] || null);
         } catch (err) {
             console.error("Error al cargar recomendaciones:", err);
             setError(err.response?.data?.detail || "No se pudieron cargar las recomendaciones.");
@@ -30,6 +37,24 @@ const RecomendacionesStudent = ({ studentId }) => {
         }
     };
 
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const response = await fetchPage(nextCursor);
+            setRecomendaciones(prev => {
+                const ids = new Set(prev.map(rec => rec.id));
+                return [...prev, ...(response.data || []).filter(rec => !ids.has(rec.id))];
+            });
+            setNextCursor(response.headers['x-next-cursor'] || null);
+        } catch (err) {
+            console.error("Error al cargar más recomendaciones:", err);
+            alert(err.response?.data?.detail || "No se pudieron cargar más recomendaciones.");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleMarkAsViewed = async (recomendacionId) => {
         try {
             await apiClient.patch(`/recomendaciones/${recomendacionId}/view`);
@@ -279,6 +304,17 @@ const RecomendacionesStudent = ({ studentId }) => {
                             </div>
                         );
                     })}
+                    {nextCursor && (
+                        <div style={{ textAlign: 'center' }}>
+                            <button
+                                onClick={handleLoadMore}
+                                className="btn btn-secondary btn-sm"
+                                disabled={loadingMore}
+                            >
+                                {loadingMore ? 'Cargando...' : 'Cargar más'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
         </div>